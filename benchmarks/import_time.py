@@ -0,0 +1,69 @@
+"""
+Measures the cold import time of bluejay modules, each in a fresh
+interpreter, and whether the import pulled in dbus and GLib.
+
+    python benchmarks/import_time.py [--runs 20] [module ...]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+DEFAULT_MODULES = [
+    "bluejay",
+    "bluejay.enums",
+    "bluejay.constants",
+    "bluejay.uuids",
+    "bluejay.ad_payload",
+    "bluejay.interfaces.gatt",
+    "bluejay.managers.ble_manager",
+]
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = any(name in sys.modules for name in ("dbus", "gi"))
+print(elapsed, int(heavy))
+"""
+
+
+def measure(module: str, runs: int):
+    timings = []
+    heavy = False
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        timings.append(float(output[0]))
+        heavy = bool(int(output[1]))
+    return timings, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        try:
+            timings, heavy = measure(module, args.runs)
+        except subprocess.CalledProcessError as error:
+            reason = error.stderr.strip().splitlines()[-1]
+            print(f"{module:>30}: import failed ({reason})")
+            continue
+        print(
+            f"{module:>30}: median {statistics.median(timings) * 1000:7.2f} ms, "
+            f"min {min(timings) * 1000:7.2f} ms, "
+            f"dbus/gi loaded: {'yes' if heavy else 'no'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Replaces a GATT application thousands of times and tracks the resident set
+size, to check that reconfiguring does not leak exported objects.
+
+By default the trees are only exported on the session bus and closed. With
+`--bluez`, they are registered with BlueZ through
+`BLEManager.set_application(close_previous=True)`. `--no-close` keeps every
+replaced tree exported, as before `close()` existed, for comparison.
+
+    python benchmarks/reconfigure_soak.py [--iterations 5000] [--bluez]
+"""
+
+import argparse
+import os
+import threading
+import time
+
+import dbus
+
+from bluejay.enums import CharacteristicFlag
+from bluejay.interfaces.gatt import Application, Characteristic, Service
+
+BASE_PATH = "/org/bluejay/soak"
+
+
+def rss() -> int:
+    """Resident set size in bytes"""
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def build(bus, path: str, services: int, characteristics: int) -> Application:
+    app = Application(bus, path)
+    for index in range(services):
+        service = Service(bus, path, index, f"{0x1800 + index:04x}", True)
+        for char_index in range(characteristics):
+            service.add_characteristic(
+                Characteristic(
+                    bus,
+                    char_index,
+                    f"{0x2A00 + char_index:04x}",
+                    [CharacteristicFlag.READ, CharacteristicFlag.NOTIFY],
+                    service,
+                )
+            )
+        app.add_service(service)
+    return app
+
+
+def soak_bus(args):
+    bus = dbus.SessionBus()
+    previous = None
+    for iteration in range(args.iterations):
+        path = f"{BASE_PATH}/app{iteration}" if args.no_close else BASE_PATH
+        if previous is not None and not args.no_close:
+            previous.close()
+        previous = build(bus, path, args.services, args.characteristics)
+        yield iteration
+
+
+def soak_bluez(args):
+    from bluejay.managers.ble_manager import BLEManager
+
+    manager = BLEManager(BASE_PATH)
+    registered = threading.Event()
+
+    def on_application_change(state, error):
+        if state == "error":
+            print(f"Registration failed: {error}")
+        if state in ("registered", "error"):
+            registered.set()
+
+    manager.on_application_change = on_application_change
+    for iteration in range(args.iterations):
+        path = f"{BASE_PATH}/app{iteration}" if args.no_close else BASE_PATH
+        app = manager.run_in_loop(
+            build, manager.bus, path, args.services, args.characteristics
+        )
+        registered.clear()
+        manager.set_application(app.result(), close_previous=not args.no_close)
+        registered.wait(10)
+        yield iteration
+    manager.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--services", type=int, default=3)
+    parser.add_argument("--characteristics", type=int, default=5)
+    parser.add_argument("--report", type=int, default=500)
+    parser.add_argument("--bluez", action="store_true")
+    parser.add_argument("--no-close", action="store_true")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    baseline = rss()
+    soak = soak_bluez(args) if args.bluez else soak_bus(args)
+    for iteration in soak:
+        if iteration % args.report == 0 or iteration == args.iterations - 1:
+            growth = (rss() - baseline) / 1024
+            print(
+                f"{iteration + 1:>7} reconfigurations: rss +{growth:9.0f} KiB "
+                f"({growth / (iteration + 1):6.2f} KiB each), "
+                f"{time.perf_counter() - start:7.1f} s"
+            )
+
+
+if __name__ == "__main__":
+    main()
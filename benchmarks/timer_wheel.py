@@ -0,0 +1,65 @@
+"""
+Compares `bluejay.glib.GLib` timeouts with `bluejay.timer_wheel.TimerWheel`
+at 10k periodic timers: time to schedule, time to cancel and CPU time spent
+running the loop.
+
+    python benchmarks/timer_wheel.py [--timers 10000] [--seconds 5]
+"""
+
+import argparse
+import random
+import time
+
+from gi.repository import GLib as _GLib  # type: ignore
+
+from bluejay.glib import GLib
+from bluejay.timer_wheel import TimerWheel
+
+
+def run(name, backend, timers: int, seconds: float):
+    calls = 0
+
+    def tick():
+        nonlocal calls
+        calls += 1
+        return True
+
+    intervals = [random.randint(100, 1000) for _ in range(timers)]
+
+    start = time.perf_counter()
+    ids = [backend.timeout_add(interval, tick) for interval in intervals]
+    scheduled = time.perf_counter() - start
+
+    loop = _GLib.MainLoop()
+    _GLib.timeout_add(int(seconds * 1000), loop.quit)
+    cpu = time.process_time()
+    loop.run()
+    cpu = time.process_time() - cpu
+
+    start = time.perf_counter()
+    for id in ids:
+        backend.source_remove(id)
+    cancelled = time.perf_counter() - start
+
+    print(
+        f"{name:>12}: schedule {scheduled * 1000:8.2f} ms, "
+        f"cancel {cancelled * 1000:8.2f} ms, "
+        f"loop cpu {cpu:6.3f} s for {calls} calls "
+        f"({cpu / max(calls, 1) * 1e6:.2f} us/call)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--timers", type=int, default=10000)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    run("GLib", GLib, args.timers, args.seconds)
+    random.seed(0)
+    run("TimerWheel", TimerWheel(), args.timers, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,37 @@
-try:
-    from bluejay.interfaces.advertisement import Advertisement
-except ImportError:
-    from .interfaces.advertisement import Advertisement
+import importlib
+from typing import TYPE_CHECKING
 
-try:
-    from bluejay.interfaces.agent import Agent
-except ImportError:
+if TYPE_CHECKING:
+    from .interfaces.advertisement import Advertisement
     from .interfaces.agent import Agent
-
-try:
-    from bluejay.interfaces.gatt import Application, Characteristic, Descriptor, Service
-except ImportError:
     from .interfaces.gatt import Application, Characteristic, Descriptor, Service
+    from .managers.ble_manager import BLEManager
 
-try:
-    from bluejay.managers.ble_manager import BLEManager
-except ImportError:
+# Importing the interfaces and managers pulls in dbus and GLib: load them on
+# first access only, so that `bluejay.enums`, `bluejay.constants` and other
+# pure modules can be imported cheaply (PEP 562).
+_LAZY_ATTRIBUTES = {
+    "Advertisement": ".interfaces.advertisement",
+    "Agent": ".interfaces.agent",
+    "Application": ".interfaces.gatt",
+    "Characteristic": ".interfaces.gatt",
+    "Descriptor": ".interfaces.gatt",
+    "Service": ".interfaces.gatt",
+    "BLEManager": ".managers.ble_manager",
+}
 
-    from .managers.ble_manager import BLEManager
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,242 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .uuids import BluetoothUUID
+
+LEGACY_PAYLOAD_LENGTH = 31
+EXTENDED_PAYLOAD_LENGTH = 251
+
+AD_FLAGS = 0x01
+AD_UUID16_COMPLETE = 0x03
+AD_UUID32_COMPLETE = 0x05
+AD_UUID128_COMPLETE = 0x07
+AD_SHORT_NAME = 0x08
+AD_COMPLETE_NAME = 0x09
+AD_TX_POWER = 0x0A
+AD_SOLICIT16 = 0x14
+AD_SOLICIT128 = 0x15
+AD_SERVICE_DATA16 = 0x16
+AD_APPEARANCE = 0x19
+AD_SOLICIT32 = 0x1F
+AD_SERVICE_DATA32 = 0x20
+AD_SERVICE_DATA128 = 0x21
+AD_MANUFACTURER_DATA = 0xFF
+
+FLAG_LE_GENERAL_DISCOVERABLE = 0x02
+FLAG_BR_EDR_NOT_SUPPORTED = 0x04
+
+DEFAULT_PRIORITIES = {
+    "flags": 0,
+    "service_uuids": 10,
+    "local_name": 20,
+    "manufacturer_data": 30,
+    "service_data": 40,
+    "appearance": 50,
+    "tx_power": 60,
+    "solicit_uuids": 70,
+    "data": 80,
+}
+"""
+Order in which fields are placed in the payload, lowest first. Fields that do
+not fit in the advertising data go to the scan response, or are dropped.
+"""
+
+
+class AdvertisementOverflowError(ValueError):
+    """Raised when some advertisement fields do not fit in the payload"""
+
+    def __init__(self, omitted: List[str]):
+        super().__init__(f"Advertisement fields do not fit: {', '.join(omitted)}")
+        self.omitted = omitted
+
+
+class EncodedAdvertisement:
+    """Result of `encode_advertisement()`"""
+
+    def __init__(self):
+        self.advertising_data = b""
+        """Packed AD structures of the advertising data"""
+        self.scan_response = b""
+        """Packed AD structures of the scan response"""
+        self.placement: Dict[str, str] = {}
+        """Where each field went: `advertising_data` or `scan_response`"""
+        self.omitted: List[str] = []
+        """Fields that did not fit anywhere"""
+        self.local_name: Optional[str] = None
+        """The local name as encoded, shortened if it did not fit"""
+
+    def __repr__(self) -> str:
+        return (
+            f"EncodedAdvertisement(advertising_data={self.advertising_data.hex()}, "
+            f"scan_response={self.scan_response.hex()}, omitted={self.omitted})"
+        )
+
+
+def ad_structure(ad_type: int, payload: bytes) -> bytes:
+    """Packs one AD structure: length, type and payload"""
+    if len(payload) > 254:
+        raise ValueError(f"AD structure 0x{ad_type:02x} payload too long")
+    return bytes((len(payload) + 1, ad_type)) + payload
+
+
+def uuid_bytes(uuid: str) -> bytes:
+    """
+    Little endian bytes of `uuid` in its shortest form: 2, 4 or 16 bytes
+    """
+    uuid = BluetoothUUID(uuid)
+    short = uuid.short
+    if short is None:
+        return bytes.fromhex(uuid.replace("-", ""))[::-1]
+    if short <= 0xFFFF:
+        return short.to_bytes(2, "little")
+    return short.to_bytes(4, "little")
+
+
+def _uuid_list(uuids: Iterable[str], types: Tuple[int, int, int]) -> List[bytes]:
+    by_size: Dict[int, bytes] = {}
+    for uuid in uuids:
+        data = uuid_bytes(uuid)
+        by_size[len(data)] = by_size.get(len(data), b"") + data
+
+    sizes = {2: types[0], 4: types[1], 16: types[2]}
+    return [ad_structure(sizes[size], data) for size, data in sorted(by_size.items())]
+
+
+def _fields(ad: Any) -> Dict[str, List[bytes]]:
+    fields: Dict[str, List[bytes]] = {}
+    includes = ad.includes or []
+
+    if ad.ad_type == "peripheral":
+        flags = FLAG_BR_EDR_NOT_SUPPORTED
+        if ad.discoverable:
+            flags |= FLAG_LE_GENERAL_DISCOVERABLE
+        fields["flags"] = [ad_structure(AD_FLAGS, bytes((flags,)))]
+
+    if ad.service_uuids:
+        fields["service_uuids"] = _uuid_list(
+            ad.service_uuids,
+            (AD_UUID16_COMPLETE, AD_UUID32_COMPLETE, AD_UUID128_COMPLETE),
+        )
+    if ad.solicit_uuids:
+        fields["solicit_uuids"] = _uuid_list(
+            ad.solicit_uuids, (AD_SOLICIT16, AD_SOLICIT32, AD_SOLICIT128)
+        )
+    if ad.manufacturer_data:
+        fields["manufacturer_data"] = [
+            ad_structure(AD_MANUFACTURER_DATA, code.to_bytes(2, "little") + bytes(data))
+            for code, data in ad.manufacturer_data.items()
+        ]
+    if ad.service_data:
+        service_data = []
+        for uuid, data in ad.service_data.items():
+            key = uuid_bytes(uuid)
+            ad_type = {2: AD_SERVICE_DATA16, 4: AD_SERVICE_DATA32}.get(
+                len(key), AD_SERVICE_DATA128
+            )
+            service_data.append(ad_structure(ad_type, key + bytes(data)))
+        fields["service_data"] = service_data
+    if ad.data:
+        fields["data"] = [
+            ad_structure(int(ad_type), bytes(data)) for ad_type, data in ad.data.items()
+        ]
+    if ad.appearance or "appearance" in includes:
+        appearance = int(ad.appearance or 0).to_bytes(2, "little")
+        fields["appearance"] = [ad_structure(AD_APPEARANCE, appearance)]
+    if "tx-power" in includes:
+        tx_power = int(ad.tx_power or 0).to_bytes(1, "little", signed=True)
+        fields["tx_power"] = [ad_structure(AD_TX_POWER, tx_power)]
+
+    return fields
+
+
+def _local_name(ad: Any, adapter_name: Optional[str]) -> Optional[str]:
+    if ad.local_name:
+        return ad.local_name
+    if ad.includes and "local-name" in ad.includes:
+        return adapter_name
+    return None
+
+
+def _shorten(name: str, room: int) -> str:
+    # `room` is the space left for the name bytes, excluding the AD header
+    return name.encode("utf-8")[:room].decode("utf-8", errors="ignore")
+
+
+def encode_advertisement(
+    ad: Any,
+    max_length: int = LEGACY_PAYLOAD_LENGTH,
+    scan_response: bool = True,
+    priorities: Optional[Dict[str, int]] = None,
+    adapter_name: Optional[str] = None,
+    min_name_length: int = 1,
+    strict: bool = False,
+) -> EncodedAdvertisement:
+    """
+    Computes the AD structures BlueZ would send for `ad`, placing the fields
+    by priority in the advertising data, then in the scan response.
+
+    128-bit UUIDs derived from the Bluetooth Base UUID are encoded in their
+    16 or 32-bit forms. A local name that does not fit is sent shortened.
+
+    #### Args:
+        `ad`: The `Advertisement`.
+        `max_length`: Size of each payload: `LEGACY_PAYLOAD_LENGTH` or
+            `EXTENDED_PAYLOAD_LENGTH`.
+        `scan_response`: Use the scan response for the fields that do not fit
+            in the advertising data.
+        `priorities`: Overrides of `DEFAULT_PRIORITIES`.
+        `adapter_name`: Name used when `local-name` is in `ad.includes`.
+        `min_name_length`: Shortest name, in bytes, worth sending.
+        `strict`: Raise instead of omitting fields.
+
+    #### Returns:
+        `EncodedAdvertisement`: The packed payloads.
+
+    #### Raises:
+        `AdvertisementOverflowError`: If `strict` and some fields do not fit.
+    """
+
+    order = dict(DEFAULT_PRIORITIES)
+    if priorities:
+        order.update(priorities)
+
+    fields = _fields(ad)
+    name = _local_name(ad, adapter_name)
+    if name:
+        fields["local_name"] = [ad_structure(AD_COMPLETE_NAME, name.encode("utf-8"))]
+
+    result = EncodedAdvertisement()
+    payloads = {"advertising_data": bytearray(), "scan_response": bytearray()}
+    targets = ["advertising_data"]
+    if scan_response:
+        targets.append("scan_response")
+
+    for field in sorted(fields, key=lambda field: order.get(field, 100)):
+        structures = b"".join(fields[field])
+        for target in targets:
+            if len(payloads[target]) + len(structures) <= max_length:
+                payloads[target] += structures
+                result.placement[field] = target
+                if field == "local_name":
+                    result.local_name = name
+                break
+        else:
+            if field == "local_name" and name:
+                # Shorten into whichever payload has the most room left
+                target = min(targets, key=lambda target: len(payloads[target]))
+                room = max_length - len(payloads[target]) - 2
+                short = _shorten(name, room) if room > 0 else ""
+                if len(short.encode("utf-8")) >= max(min_name_length, 1):
+                    payloads[target] += ad_structure(
+                        AD_SHORT_NAME, short.encode("utf-8")
+                    )
+                    result.placement[field] = target
+                    result.local_name = short
+                    continue
+            result.omitted.append(field)
+
+    if strict and result.omitted:
+        raise AdvertisementOverflowError(result.omitted)
+
+    result.advertising_data = bytes(payloads["advertising_data"])
+    result.scan_response = bytes(payloads["scan_response"])
+    return result
@@ -0,0 +1,141 @@
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+RateLimit = Tuple[float, int]
+"""Requests per second and burst size"""
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: int, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def take(self, now: float) -> bool:
+        """Takes a token if one is available"""
+        tokens = self.tokens + (now - self.updated) * self.rate
+        self.tokens = tokens if tokens < self.burst else float(self.burst)
+        self.updated = now
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+class _Device:
+    __slots__ = ("bucket", "characteristics", "admitted", "rejected", "seen")
+
+    def __init__(self, bucket: TokenBucket, now: float):
+        self.bucket = bucket
+        self.characteristics: Dict[str, TokenBucket] = {}
+        self.admitted = 0
+        self.rejected = 0
+        self.seen = now
+
+
+class AdmissionController:
+    """
+    Limits the rate of the `ReadValue` and `WriteValue` calls each central
+    makes, so that one client cannot monopolise the loop serving all of
+    them.
+
+    Every device has a token bucket shared by all the attributes, and one
+    per attribute. A call is admitted when both have a token. Set it as
+    `Application.admission`: rejected calls fail with
+    `org.bluez.Error.NotPermitted` before the handler runs.
+
+    Devices are identified by the `device` option BlueZ passes. Calls
+    without it share a single bucket.
+    """
+
+    def __init__(
+        self,
+        device_limit: RateLimit = (100.0, 50),
+        characteristic_limit: Optional[RateLimit] = (50.0, 20),
+        idle: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        #### Args:
+            `device_limit`: Rate and burst of the calls of a device, across
+                all attributes.
+            `characteristic_limit`: Default rate and burst of the calls of a
+                device to one attribute. `None` disables the per attribute
+                buckets, unless the attribute sets its own `rate_limit`.
+            `idle`: Time in seconds after which the state of a silent device
+                is dropped.
+            `clock`: Monotonic clock in seconds.
+        """
+        self.device_limit = device_limit
+        self.characteristic_limit = characteristic_limit
+        self.idle = idle
+        self._clock = clock
+
+        self._devices: Dict[str, _Device] = {}
+        self._pruned = clock()
+
+    def admit(
+        self,
+        device: Optional[str],
+        attribute: str,
+        limit: Optional[RateLimit] = None,
+    ) -> bool:
+        """
+        Returns `True` if `device` may call `attribute` (an object path)
+        now, consuming a token
+
+        #### Args:
+            `limit`: Rate limit of this attribute, overriding
+                `characteristic_limit`.
+        """
+        now = self._clock()
+        if now - self._pruned >= self.idle:
+            self._prune(now)
+
+        key = device or ""
+        state = self._devices.get(key)
+        if state is None:
+            state = _Device(TokenBucket(*self.device_limit, now), now)
+            self._devices[key] = state
+        state.seen = now
+
+        if not state.bucket.take(now):
+            state.rejected += 1
+            return False
+
+        limit = limit or self.characteristic_limit
+        if limit is not None:
+            bucket = state.characteristics.get(attribute)
+            if bucket is None:
+                bucket = TokenBucket(*limit, now)
+                state.characteristics[attribute] = bucket
+            if not bucket.take(now):
+                # Not served: give the device token back
+                state.bucket.tokens += 1.0
+                state.rejected += 1
+                return False
+
+        state.admitted += 1
+        return True
+
+    def _prune(self, now: float):
+        self._pruned = now
+        limit = now - self.idle
+        for key in [key for key, state in self._devices.items() if state.seen < limit]:
+            del self._devices[key]
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Admitted and rejected calls per device object path"""
+        return {
+            key: {"admitted": state.admitted, "rejected": state.rejected}
+            for key, state in self._devices.items()
+        }
+
+    def throttled(self, device: Optional[str]) -> int:
+        """Number of calls of `device` rejected so far"""
+        state = self._devices.get(device or "")
+        return state.rejected if state is not None else 0
@@ -0,0 +1,429 @@
+"""
+D-Bus backend running on asyncio, speaking the wire protocol itself: no
+dbus-python connection, GLib loop or thread is involved.
+"""
+
+import asyncio
+import os
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .base import Backend, Subscription, reply_value
+from .wire import (
+    ERROR,
+    METHOD_CALL,
+    METHOD_RETURN,
+    NO_REPLY_EXPECTED,
+    SIGNAL,
+    Message,
+    guess_signature,
+    split_signature,
+)
+
+SYSTEM_BUS_ADDRESS = "unix:path=/var/run/dbus/system_bus_socket"
+
+_BUS_NAME = "org.freedesktop.DBus"
+_BUS_PATH = "/org/freedesktop/DBus"
+_FAILED = "org.freedesktop.DBus.Error.Failed"
+_UNKNOWN_OBJECT = "org.freedesktop.DBus.Error.UnknownObject"
+_UNKNOWN_METHOD = "org.freedesktop.DBus.Error.UnknownMethod"
+
+
+class DBusError(Exception):
+    """An error reply"""
+
+    def __init__(self, name: str, message: str = ""):
+        super().__init__(f"{name}: {message}" if message else name)
+        self.name = name
+        self.message = message
+
+    def get_dbus_name(self) -> str:
+        # Same accessor as `dbus.DBusException`
+        return self.name
+
+
+def _socket_path(address: str) -> str:
+    for candidate in address.split(";"):
+        transport, _, options = candidate.partition(":")
+        if transport != "unix":
+            continue
+        values = dict(option.split("=", 1) for option in options.split(","))
+        if "path" in values:
+            return values["path"]
+        if "abstract" in values:
+            return "\0" + values["abstract"]
+    raise ValueError(f"No supported transport in {address!r}")
+
+
+def _find_member(obj, interface: Optional[str], member: str, kind: str):
+    # The decorated function of a parent describes the method even when a
+    # subclass overrides it undecorated, as in `dbus.service`
+    for cls in type(obj).__mro__:
+        function = cls.__dict__.get(member)
+        if getattr(function, kind, False) and (
+            interface is None or function._dbus_interface == interface
+        ):
+            return function
+    return None
+
+
+class _Subscription(Subscription):
+    __slots__ = ("backend", "callback", "rule", "fields", "arg0", "path_keyword")
+
+    def __init__(self, backend, callback, rule, fields, arg0, path_keyword):
+        self.backend = backend
+        self.callback = callback
+        self.rule = rule
+        self.fields = fields
+        self.arg0 = arg0
+        self.path_keyword = path_keyword
+
+    def matches(self, message: Message) -> bool:
+        for name, value in self.fields:
+            if getattr(message, name) != value:
+                return False
+        return self.arg0 is None or (
+            bool(message.body) and message.body[0] == self.arg0
+        )
+
+    def remove(self):
+        self.backend._unsubscribe(self)
+
+
+class AsyncioBackend(Backend):
+    """
+    Backend connected to the bus with asyncio streams.
+
+    Call `connect` from the running loop before calling methods; objects can
+    be exported before. Method calls return an `asyncio.Future`, and every
+    callback (exported methods, signal callbacks) runs in the loop: they
+    must not block.
+
+    Exported objects are `dbus.service.Object` instances created with this
+    backend as `bus`. Their signals are emitted through it.
+    """
+
+    def __init__(self, address: Optional[str] = None):
+        """
+        #### Args:
+            `address`: D-Bus address, by default `DBUS_SYSTEM_BUS_ADDRESS`
+                or the standard system bus socket.
+        """
+        self.address = address or os.environ.get(
+            "DBUS_SYSTEM_BUS_ADDRESS", SYSTEM_BUS_ADDRESS
+        )
+        self.unique_name: Optional[str] = None
+
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+        self._serial = 0
+        self._replies: Dict[int, asyncio.Future] = {}
+        self._objects: Dict[str, Any] = {}
+        self._subscriptions: List[_Subscription] = []
+
+    async def connect(self):
+        """Connects, authenticates and registers on the bus"""
+        self._reader, self._writer = await asyncio.open_unix_connection(
+            _socket_path(self.address)
+        )
+        uid = str(os.getuid()).encode().hex()
+        self._writer.write(b"\0AUTH EXTERNAL " + uid.encode() + b"\r\n")
+        line = await self._reader.readline()
+        if not line.startswith(b"OK"):
+            self._writer.close()
+            raise ConnectionError(f"Authentication rejected: {line!r}")
+        self._writer.write(b"BEGIN\r\n")
+
+        self._task = asyncio.get_running_loop().create_task(self._read_loop())
+        self.unique_name = await self.call(_BUS_NAME, _BUS_PATH, _BUS_NAME, "Hello")
+        for subscription in self._subscriptions:
+            self._add_match(subscription.rule)
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *_):
+        self.close()
+
+    def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._fail_replies(ConnectionError("Connection closed"))
+
+    def _fail_replies(self, error: Exception):
+        replies, self._replies = self._replies, {}
+        for future in replies.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def _send(self, message: Message) -> int:
+        if self._writer is None:
+            raise ConnectionError("Not connected")
+        self._serial += 1
+        message.serial = self._serial
+        self._writer.write(message.encode())
+        return message.serial
+
+    # Exported objects
+
+    def export(self, obj, path: Optional[str] = None):
+        path = path or obj.path
+        self._objects[path] = obj
+
+        # Shadow the signals so that calling them emits through this backend
+        for cls in type(obj).__mro__:
+            for name, function in cls.__dict__.items():
+                if getattr(function, "_dbus_is_signal", False):
+                    if name not in vars(obj):
+                        setattr(obj, name, self._emitter(obj, path, name))
+
+    def _emitter(self, obj, path: str, name: str) -> Callable[..., None]:
+        function = _find_member(obj, None, name, "_dbus_is_signal")
+        interface, signature = function._dbus_interface, function._dbus_signature
+        body = getattr(type(obj), name)
+
+        def emit(*args):
+            body(obj, *args)
+            self.emit(path, interface, name, signature, args)
+
+        emit.backend = self  # type: ignore[attr-defined]
+        return emit
+
+    def unexport(self, obj):
+        for path in [path for path, other in self._objects.items() if other is obj]:
+            del self._objects[path]
+        for name, value in list(vars(obj).items()):
+            if getattr(value, "backend", None) is self:
+                delattr(obj, name)
+
+    def list_exported_child_objects(self, path: str) -> List[str]:
+        """Names of the children of `path`, as used by `Introspect`"""
+        prefix = path.rstrip("/") + "/"
+        return sorted(
+            {
+                child[len(prefix) :].split("/", 1)[0]
+                for child in self._objects
+                if child.startswith(prefix)
+            }
+        )
+
+    def _dispatch_call(self, message: Message):
+        obj = self._objects.get(message.path)
+        if obj is None:
+            self._reply_error(message, _UNKNOWN_OBJECT, message.path or "")
+            return
+        function = _find_member(
+            obj, message.interface, message.member, "_dbus_is_method"
+        )
+        if function is None:
+            self._reply_error(message, _UNKNOWN_METHOD, message.member or "")
+            return
+
+        kwargs: Dict[str, Any] = {}
+        for keyword, value in (
+            ("_dbus_path_keyword", message.path),
+            ("_dbus_sender_keyword", message.sender),
+            ("_dbus_connection_keyword", self),
+        ):
+            if getattr(function, keyword, None):
+                kwargs[getattr(function, keyword)] = value
+
+        signature = function._dbus_out_signature
+        callbacks = getattr(function, "_dbus_async_callbacks", None)
+        if callbacks:
+            reply, error = callbacks
+            kwargs[reply] = lambda *values: self._reply(message, signature, values)
+            kwargs[error] = lambda exception: self._reply_exception(message, exception)
+
+        try:
+            result = getattr(obj, message.member)(*message.body, **kwargs)
+        except Exception as error:  # pylint: disable=broad-except
+            self._reply_exception(message, error)
+            return
+        if not callbacks:
+            if signature is None or len(split_signature(signature)) != 1:
+                values = () if result is None else result
+                values = values if isinstance(values, tuple) else (values,)
+            else:
+                values = (result,)
+            self._reply(message, signature, values)
+
+    def _reply(self, call: Message, signature: Optional[str], values: Sequence[Any]):
+        if call.flags & NO_REPLY_EXPECTED:
+            return
+        if signature is None:
+            signature = "".join(guess_signature(value) for value in values)
+        self._send(
+            Message(
+                METHOD_RETURN,
+                body=values,
+                reply_serial=call.serial,
+                destination=call.sender,
+                signature=signature,
+            )
+        )
+
+    def _reply_exception(self, call: Message, error: Exception):
+        name = getattr(error, "_dbus_error_name", None) or _FAILED
+        self._reply_error(call, name, str(error))
+
+    def _reply_error(self, call: Message, name: str, text: str):
+        if call.flags & NO_REPLY_EXPECTED:
+            return
+        self._send(
+            Message(
+                ERROR,
+                body=(text,),
+                error_name=name,
+                reply_serial=call.serial,
+                destination=call.sender,
+                signature="s",
+            )
+        )
+
+    # Outgoing calls and signals
+
+    def call(
+        self,
+        destination: str,
+        path: str,
+        interface: str,
+        member: str,
+        signature: str = "",
+        args: Sequence[Any] = (),
+    ) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        serial = self._send(
+            Message(
+                METHOD_CALL,
+                body=args,
+                path=path,
+                interface=interface,
+                member=member,
+                destination=destination,
+                signature=signature,
+            )
+        )
+        self._replies[serial] = future
+        return future
+
+    def emit(
+        self,
+        path: str,
+        interface: str,
+        member: str,
+        signature: Optional[str] = "",
+        args: Sequence[Any] = (),
+    ):
+        if signature is None:
+            signature = "".join(guess_signature(value) for value in args)
+        self._send(
+            Message(
+                SIGNAL,
+                body=args,
+                path=path,
+                interface=interface,
+                member=member,
+                signature=signature,
+            )
+        )
+
+    def subscribe(
+        self,
+        callback: Callable[..., None],
+        interface: Optional[str] = None,
+        member: Optional[str] = None,
+        path: Optional[str] = None,
+        sender: Optional[str] = None,
+        arg0: Optional[str] = None,
+        path_keyword: Optional[str] = None,
+    ) -> Subscription:
+        criteria = (
+            ("interface", interface),
+            ("member", member),
+            ("path", path),
+            ("sender", sender),
+            ("arg0", arg0),
+        )
+        rule = ",".join(
+            ["type='signal'"]
+            + [f"{name}='{value}'" for name, value in criteria if value is not None]
+        )
+        # Signals carry the unique name of their sender: well-known names
+        # are only matched by the bus
+        fields: Tuple[Tuple[str, str], ...] = tuple(
+            (name, value)
+            for name, value in criteria[:4]
+            if value is not None and (name != "sender" or value.startswith(":"))
+        )
+        subscription = _Subscription(self, callback, rule, fields, arg0, path_keyword)
+        self._subscriptions.append(subscription)
+        if self._writer is not None:
+            self._add_match(rule)
+        return subscription
+
+    def _unsubscribe(self, subscription: _Subscription):
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+            if self._writer is not None:
+                self._bus_call("RemoveMatch", subscription.rule)
+
+    def _add_match(self, rule: str):
+        self._bus_call("AddMatch", rule)
+
+    def _bus_call(self, member: str, rule: str):
+        # Fire and forget: a failure only means fewer signals
+        self._send(
+            Message(
+                METHOD_CALL,
+                body=(rule,),
+                flags=NO_REPLY_EXPECTED,
+                path=_BUS_PATH,
+                interface=_BUS_NAME,
+                member=member,
+                destination=_BUS_NAME,
+                signature="s",
+            )
+        )
+
+    # Incoming messages
+
+    async def _read_loop(self):
+        assert self._reader is not None
+        try:
+            while True:
+                start = await self._reader.readexactly(16)
+                header, body = Message.header_size(start)
+                rest = await self._reader.readexactly(header - 16 + body)
+                try:
+                    self._dispatch(Message.decode(start + rest))
+                except Exception:  # pylint: disable=broad-except
+                    traceback.print_exc()
+        except (asyncio.IncompleteReadError, ConnectionError) as error:
+            self._fail_replies(ConnectionError(f"Connection lost: {error}"))
+
+    def _dispatch(self, message: Message):
+        if message.type in (METHOD_RETURN, ERROR):
+            future = self._replies.pop(message.reply_serial, None)
+            if future is None or future.done():
+                return
+            if message.type == ERROR:
+                text = message.body[0] if message.body else ""
+                future.set_exception(DBusError(message.error_name or _FAILED, text))
+            else:
+                future.set_result(reply_value(message.body))
+        elif message.type == SIGNAL:
+            for subscription in list(self._subscriptions):
+                if subscription.matches(message):
+                    kwargs = {}
+                    if subscription.path_keyword:
+                        kwargs[subscription.path_keyword] = message.path
+                    subscription.callback(*message.body, **kwargs)
+        elif message.type == METHOD_CALL:
+            self._dispatch_call(message)
@@ -0,0 +1,123 @@
+import abc
+from concurrent.futures import Future
+from typing import Any, Callable, Optional, Sequence
+
+
+class Subscription(abc.ABC):
+    """A signal subscription, returned by `Backend.subscribe`"""
+
+    @abc.abstractmethod
+    def remove(self):
+        """Stops delivering the signals"""
+
+
+class Backend(abc.ABC):
+    """
+    Transport the D-Bus objects of bluejay are exported and called through.
+
+    Objects are `dbus.service.Object` subclasses, whose decorated methods
+    and signals describe their interfaces. A backend exports them, calls
+    methods of remote objects and delivers signals, without the objects
+    depending on how the bus is reached.
+    """
+
+    unique_name: Optional[str] = None
+    """Unique bus name of the connection, once connected"""
+
+    @abc.abstractmethod
+    def export(self, obj, path: Optional[str] = None):
+        """Exports `obj` at `path`, by default its `path` attribute"""
+
+    @abc.abstractmethod
+    def unexport(self, obj):
+        """Removes `obj` from the bus"""
+
+    @abc.abstractmethod
+    def call(
+        self,
+        destination: str,
+        path: str,
+        interface: str,
+        member: str,
+        signature: str = "",
+        args: Sequence[Any] = (),
+    ) -> Future:
+        """
+        Calls a method of a remote object
+
+        #### Returns:
+            `Future`: Resolved with the reply: `None` when it has no value,
+                the value when it has one, a tuple otherwise.
+        """
+
+    @abc.abstractmethod
+    def subscribe(
+        self,
+        callback: Callable[..., None],
+        interface: Optional[str] = None,
+        member: Optional[str] = None,
+        path: Optional[str] = None,
+        sender: Optional[str] = None,
+        arg0: Optional[str] = None,
+        path_keyword: Optional[str] = None,
+    ) -> Subscription:
+        """
+        Calls `callback` with the arguments of the matching signals
+
+        #### Args:
+            `path_keyword`: Pass the path of the emitter to `callback` as
+                this keyword argument.
+        """
+
+    @abc.abstractmethod
+    def emit(
+        self,
+        path: str,
+        interface: str,
+        member: str,
+        signature: str = "",
+        args: Sequence[Any] = (),
+    ):
+        """Emits a signal from `path`"""
+
+    def close(self):
+        """Disconnects from the bus"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+def reply_value(values: Sequence[Any]) -> Any:
+    """The value a `Backend.call` future is resolved with"""
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return tuple(values)
+
+
+def attach(obj, bus, path: str, init: Callable[..., None]):
+    """
+    Initialises the `dbus.service.Object` `obj` at `path` on `bus`: a
+    dbus-python connection, or a `Backend` exporting it
+
+    #### Args:
+        `init`: The bound `dbus.service.Object.__init__` of `obj`.
+    """
+    if isinstance(bus, Backend):
+        init()
+        bus.export(obj, path)
+    else:
+        init(bus, path)
+
+
+def detach(obj, bus):
+    """Removes `obj`, initialised with `attach`, from `bus`"""
+    if isinstance(bus, Backend):
+        bus.unexport(obj)
+    else:
+        for connection, path in list(obj.locations):
+            obj.remove_from_connection(connection, path)
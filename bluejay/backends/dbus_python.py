@@ -0,0 +1,91 @@
+from concurrent.futures import Future
+from typing import Any, Callable, Optional, Sequence
+
+import dbus
+import dbus.lowlevel
+
+from .base import Backend, Subscription, reply_value
+
+
+class DBusPythonBackend(Backend):
+    """
+    Backend running on a dbus-python connection, dispatched by the GLib
+    main loop (see `bluejay.glib`).
+
+    Without `bus`, it opens and owns a private system bus connection.
+    """
+
+    def __init__(self, bus: Optional[dbus.Bus] = None):
+        self._private = bus is None
+        self.bus = dbus.SystemBus(private=True) if bus is None else bus
+        self.unique_name: Optional[str] = self.bus.get_unique_name()
+
+    def export(self, obj, path: Optional[str] = None):
+        path = path or obj.path
+        if (self.bus, path) not in obj.locations:
+            obj.add_to_connection(self.bus, path)
+
+    def unexport(self, obj):
+        if any(connection is self.bus for connection, _ in obj.locations):
+            obj.remove_from_connection(self.bus)
+
+    def call(
+        self,
+        destination: str,
+        path: str,
+        interface: str,
+        member: str,
+        signature: str = "",
+        args: Sequence[Any] = (),
+    ) -> Future:
+        future: Future = Future()
+        self.bus.call_async(
+            destination,
+            path,
+            interface,
+            member,
+            signature,
+            tuple(args),
+            lambda *values: future.set_result(reply_value(values)),
+            future.set_exception,
+        )
+        return future
+
+    def subscribe(
+        self,
+        callback: Callable[..., None],
+        interface: Optional[str] = None,
+        member: Optional[str] = None,
+        path: Optional[str] = None,
+        sender: Optional[str] = None,
+        arg0: Optional[str] = None,
+        path_keyword: Optional[str] = None,
+    ) -> Subscription:
+        kwargs = {"arg0": arg0} if arg0 is not None else {}
+        # A `SignalMatch` has the `remove` method of a `Subscription`
+        return self.bus.add_signal_receiver(
+            callback,
+            signal_name=member,
+            dbus_interface=interface,
+            bus_name=sender,
+            path=path,
+            path_keyword=path_keyword,
+            **kwargs,
+        )
+
+    def emit(
+        self,
+        path: str,
+        interface: str,
+        member: str,
+        signature: str = "",
+        args: Sequence[Any] = (),
+    ):
+        message = dbus.lowlevel.SignalMessage(path, interface, member)
+        message.append(signature=signature, *args)
+        self.bus.send_message(message)
+
+    def close(self):
+        # Shared connections cannot be closed
+        if self._private:
+            self.bus.close()
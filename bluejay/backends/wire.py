@@ -0,0 +1,385 @@
+"""
+D-Bus wire format: marshalling of values and messages, little endian.
+
+Values are marshalled from plain Python values according to a signature.
+dbus-python types are accepted too, as they subclass the Python types and
+carry the signature of their content. Values of variants are marshalled with
+the signature of a `Variant`, or one inferred from their type.
+"""
+
+import enum
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+METHOD_CALL = 1
+METHOD_RETURN = 2
+ERROR = 3
+SIGNAL = 4
+
+NO_REPLY_EXPECTED = 0x1
+
+# Header fields: (code, signature)
+PATH = (1, "o")
+INTERFACE = (2, "s")
+MEMBER = (3, "s")
+ERROR_NAME = (4, "s")
+REPLY_SERIAL = (5, "u")
+DESTINATION = (6, "s")
+SENDER = (7, "s")
+SIGNATURE = (8, "g")
+
+_FIELDS = {
+    "path": PATH,
+    "interface": INTERFACE,
+    "member": MEMBER,
+    "error_name": ERROR_NAME,
+    "reply_serial": REPLY_SERIAL,
+    "destination": DESTINATION,
+    "sender": SENDER,
+    "signature": SIGNATURE,
+}
+_FIELD_NAMES = {code: name for name, (code, _) in _FIELDS.items()}
+
+_FIXED = {
+    "y": struct.Struct("<B"),
+    "n": struct.Struct("<h"),
+    "q": struct.Struct("<H"),
+    "i": struct.Struct("<i"),
+    "u": struct.Struct("<I"),
+    "x": struct.Struct("<q"),
+    "t": struct.Struct("<Q"),
+    "d": struct.Struct("<d"),
+    "h": struct.Struct("<I"),
+}
+_ALIGNMENT = {
+    "y": 1,
+    "b": 4,
+    "n": 2,
+    "q": 2,
+    "i": 4,
+    "u": 4,
+    "x": 8,
+    "t": 8,
+    "d": 8,
+    "h": 4,
+    "s": 4,
+    "o": 4,
+    "g": 1,
+    "v": 1,
+    "a": 4,
+    "(": 8,
+    "{": 8,
+}
+
+# dbus-python types by class name, to marshal them in variants without
+# importing dbus
+_DBUS_TYPES = {
+    "Byte": "y",
+    "Boolean": "b",
+    "Int16": "n",
+    "UInt16": "q",
+    "Int32": "i",
+    "UInt32": "u",
+    "Int64": "x",
+    "UInt64": "t",
+    "Double": "d",
+    "String": "s",
+    "ObjectPath": "o",
+    "Signature": "g",
+    "ByteArray": "ay",
+}
+
+
+class Variant:
+    """A value to marshal as a variant with an explicit signature"""
+
+    __slots__ = ("signature", "value")
+
+    def __init__(self, signature: str, value: Any):
+        self.signature = signature
+        self.value = value
+
+    def __repr__(self) -> str:
+        return f"Variant({self.signature!r}, {self.value!r})"
+
+
+def _text(value: Any) -> str:
+    # `str()` of a `(str, Enum)` member, like the flags, is its name
+    if isinstance(value, enum.Enum):
+        return str(value.value)
+    return str(value)
+
+
+def _complete_type(signature: str, start: int) -> int:
+    # Returns the end of the single complete type starting at `start`
+    code = signature[start]
+    if code == "a":
+        return _complete_type(signature, start + 1)
+    if code in "({":
+        closing = ")" if code == "(" else "}"
+        position = start + 1
+        while signature[position] != closing:
+            position = _complete_type(signature, position)
+        return position + 1
+    if code not in _ALIGNMENT:
+        raise ValueError(f"Invalid signature {signature!r}")
+    return start + 1
+
+
+def split_signature(signature: str) -> List[str]:
+    """Splits a signature into its complete types"""
+    types = []
+    position = 0
+    while position < len(signature):
+        end = _complete_type(signature, position)
+        types.append(signature[position:end])
+        position = end
+    return types
+
+
+def guess_signature(value: Any) -> str:
+    """Infers the signature of a value put in a variant"""
+    if isinstance(value, Variant):
+        return "v"
+    name = _DBUS_TYPES.get(type(value).__name__)
+    if name is not None:
+        return name
+    if isinstance(value, bool):
+        return "b"
+    if isinstance(value, int):
+        return "i" if -(2**31) <= value < 2**31 else "x"
+    if isinstance(value, float):
+        return "d"
+    if isinstance(value, str):
+        return "s"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "ay"
+
+    # dbus.Array and dbus.Dictionary know their content signature
+    content = getattr(value, "signature", None)
+    if isinstance(value, dict):
+        if content:
+            return f"a{{{content}}}"
+        if not value:
+            return "a{sv}"
+        key, item = next(iter(value.items()))
+        return f"a{{{guess_signature(key)}{guess_signature(item)}}}"
+    if isinstance(value, list):
+        if content:
+            return f"a{content}"
+        return f"a{guess_signature(value[0])}" if value else "av"
+    if isinstance(value, tuple):
+        return "(" + "".join(guess_signature(item) for item in value) + ")"
+    raise TypeError(f"Cannot marshal {value!r} in a variant")
+
+
+class Writer:
+    """Marshals values, aligned relative to the start of the message"""
+
+    def __init__(self, offset: int = 0):
+        self.buffer = bytearray()
+        self._offset = offset
+
+    def align(self, alignment: int):
+        padding = -(self._offset + len(self.buffer)) % alignment
+        if padding:
+            self.buffer += bytes(padding)
+
+    def write(self, signature: str, value: Any):
+        code = signature[0]
+        fixed = _FIXED.get(code)
+        if fixed is not None:
+            self.align(fixed.size)
+            self.buffer += fixed.pack(value)
+        elif code == "b":
+            self.align(4)
+            self.buffer += struct.pack("<I", 1 if value else 0)
+        elif code in "so":
+            data = _text(value).encode()
+            self.align(4)
+            self.buffer += struct.pack("<I", len(data)) + data + b"\x00"
+        elif code == "g":
+            data = _text(value).encode()
+            self.buffer += bytes((len(data),)) + data + b"\x00"
+        elif code == "v":
+            if isinstance(value, Variant):
+                inner, value = value.signature, value.value
+            else:
+                inner = guess_signature(value)
+            self.write("g", inner)
+            self.write(inner, value)
+        elif code == "(":
+            self.align(8)
+            for item_signature, item in zip(split_signature(signature[1:-1]), value):
+                self.write(item_signature, item)
+        elif code == "a":
+            self._write_array(signature[1:], value)
+        else:
+            raise ValueError(f"Invalid signature {signature!r}")
+
+    def _write_array(self, element: str, value: Any):
+        self.align(4)
+        length_at = len(self.buffer)
+        self.buffer += bytes(4)
+        self.align(_ALIGNMENT[element[0]])
+        start = len(self.buffer)
+
+        if element == "y":
+            self.buffer += bytes(value)
+        elif element[0] == "{":
+            key_signature, value_signature = split_signature(element[1:-1])
+            for key, item in value.items():
+                self.align(8)
+                self.write(key_signature, key)
+                self.write(value_signature, item)
+        else:
+            for item in value:
+                self.write(element, item)
+
+        struct.pack_into("<I", self.buffer, length_at, len(self.buffer) - start)
+
+    def write_all(self, signature: str, values) -> bytes:
+        for item_signature, value in zip(split_signature(signature), values):
+            self.write(item_signature, value)
+        return bytes(self.buffer)
+
+
+class Reader:
+    """Unmarshals values, aligned relative to the start of `data`"""
+
+    def __init__(self, data: bytes, position: int = 0):
+        self.data = data
+        self.position = position
+
+    def align(self, alignment: int):
+        self.position += -self.position % alignment
+
+    def read(self, signature: str) -> Any:
+        code = signature[0]
+        fixed = _FIXED.get(code)
+        if fixed is not None:
+            self.align(fixed.size)
+            value = fixed.unpack_from(self.data, self.position)[0]
+            self.position += fixed.size
+            return value
+        if code == "b":
+            return bool(self.read("u"))
+        if code in "so":
+            length = self.read("u")
+            start = self.position
+            self.position += length + 1
+            return self.data[start : start + length].decode()
+        if code == "g":
+            length = self.data[self.position]
+            start = self.position + 1
+            self.position = start + length + 1
+            return self.data[start : start + length].decode()
+        if code == "v":
+            return self.read(self.read("g"))
+        if code == "(":
+            self.align(8)
+            return tuple(self.read(item) for item in split_signature(signature[1:-1]))
+        if code == "a":
+            return self._read_array(signature[1:])
+        raise ValueError(f"Invalid signature {signature!r}")
+
+    def _read_array(self, element: str) -> Any:
+        length = self.read("u")
+        self.align(_ALIGNMENT[element[0]])
+        end = self.position + length
+
+        if element == "y":
+            value = bytes(self.data[self.position : end])
+            self.position = end
+            return value
+        if element[0] == "{":
+            key_signature, value_signature = split_signature(element[1:-1])
+            result: Dict[Any, Any] = {}
+            while self.position < end:
+                self.align(8)
+                key = self.read(key_signature)
+                result[key] = self.read(value_signature)
+            return result
+
+        items = []
+        while self.position < end:
+            items.append(self.read(element))
+        return items
+
+    def read_all(self, signature: str) -> List[Any]:
+        return [self.read(item) for item in split_signature(signature)]
+
+
+class Message:
+    """A D-Bus message"""
+
+    def __init__(
+        self,
+        type: int,
+        serial: int = 0,
+        flags: int = 0,
+        body: Tuple = (),
+        **fields,
+    ):
+        self.type = type
+        self.serial = serial
+        self.flags = flags
+        self.body = tuple(body)
+        self.path: Optional[str] = fields.get("path")
+        self.interface: Optional[str] = fields.get("interface")
+        self.member: Optional[str] = fields.get("member")
+        self.error_name: Optional[str] = fields.get("error_name")
+        self.reply_serial: Optional[int] = fields.get("reply_serial")
+        self.destination: Optional[str] = fields.get("destination")
+        self.sender: Optional[str] = fields.get("sender")
+        self.signature: str = fields.get("signature") or ""
+
+    def __repr__(self) -> str:
+        return (
+            f"Message(type={self.type}, serial={self.serial}, path={self.path!r}, "
+            f"interface={self.interface!r}, member={self.member!r}, "
+            f"error_name={self.error_name!r}, body={self.body!r})"
+        )
+
+    def encode(self) -> bytes:
+        body = Writer().write_all(self.signature, self.body)
+
+        fields = []
+        for name, (code, signature) in _FIELDS.items():
+            value = getattr(self, name)
+            if value:
+                fields.append((code, Variant(signature, value)))
+
+        header = Writer()
+        header.buffer += struct.pack(
+            "<cBBBII", b"l", self.type, self.flags, 1, len(body), self.serial
+        )
+        header.write("a(yv)", fields)
+        header.align(8)
+        return bytes(header.buffer) + body
+
+    @staticmethod
+    def header_size(data: bytes) -> Tuple[int, int]:
+        """
+        Returns the size of the header, padded, and of the body of the
+        message starting with the 16 bytes `data`
+        """
+        if data[:1] != b"l":
+            raise ValueError("Only little endian messages are supported")
+        body_length, _, fields_length = struct.unpack_from("<III", data, 4)
+        header = 16 + fields_length
+        return header + (-header % 8), body_length
+
+    @classmethod
+    def decode(cls, data: bytes) -> "Message":
+        _, type, flags, _, _, serial = struct.unpack_from("<cBBBII", data)
+        reader = Reader(data, 12)
+        fields = {
+            _FIELD_NAMES[code]: value
+            for code, value in reader.read("a(yv)")
+            if code in _FIELD_NAMES
+        }
+        reader.align(8)
+        signature = fields.get("signature") or ""
+        body = reader.read_all(signature) if signature else []
+        return cls(type, serial, flags, body, **fields)
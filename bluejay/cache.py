@@ -0,0 +1,94 @@
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .glib import GLib
+
+ValueProvider = Callable[[], Any]
+Scheduler = Callable[[Callable[[], bool]], Any]
+
+
+def _schedule_idle(function: Callable[[], bool]):
+    return GLib.timeout_add(0, function)
+
+
+class ValueCache:
+    """
+    Caches the value returned by a provider for `ttl` milliseconds.
+
+    Reads within the TTL are served from the cache. Once the value expires the
+    stale value keeps being served while a single refresh runs in the
+    background on the GLib loop; further reads never start a second refresh
+    until the first one completes.
+    """
+
+    def __init__(
+        self,
+        provider: ValueProvider,
+        ttl: int,
+        schedule: Optional[Scheduler] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        #### Args:
+            `provider`: Function returning the current value.
+            `ttl`: How long a value stays fresh, in milliseconds.
+            `schedule`: Function used to run the background refresh. It
+                receives a callable returning `False`, like a GLib source
+                callback. Defaults to an immediate `GLib.timeout_add`.
+            `clock`: Monotonic clock in seconds.
+        """
+        self.provider = provider
+        self.ttl = ttl
+        self._ttl_seconds = ttl / 1000
+        self._schedule = schedule or _schedule_idle
+        self._clock = clock
+
+        self._value: Any = None
+        self._timestamp = 0.0
+        self._refreshing = False
+
+        self.hits = 0
+        """Reads served from the cache, fresh or stale"""
+        self.misses = 0
+        """Reads that had to call the provider synchronously"""
+        self.refreshes = 0
+        """Background refreshes started"""
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "refreshes": self.refreshes}
+
+    def get(self) -> Any:
+        if self._value is None:
+            self.misses += 1
+            self.set(self.provider())
+            return self._value
+
+        self.hits += 1
+        if (
+            not self._refreshing
+            and self._clock() - self._timestamp >= self._ttl_seconds
+        ):
+            self._refreshing = True
+            self.refreshes += 1
+            self._schedule(self._refresh)
+
+        return self._value
+
+    def set(self, value: Any):
+        """Stores `value` as the fresh cached value"""
+        self._value = value
+        self._timestamp = self._clock()
+
+    def invalidate(self):
+        """Drops the cached value, so that the next read calls the provider"""
+        self._value = None
+
+    def _refresh(self) -> bool:
+        try:
+            self.set(self.provider())
+        except Exception as error:  # pylint: disable=broad-except
+            print(f"Cannot refresh cached value: {error}")
+        finally:
+            self._refreshing = False
+        return False
@@ -0,0 +1,103 @@
+"""
+AES-128 encryption and AES-CMAC (RFC 4493), as used by the GATT Database Hash.
+
+Pure Python and unoptimised: the hash is only computed when the GATT tree
+changes.
+"""
+
+from typing import List
+
+
+def _xtime(value: int) -> int:
+    value <<= 1
+    return (value ^ 0x11B) if value & 0x100 else value
+
+
+def _build_sbox() -> List[int]:
+    sbox = [0] * 256
+    p = q = 1
+    while True:
+        # Multiply p by 3 and divide q by 3 in GF(2^8)
+        p ^= _xtime(p) & 0xFF
+        q ^= q << 1
+        q ^= q << 2
+        q ^= q << 4
+        q &= 0xFF
+        if q & 0x80:
+            q ^= 0x09
+        rotated = q
+        for shift in (1, 2, 3, 4):
+            rotated ^= ((q << shift) | (q >> (8 - shift))) & 0xFF
+        sbox[p] = rotated ^ 0x63
+        if p == 1:
+            break
+    sbox[0] = 0x63
+    return sbox
+
+
+_SBOX = _build_sbox()
+_RCON = [0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80, 0x1B, 0x36]
+
+
+def _expand_key(key: bytes) -> List[List[int]]:
+    words = [list(key[i : i + 4]) for i in range(0, 16, 4)]
+    for i in range(4, 44):
+        word = list(words[i - 1])
+        if i % 4 == 0:
+            word = word[1:] + word[:1]
+            word = [_SBOX[byte] for byte in word]
+            word[0] ^= _RCON[i // 4 - 1]
+        words.append([a ^ b for a, b in zip(words[i - 4], word)])
+    return [sum(words[round * 4 : round * 4 + 4], []) for round in range(11)]
+
+
+def aes128_encrypt(key: bytes, block: bytes) -> bytes:
+    """Encrypts one 16 bytes `block` with AES-128"""
+    if len(key) != 16 or len(block) != 16:
+        raise ValueError("AES-128 needs a 16 bytes key and block")
+
+    round_keys = _expand_key(key)
+    state = [a ^ b for a, b in zip(block, round_keys[0])]
+    for round in range(1, 11):
+        state = [_SBOX[byte] for byte in state]
+        # ShiftRows, on a column-major state
+        state = [state[(i + 4 * (i % 4)) % 16] for i in range(16)]
+        if round != 10:
+            mixed = []
+            for column in range(4):
+                a = state[column * 4 : column * 4 + 4]
+                total = a[0] ^ a[1] ^ a[2] ^ a[3]
+                mixed += [
+                    a[row] ^ total ^ (_xtime(a[row] ^ a[(row + 1) % 4]) & 0xFF)
+                    for row in range(4)
+                ]
+            state = mixed
+        state = [a ^ b for a, b in zip(state, round_keys[round])]
+    return bytes(state)
+
+
+def _shift_left(block: bytes) -> bytes:
+    value = (int.from_bytes(block, "big") << 1) & ((1 << 128) - 1)
+    if block[0] & 0x80:
+        value ^= 0x87
+    return value.to_bytes(16, "big")
+
+
+def aes_cmac(key: bytes, message: bytes) -> bytes:
+    """Computes the AES-CMAC of `message` (RFC 4493)"""
+    k1 = _shift_left(aes128_encrypt(key, bytes(16)))
+    k2 = _shift_left(k1)
+
+    blocks = max(1, -(-len(message) // 16))
+    last = message[(blocks - 1) * 16 :]
+    if len(last) == 16:
+        last = bytes(a ^ b for a, b in zip(last, k1))
+    else:
+        padded = last + b"\x80" + bytes(15 - len(last))
+        last = bytes(a ^ b for a, b in zip(padded, k2))
+
+    state = bytes(16)
+    for i in range(blocks - 1):
+        block = message[i * 16 : i * 16 + 16]
+        state = aes128_encrypt(key, bytes(a ^ b for a, b in zip(state, block)))
+    return aes128_encrypt(key, bytes(a ^ b for a, b in zip(state, last)))
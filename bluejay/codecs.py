@@ -0,0 +1,262 @@
+import abc
+import re
+import struct
+from typing import Any, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Characteristic Presentation Format (0x2904) format types
+FORMAT_BOOLEAN = 0x01
+FORMAT_UINT8 = 0x04
+FORMAT_UINT16 = 0x06
+FORMAT_UINT32 = 0x08
+FORMAT_UINT64 = 0x0A
+FORMAT_SINT8 = 0x0C
+FORMAT_SINT16 = 0x0E
+FORMAT_SINT32 = 0x10
+FORMAT_SINT64 = 0x12
+FORMAT_FLOAT32 = 0x14
+FORMAT_FLOAT64 = 0x15
+FORMAT_UTF8 = 0x19
+FORMAT_STRUCT = 0x1B
+
+UNIT_UNITLESS = 0x2700
+NAMESPACE_BLUETOOTH_SIG = 0x01
+
+# struct format character: (presentation format, NumPy type)
+_TYPES = {
+    "?": (FORMAT_BOOLEAN, "?"),
+    "B": (FORMAT_UINT8, "u1"),
+    "H": (FORMAT_UINT16, "u2"),
+    "I": (FORMAT_UINT32, "u4"),
+    "L": (FORMAT_UINT32, "u4"),
+    "Q": (FORMAT_UINT64, "u8"),
+    "b": (FORMAT_SINT8, "i1"),
+    "h": (FORMAT_SINT16, "i2"),
+    "i": (FORMAT_SINT32, "i4"),
+    "l": (FORMAT_SINT32, "i4"),
+    "q": (FORMAT_SINT64, "i8"),
+    "f": (FORMAT_FLOAT32, "f4"),
+    "d": (FORMAT_FLOAT64, "f8"),
+}
+
+_FIELD = re.compile(r"(\d*)([?BHILQbhilqfdsx])")
+
+
+def _buffer(value) -> Any:
+    # `WriteValue` receives a `dbus.Array` of `dbus.Byte`: turn it into bytes
+    # in one go, leave buffers untouched
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return value
+    if np is not None and isinstance(value, np.ndarray):
+        return value
+    return bytes(value)
+
+
+def _parse(fmt: str) -> Tuple[str, List[Tuple[int, str]]]:
+    byte_order = "<"
+    if fmt[:1] in "<>!=@":
+        byte_order, fmt = fmt[0], fmt[1:]
+    if byte_order in "=@":
+        raise ValueError("GATT values need an explicit byte order")
+    fields = [(int(count or 1), kind) for count, kind in _FIELD.findall(fmt)]
+    if "".join(f"{c}{k}" for c, k in _FIELD.findall(fmt)) != fmt.replace(" ", ""):
+        raise ValueError(f"Unsupported struct format {fmt!r}")
+    return ("<" if byte_order == "<" else ">"), fields
+
+
+class Codec(abc.ABC):
+    """
+    Converts between Python values and the bytes of a characteristic or
+    descriptor value.
+
+    `decode()` accepts what `WriteValue` receives (or any bytes-like object)
+    and `encode()` returns `bytes`, which dbus-python sends as `ay` without
+    building a list of `dbus.Byte`. Attach a codec with
+    `Characteristic.set_codec()`.
+    """
+
+    format = FORMAT_STRUCT
+    """Presentation format type of the value"""
+
+    def __init__(
+        self,
+        exponent: int = 0,
+        unit: int = UNIT_UNITLESS,
+        namespace: int = NAMESPACE_BLUETOOTH_SIG,
+        description: int = 0,
+    ):
+        """
+        #### Args:
+            `exponent`: Base 10 exponent applied to the value by the client.
+            `unit`: Bluetooth SIG unit UUID, e.g. `0x272F` for Celsius.
+            `namespace`, `description`: Namespace and description of the
+                presentation format.
+        """
+        self.exponent = exponent
+        self.unit = unit
+        self.namespace = namespace
+        self.description = description
+
+    @abc.abstractmethod
+    def encode(self, value: Any) -> bytes:
+        """Encodes a Python value"""
+
+    @abc.abstractmethod
+    def decode(self, value) -> Any:
+        """Decodes a bytes-like value"""
+
+    def decode_batch(self, values) -> Any:
+        """
+        Decodes several values, e.g. a `WriteBatch`. Codecs with a fixed
+        size decode the whole buffer at once.
+        """
+        return [self.decode(value) for value in values]
+
+    def presentation_format(self) -> bytes:
+        """The value of the Characteristic Presentation Format descriptor"""
+        return struct.pack(
+            "<BbHBH",
+            self.format,
+            self.exponent,
+            self.unit,
+            self.namespace,
+            self.description,
+        )
+
+
+class StructCodec(Codec):
+    """
+    Codec for fixed size values described by a `struct` format, compiled
+    once. The format is little endian unless it starts with `>` or `!`.
+
+    Single field formats decode to a scalar, others to a tuple. Batches are
+    decoded with `struct.iter_unpack`, or to a NumPy record array when NumPy
+    is available.
+    """
+
+    def __init__(self, fmt: str, **kwargs):
+        """
+        #### Args:
+            `fmt`: `struct` format, e.g. `"h"` or `"<hHB"`.
+            `kwargs`: See `Codec`.
+        """
+        super().__init__(**kwargs)
+        byte_order, fields = _parse(fmt)
+        self.struct = struct.Struct(byte_order + fmt.lstrip("<>!"))
+        self.size = self.struct.size
+
+        values = [(count, kind) for count, kind in fields if kind != "x"]
+        self._scalar = len(values) == 1 and (values[0][0] == 1 or values[0][1] == "s")
+        if self._scalar and values[0][1] == "s":
+            self.format = FORMAT_UTF8
+        elif self._scalar:
+            self.format = _TYPES[values[0][1]][0]
+
+        self.dtype = None
+        if np is not None:
+            self.dtype = np.dtype(
+                [
+                    (f"f{index}", *_numpy_field(byte_order, count, kind))
+                    for index, (count, kind) in enumerate(fields)
+                ]
+            )
+
+    def encode(self, value: Any) -> bytes:
+        if self._scalar:
+            return self.struct.pack(value)
+        return self.struct.pack(*value)
+
+    def decode(self, value) -> Any:
+        values = self.struct.unpack_from(_buffer(value))
+        return values[0] if self._scalar else values
+
+    def decode_batch(self, values) -> Any:
+        data = getattr(values, "data", None)
+        if data is None:
+            data = b"".join(_buffer(value) for value in values)
+        if len(data) % self.size:
+            raise ValueError(f"Batch is not made of {self.size} bytes values")
+
+        if self.dtype is not None:
+            return np.frombuffer(data, dtype=self.dtype)
+        if self._scalar:
+            return [fields[0] for fields in self.struct.iter_unpack(data)]
+        return list(self.struct.iter_unpack(data))
+
+
+def _numpy_field(byte_order: str, count: int, kind: str) -> Tuple:
+    if kind == "s":
+        return (f"S{count}",)
+    if kind == "x":
+        return (f"V{count}",)
+    dtype = byte_order + _TYPES[kind][1]
+    return (dtype,) if count == 1 else (dtype, (count,))
+
+
+class ArrayCodec(Codec):
+    """
+    Codec for values made of a variable number of samples of a NumPy
+    `dtype`, e.g. a burst of `int16` readings. Values decode to read-only
+    arrays sharing the received buffer.
+    """
+
+    def __init__(self, dtype: Any, **kwargs):
+        """
+        #### Args:
+            `dtype`: NumPy type of a sample, little endian unless specified.
+            `kwargs`: See `Codec`.
+        """
+        if np is None:
+            raise ImportError("NumPy is required for `ArrayCodec`")
+
+        super().__init__(**kwargs)
+        dtype = np.dtype(dtype)
+        if dtype.byteorder == "=":
+            dtype = dtype.newbyteorder("<")
+        self.dtype = dtype
+
+        for presentation, numpy in _TYPES.values():
+            if np.dtype(numpy) == dtype.newbyteorder("="):
+                self.format = presentation
+                break
+
+    def encode(self, value: Iterable) -> bytes:
+        return np.asarray(value, dtype=self.dtype).tobytes()
+
+    def decode(self, value) -> Any:
+        return np.frombuffer(_buffer(value), dtype=self.dtype)
+
+    def decode_batch(self, values) -> Any:
+        """Decodes the samples of every value into a single array"""
+        data = getattr(values, "data", None)
+        if data is None:
+            data = b"".join(_buffer(value) for value in values)
+        return np.frombuffer(data, dtype=self.dtype)
+
+
+class StringCodec(Codec):
+    """Codec for UTF-8 strings"""
+
+    format = FORMAT_UTF8
+
+    def encode(self, value: str) -> bytes:
+        return value.encode("utf-8")
+
+    def decode(self, value) -> str:
+        return bytes(_buffer(value)).decode("utf-8", errors="replace")
+
+
+def as_codec(fmt: Any, **kwargs) -> Optional[Codec]:
+    """
+    Returns a `StructCodec` for a `struct` format string, an `ArrayCodec`
+    for a NumPy type, and `fmt` itself if it already is a `Codec`
+    """
+    if fmt is None or isinstance(fmt, Codec):
+        return fmt
+    if isinstance(fmt, str):
+        return StructCodec(fmt, **kwargs)
+    return ArrayCodec(fmt, **kwargs)
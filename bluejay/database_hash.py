@@ -0,0 +1,129 @@
+from typing import Any, Iterable, List, Tuple
+
+from .cmac import aes_cmac
+from .uuids import BluetoothUUID
+
+PRIMARY_SERVICE = 0x2800
+SECONDARY_SERVICE = 0x2801
+CHARACTERISTIC = 0x2803
+EXTENDED_PROPERTIES = 0x2900
+USER_DESCRIPTION = 0x2901
+CLIENT_CONFIGURATION = 0x2902
+SERVER_CONFIGURATION = 0x2903
+PRESENTATION_FORMAT = 0x2904
+AGGREGATE_FORMAT = 0x2905
+
+# Descriptors hashed by handle and type only
+_TYPE_ONLY = {
+    USER_DESCRIPTION,
+    CLIENT_CONFIGURATION,
+    SERVER_CONFIGURATION,
+    PRESENTATION_FORMAT,
+    AGGREGATE_FORMAT,
+}
+
+_PROPERTIES = {
+    "broadcast": 0x01,
+    "read": 0x02,
+    "encrypt-read": 0x02,
+    "encrypt-authenticated-read": 0x02,
+    "secure-read": 0x02,
+    "write-without-response": 0x04,
+    "write": 0x08,
+    "encrypt-write": 0x08,
+    "encrypt-authenticated-write": 0x08,
+    "secure-write": 0x08,
+    "notify": 0x10,
+    "encrypt-notify": 0x10,
+    "encrypt-authenticated-notify": 0x10,
+    "secure-notify": 0x10,
+    "indicate": 0x20,
+    "encrypt-indicate": 0x20,
+    "encrypt-authenticated-indicate": 0x20,
+    "secure-indicate": 0x20,
+    "authenticated-signed-writes": 0x40,
+    "extended-properties": 0x80,
+    "reliable_write": 0x80,
+    "writable-auxiliaries": 0x80,
+}
+
+
+def _uuid(uuid: str) -> bytes:
+    uuid = BluetoothUUID(uuid)
+    short = uuid.short
+    if short is not None and short <= 0xFFFF:
+        return short.to_bytes(2, "little")
+    return bytes.fromhex(uuid.replace("-", ""))[::-1]
+
+
+def _u16(value: int) -> bytes:
+    return value.to_bytes(2, "little")
+
+
+def attribute_table(services: Iterable[Any], first_handle: int = 1) -> List[Tuple]:
+    """
+    Lays out the attributes of `services` the way BlueZ does: service
+    declaration, then for each characteristic its declaration, value, the
+    Client Characteristic Configuration descriptor (for notify/indicate) and
+    Extended Properties descriptor BlueZ adds, then the characteristic
+    descriptors.
+
+    #### Returns:
+        `list`: `(handle, type, value)` tuples, where `value` is `None` for
+            attributes whose value is not covered by the hash.
+    """
+    table: List[Tuple] = []
+    handle = first_handle
+    for service in services:
+        kind = PRIMARY_SERVICE if service.primary else SECONDARY_SERVICE
+        table.append((handle, kind, _uuid(service.uuid)))
+        handle += 1
+
+        for char in service.characteristics:
+            flags = [str(getattr(flag, "value", flag)) for flag in char.flags]
+            properties = 0
+            for flag in flags:
+                properties |= _PROPERTIES.get(flag, 0)
+
+            value_handle = handle + 1
+            declaration = bytes((properties,)) + _u16(value_handle) + _uuid(char.uuid)
+            table.append((handle, CHARACTERISTIC, declaration))
+            handle = value_handle + 1
+
+            if properties & 0x30:
+                table.append((handle, CLIENT_CONFIGURATION, None))
+                handle += 1
+            if properties & 0x80:
+                extended = 0
+                if "reliable_write" in flags:
+                    extended |= 0x01
+                if "writable-auxiliaries" in flags:
+                    extended |= 0x02
+                table.append((handle, EXTENDED_PROPERTIES, _u16(extended)))
+                handle += 1
+
+            for desc in char.descriptors:
+                short = BluetoothUUID(desc.uuid).short
+                if short in _TYPE_ONLY:
+                    table.append((handle, short, None))
+                handle += 1
+
+    return table
+
+
+def database_hash(services: Iterable[Any], first_handle: int = 1) -> bytes:
+    """
+    Computes the GATT Database Hash (characteristic 0x2B2A) of `services`:
+    the AES-CMAC, with a zero key, of the handle, type and (for declarations)
+    value of every attribute in `attribute_table()`.
+
+    Handles are assigned sequentially from `first_handle`. Pass the handle
+    BlueZ gives to the first service of the application to obtain the exact
+    value a client computes.
+    """
+    message = bytearray()
+    for handle, kind, value in attribute_table(services, first_handle):
+        message += _u16(handle) + _u16(kind)
+        if value is not None:
+            message += value
+    return aes_cmac(bytes(16), bytes(message))
@@ -0,0 +1,97 @@
+import collections
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, Tuple
+
+from .glib import GLib
+
+_Call = Tuple[float, Future, Callable[..., Any], tuple, dict]
+
+
+class LoopDispatcher:
+    """
+    Runs calls from any thread inside the GLib main loop.
+
+    Calls are queued and drained in batches by a single idle source: only the
+    first call queued after a drain wakes up the loop. Every call returns a
+    `concurrent.futures.Future` resolved with its result or exception.
+    """
+
+    def __init__(self):
+        self._queue: Deque[_Call] = collections.deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+        self.calls = 0
+        """Calls executed"""
+        self.batches = 0
+        """Batches drained, i.e. loop wakeups"""
+        self.max_latency = 0.0
+        """Longest time a call waited in the queue, in seconds"""
+        self.total_latency = 0.0
+        """Sum of the time every call waited in the queue, in seconds"""
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "batches": self.batches,
+            "pending": self.pending,
+            "mean_latency": self.total_latency / self.calls if self.calls else 0.0,
+            "max_latency": self.max_latency,
+        }
+
+    def submit(self, function: Callable[..., Any], *args, **kwargs) -> Future:
+        """Queues `function(*args, **kwargs)` to run inside the loop"""
+        future: Future = Future()
+        with self._lock:
+            self._queue.append((time.monotonic(), future, function, args, kwargs))
+            wakeup = not self._scheduled
+            self._scheduled = True
+
+        if wakeup:
+            GLib.idle_add(self._drain)
+        return future
+
+    def call(self, function: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Same as `submit()`, but runs `function` immediately when called from
+        the loop thread
+        """
+        if not GLib.is_loop_thread():
+            return self.submit(function, *args, **kwargs)
+
+        future: Future = Future()
+        self._run(future, function, args, kwargs)
+        return future
+
+    def _drain(self) -> bool:
+        with self._lock:
+            queue = self._queue
+            self._queue = collections.deque()
+            self._scheduled = False
+
+        self.batches += 1
+        now = time.monotonic()
+        for queued, future, function, args, kwargs in queue:
+            latency = now - queued
+            self.total_latency += latency
+            if latency > self.max_latency:
+                self.max_latency = latency
+            self._run(future, function, args, kwargs)
+
+        return False
+
+    def _run(self, future: Future, function, args, kwargs):
+        if not future.set_running_or_notify_cancel():
+            return
+        self.calls += 1
+        try:
+            future.set_result(function(*args, **kwargs))
+        except BaseException as error:  # pylint: disable=broad-except
+            future.set_exception(error)
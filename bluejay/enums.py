@@ -57,3 +57,12 @@ class CharacteristicFlag(str, enum.Enum):
     SECURE_NOTIFY = "secure-notify"
     SECURE_INDICATE = "secure-indicate"
     AUTHORIZE = "authorize"
+
+
+class NotificationPriority(enum.IntEnum):
+    """Priority classes of `NotificationScheduler`, most urgent first"""
+
+    CRITICAL = 0
+    HIGH = 1
+    NORMAL = 2
+    BULK = 3
@@ -1,7 +1,12 @@
 from typing import Any, Callable, Optional, TypeVar, Union
 
-import dbus.mainloop.glib
-from gi.repository import GLib as _GLib  # type: ignore
+try:
+    import dbus.mainloop.glib
+    from gi.repository import GLib as _GLib  # type: ignore
+except ImportError:
+    # The modules scheduling through `GLib` stay importable, e.g. to be
+    # tested with another clock; calling into GLib fails
+    _GLib = None
 
 _T = TypeVar("_T")
 
@@ -71,6 +76,51 @@ class GLib:
         else:
             return _GLib.timeout_add_seconds(interval, function, data)
 
+    @staticmethod
+    def idle_add(
+        function: Union[Callable[[_T], Any], Callable[[], Any]],
+        data: Optional[_T] = None,
+    ) -> int:
+        """
+        Sets a function to be called whenever there are no higher priority
+        events pending, until it returns `False` or is cancelled with
+        `source_remove`. Safe to call from any thread: it wakes up the loop.
+
+        #### Args:
+            `function`: Function to call.
+            `data`: Data to pass to function.
+
+        #### Returns:
+            `int`: The id of the event source.
+        """
+
+        if data is None:
+            return _GLib.idle_add(function)
+        else:
+            return _GLib.idle_add(function, data)
+
+    @staticmethod
+    def unix_fd_add(fd: int, function: Callable[[int, Any], bool]) -> int:
+        """
+        Calls `function(fd, condition)` whenever `fd` becomes readable or is
+        hung up, until it returns `False` or is cancelled with
+        `source_remove`
+
+        #### Returns:
+            `int`: The id of the event source.
+        """
+
+        condition = _GLib.IOCondition.IN | _GLib.IOCondition.HUP
+        return _GLib.unix_fd_add_full(_GLib.PRIORITY_DEFAULT, fd, condition, function)
+
+    @staticmethod
+    def is_loop_thread() -> bool:
+        """
+        Returns `True` if called from the thread currently running the main
+        loop
+        """
+        return _GLib.MainContext.default().is_owner()
+
     @staticmethod
     def source_remove(id: Optional[int]) -> bool:
         """
@@ -92,8 +142,21 @@ class GLib:
 
 
 class MainLoop:
+    """
+    The GLib main loop of the global default context.
+
+    dbus-python dispatches every bus connection on the global default
+    context, so bus callbacks, timers and marshalled calls all run in the
+    thread running this loop. Creating another loop does not isolate a
+    manager: it runs the same context.
+    """
+
+    _dbus_installed = False
+
     def __init__(self):
-        dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
+        if not MainLoop._dbus_installed:
+            dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
+            MainLoop._dbus_installed = True
         self._mainloop = _GLib.MainLoop()
 
     def run(self):
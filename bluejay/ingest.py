@@ -0,0 +1,141 @@
+from typing import Any, Callable, Iterator, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .glib import GLib
+
+
+class WriteBatch:
+    """
+    A batch of writes stored back to back in one contiguous buffer.
+
+    `data` is a `memoryview` (or a NumPy `uint8` array) over the whole batch
+    and write `i` spans `data[offsets[i]:offsets[i + 1]]`.
+
+    The buffer is reused for the next batch: views are only valid while the
+    batch handler runs, copy them to keep them around.
+    """
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(self, data: Any, offsets: List[int]):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int):
+        return self.data[self.offsets[index] : self.offsets[index + 1]]
+
+    def __iter__(self) -> Iterator[Any]:
+        data = self.data
+        offsets = self.offsets
+        for i in range(len(offsets) - 1):
+            yield data[offsets[i] : offsets[i + 1]]
+
+
+BatchHandler = Callable[[WriteBatch], None]
+
+
+class WriteBatcher:
+    """
+    Accumulates incoming writes into a preallocated buffer and delivers them
+    to a handler in batches.
+
+    A batch is delivered when it holds `batch_size` writes, when the buffer is
+    full, or `max_latency` milliseconds after its first write, whichever comes
+    first.
+    """
+
+    def __init__(
+        self,
+        handler: BatchHandler,
+        batch_size: int = 64,
+        max_latency: int = 10,
+        buffer_size: Optional[int] = None,
+        as_numpy: bool = False,
+    ):
+        """
+        #### Args:
+            `handler`: Function receiving each `WriteBatch`.
+            `batch_size`: Maximum number of writes per batch.
+            `max_latency`: Maximum time in milliseconds a write waits in the
+                buffer before being delivered.
+            `buffer_size`: Size of the buffer in bytes. Defaults to
+                `batch_size` writes of the largest ATT payload (512 bytes).
+            `as_numpy`: Deliver `WriteBatch.data` as a NumPy `uint8` array
+                instead of a `memoryview`.
+        """
+        if as_numpy and np is None:
+            raise ImportError("NumPy is required for `as_numpy` batches")
+
+        self.handler = handler
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.as_numpy = as_numpy
+
+        self._buffer = bytearray(buffer_size or batch_size * 512)
+        self._view = memoryview(self._buffer)
+        self._offsets = [0]
+        self._position = 0
+        self._timer: Optional[int] = None
+
+        self.writes = 0
+        self.batches = 0
+
+    def append(self, value):
+        """
+        Queues one write. `value` can be any bytes-like object or a sequence
+        of integers such as the `dbus.Array` received by `WriteValue`.
+        """
+        if not isinstance(value, (bytes, bytearray, memoryview)):
+            value = bytes(value)
+
+        size = len(value)
+        if self._position + size > len(self._buffer):
+            self.flush()
+            if size > len(self._buffer):
+                self.writes += 1
+                self._deliver(memoryview(value).cast("B"), [0, size])
+                return
+
+        end = self._position + size
+        self._view[self._position : end] = value
+        self._position = end
+        self._offsets.append(end)
+        self.writes += 1
+
+        if len(self._offsets) > self.batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = GLib.timeout_add(self.max_latency, self._on_timeout)
+
+    def flush(self):
+        """Delivers the pending writes immediately"""
+        if self._timer is not None:
+            GLib.source_remove(self._timer)
+            self._timer = None
+
+        if self._position == 0 and len(self._offsets) == 1:
+            return
+
+        offsets = self._offsets
+        self._offsets = [0]
+        position = self._position
+        self._position = 0
+        self._deliver(self._view[:position], offsets)
+
+    def _deliver(self, data, offsets: List[int]):
+        if self.as_numpy:
+            data = np.frombuffer(data, dtype=np.uint8)
+        self.batches += 1
+        self.handler(WriteBatch(data, offsets))
+
+    def _on_timeout(self) -> bool:
+        self._timer = None
+        self.flush()
+        return False
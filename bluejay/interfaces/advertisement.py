@@ -3,6 +3,12 @@ import typing
 import dbus
 import dbus.service
 
+from ..ad_payload import (
+    LEGACY_PAYLOAD_LENGTH,
+    EncodedAdvertisement,
+    encode_advertisement,
+)
+from ..backends.base import attach, detach
 from ..constants import ADVERTISEMENT_INTERFACE, DBUS_PROPERTIES
 from ..enums import AdType
 from ..exceptions import InvalidArgsException
@@ -184,7 +190,59 @@ class Advertisement(dbus.service.Object):
         in range [-127, +20], where units are in dBm.
         """
 
-        super().__init__(bus, self.path)
+        self.max_length: typing.Optional[int] = None
+        """
+        When set, `fit()` is applied with this payload size before the
+        advertisement is registered by `BLEManager`, so that fields which
+        would overflow are dropped locally instead of by BlueZ.
+        """
+
+        attach(self, bus, self.path, super().__init__)
+
+    def encode(self, **kwargs) -> EncodedAdvertisement:
+        """
+        Computes the advertising payload locally, see
+        `bluejay.ad_payload.encode_advertisement()` for the arguments.
+        """
+        return encode_advertisement(self, **kwargs)
+
+    def fit(
+        self, max_length: int = LEGACY_PAYLOAD_LENGTH, **kwargs
+    ) -> EncodedAdvertisement:
+        """
+        Drops the fields that do not fit in the advertising data and shortens
+        the local name if needed. Fields are kept by priority, see
+        `bluejay.ad_payload.DEFAULT_PRIORITIES`.
+
+        `get_properties()` has no scan response properties, so BlueZ puts
+        every field in the advertising data: `scan_response` defaults to
+        `False`. Passing `True` keeps the fields that would only fit in a
+        scan response, which BlueZ then rejects.
+
+        #### Returns:
+            `EncodedAdvertisement`: The payload after fitting.
+        """
+        kwargs.setdefault("scan_response", False)
+        encoded = encode_advertisement(self, max_length, **kwargs)
+
+        includes = self.includes or []
+        for field in encoded.omitted:
+            if field == "local_name":
+                self.local_name = None
+                includes = [item for item in includes if item != "local-name"]
+            elif field == "tx_power":
+                includes = [item for item in includes if item != "tx-power"]
+            elif field == "appearance":
+                self.appearance = None
+                includes = [item for item in includes if item != "appearance"]
+            elif field != "flags":
+                setattr(self, field, None)
+        if self.includes is not None:
+            self.includes = includes
+        if self.local_name and encoded.local_name:
+            self.local_name = encoded.local_name
+
+        return encoded
 
     def get_properties(self):
         properties = {"Type": dbus.String(self.ad_type)}
@@ -229,6 +287,16 @@ class Advertisement(dbus.service.Object):
     def get_path(self):
         return dbus.ObjectPath(self.path)
 
+    def close(self):
+        """Removes the advertisement from the bus"""
+        detach(self, self.bus)
+
+    def __enter__(self) -> "Advertisement":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def add_service_uuid(self, uuid: str):
         if not self.service_uuids:
             self.service_uuids = []
@@ -1,6 +1,7 @@
 import dbus
 import dbus.service
 
+from ..backends.base import attach, detach
 from ..constants import (
     AGENT_INTERFACE,
     BLUEZ_SERVICE_NAME,
@@ -21,11 +22,21 @@ class Agent(dbus.service.Object):
         self.bus = bus
         self.path = f"{path}/agent"
         self.capability = capability
-        super().__init__(bus, path)
+        attach(self, bus, path, super().__init__)
 
     def get_path(self):
         return dbus.ObjectPath(self.path)
 
+    def close(self):
+        """Removes the agent from the bus"""
+        detach(self, self.bus)
+
+    def __enter__(self) -> "Agent":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     @dbus.service.method(AGENT_INTERFACE, in_signature="", out_signature="")
     def Release(self):
         pass
@@ -1,8 +1,13 @@
+import functools
 import typing
 
 import dbus
 import dbus.service
 
+from ..admission import AdmissionController, RateLimit
+from ..backends.base import attach, detach
+from ..cache import Scheduler, ValueCache, ValueProvider
+from ..codecs import Codec, as_codec
 from ..constants import (
     ADVERTISEMENT_INTERFACE,
     DBUS_OM_IFACE,
@@ -11,8 +16,60 @@ from ..constants import (
     GATT_DESCRIPTOR_INTERFACE,
     GATT_SERVICE_INTERFACE,
 )
-from ..enums import CharacteristicFlag, DescriptorFlag
-from ..exceptions import InvalidArgsException, NotSupportedException
+from ..database_hash import database_hash
+from ..enums import CharacteristicFlag, DescriptorFlag, NotificationPriority
+from ..exceptions import (
+    InvalidArgsException,
+    NotPermittedException,
+    NotSupportedException,
+)
+from ..glib import GLib
+from ..ingest import BatchHandler, WriteBatcher
+from ..notifications import (
+    NotificationFilter,
+    NotificationProducer,
+    ValueComparator,
+    ValueDecoder,
+    ValueProducer,
+)
+from ..recorder import Recorder
+from ..scheduler import NotificationScheduler
+from ..utils import device_address
+from ..uuids import BluetoothUUID
+
+GattObject = typing.Union["Service", "Characteristic", "Descriptor"]
+
+
+def _codec(obj: typing.Union["Characteristic", "Descriptor"]) -> Codec:
+    if obj.codec is None:
+        raise ValueError(f"{obj.path} has no codec, see `set_codec()`")
+    return obj.codec
+
+
+def _intercepted(function):
+    """
+    Wraps a D-Bus method so that `self._intercept(name, args)` runs first.
+    Only the wrapper of the most derived override intercepts, so that
+    overrides calling `super()` are intercepted once. The D-Bus metadata of
+    `function` is kept.
+    """
+    name = function.__name__
+
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        if getattr(type(self), name) is wrapper:
+            self._intercept(name, args)
+        return function(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _intercept_overrides(cls, names: typing.Iterable[str]):
+    # Called from `__init_subclass__`, wraps the methods the subclass defines
+    for name in names:
+        function = cls.__dict__.get(name)
+        if function is not None:
+            setattr(cls, name, _intercepted(function))
 
 
 class Application(dbus.service.Object):
@@ -20,13 +77,213 @@ class Application(dbus.service.Object):
         self.path = path
         self.bus = bus
         self.services: typing.List[Service] = []
-        super().__init__(bus, path)
+        self._path_index: typing.Dict[str, GattObject] = {}
+        self._uuid_index: typing.Dict[str, typing.List[GattObject]] = {}
+        self._database_hash: typing.Optional[bytes] = None
+        self._tree_listeners: typing.List[typing.Callable[[], typing.Any]] = []
+        self._tree_source: typing.Optional[int] = None
+
+        self.scheduler: typing.Optional[NotificationScheduler] = None
+        """
+        When set, `Characteristic.notify_value` queues values in this
+        scheduler instead of emitting them immediately
+        """
+
+        self.recorder: typing.Optional[Recorder] = None
+        """When set, every `WriteValue` and notified `Value` is recorded"""
+
+        self.admission: typing.Optional[AdmissionController] = None
+        """
+        When set, `ReadValue` and `WriteValue` calls exceeding the rate
+        limits of the calling device are rejected before reaching the
+        handlers
+        """
+
+        self.first_handle = 1
+        """Handle assumed for the first service when computing `database_hash`"""
+
+        self.on_subscription_change: typing.Optional[
+            typing.Callable[["Characteristic", typing.Optional[str], bool], None]
+        ] = None
+        """
+        Callback invoked when a characteristic gains or loses a subscriber
+
+        Args:
+            Characteristic: The characteristic
+            string: The device object path, or None when BlueZ does not tell
+            bool: Whether the device subscribed or unsubscribed
+        """
+
+        self.on_undelivered_value: typing.Optional[
+            typing.Callable[["Characteristic", typing.Any], None]
+        ] = None
+        """
+        Callback invoked when `Characteristic.notify_value` drops a value
+        because nobody is subscribed
+
+        Args:
+            Characteristic: The characteristic
+            Any: The value
+        """
+
+        attach(self, bus, path, super().__init__)
 
     def get_path(self):
         return dbus.ObjectPath(self.path)
 
+    def close(self):
+        """
+        Removes the application and its whole tree of services,
+        characteristics and descriptors from the bus.
+
+        Unregister it from BlueZ first, e.g. with `BLEManager.set_application`
+        and `close_previous`.
+        """
+        GLib.source_remove(self._tree_source)
+        self._tree_source = None
+        for service in self.services:
+            service.close()
+        detach(self, self.bus)
+
+    def __enter__(self) -> "Application":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def add_service(self, service: "Service"):
+        from .generic_attribute import GenericAttributeService
+
         self.services.append(service)
+        service.application = self
+        if isinstance(service, GenericAttributeService):
+            self._tree_listeners.append(service.notify_changed)
+        self._index(service)
+        for char in service.characteristics:
+            self._index(char)
+            for desc in char.descriptors:
+                self._index(desc)
+
+    def _index(self, obj: GattObject):
+        self._path_index[obj.path] = obj
+        self._uuid_index.setdefault(obj.uuid, []).append(obj)
+        self._tree_changed()
+
+    def _unindex(self, obj: GattObject):
+        self._path_index.pop(obj.path, None)
+        objects = self._uuid_index.get(obj.uuid, [])
+        if obj in objects:
+            objects.remove(obj)
+        self._tree_changed()
+
+    def _tree_changed(self):
+        # Objects are indexed one by one: notify the listeners once, from the
+        # loop, for the whole change
+        self._database_hash = None
+        if self._tree_listeners and self._tree_source is None:
+            self._tree_source = GLib.idle_add(self._notify_tree_changed)
+
+    def _notify_tree_changed(self) -> bool:
+        self._tree_source = None
+        for listener in self._tree_listeners:
+            listener()
+        return False
+
+    @property
+    def database_hash(self) -> bytes:
+        """
+        The GATT Database Hash of the application, recomputed only after the
+        tree of services, characteristics and descriptors has changed
+        """
+        if self._database_hash is None:
+            self._database_hash = database_hash(self.services, self.first_handle)
+        return self._database_hash
+
+    def get_object(self, path: str) -> typing.Optional[GattObject]:
+        """
+        Returns the service, characteristic or descriptor exported at `path`,
+        or `None`
+        """
+        return self._path_index.get(path)
+
+    def get_objects(self, uuid: typing.Union[str, int]) -> typing.List[GattObject]:
+        """
+        Returns every service, characteristic and descriptor with the given
+        UUID, in the order they were added. `uuid` can be in any form accepted
+        by `BluetoothUUID`.
+        """
+        return self._uuid_index.get(BluetoothUUID(uuid), [])
+
+    def get_service(self, uuid: typing.Union[str, int]) -> typing.Optional["Service"]:
+        for obj in self.get_objects(uuid):
+            if isinstance(obj, Service):
+                return obj
+        return None
+
+    def get_characteristic(
+        self,
+        uuid: typing.Union[str, int],
+    ) -> typing.Optional["Characteristic"]:
+        for obj in self.get_objects(uuid):
+            if isinstance(obj, Characteristic):
+                return obj
+        return None
+
+    def find(self, key: typing.Union[str, int]) -> typing.Optional[GattObject]:
+        """
+        Resolves `key` to a GATT object. Keys starting with `/` are object
+        paths, anything else is a UUID.
+        """
+        if isinstance(key, str) and key.startswith("/"):
+            return self.get_object(key)
+        objects = self.get_objects(key)
+        return objects[0] if objects else None
+
+    def notify(
+        self,
+        key: typing.Union[str, int],
+        value: typing.List[int],
+        device: typing.Optional[str] = None,
+    ) -> bool:
+        """
+        Notifies `value` on the characteristic identified by `key` (see
+        `find()`) if a central is subscribed to it. `device` is passed to
+        `Characteristic.notify_value()`.
+
+        #### Returns:
+            `bool`: `True` if the value was emitted.
+
+        #### Raises:
+            `KeyError`: If no characteristic matches `key`.
+        """
+        char = self.find(key)
+        if not isinstance(char, Characteristic):
+            raise KeyError(key)
+        return char.notify_value(value, device)
+
+    def write(
+        self,
+        key: typing.Union[str, int],
+        value: typing.List[int],
+        options: typing.Optional[typing.Dict[str, typing.Any]] = None,
+    ):
+        """
+        Writes `value` to the characteristic or descriptor identified by
+        `key`, an object path or a UUID, through its `WriteValue` handler,
+        as if a central wrote it.
+
+        #### Raises:
+            `KeyError`: If no characteristic or descriptor matches `key`.
+        """
+        if isinstance(key, str) and key.startswith("/"):
+            candidates = [self.get_object(key)]
+        else:
+            candidates = self.get_objects(key)
+        writable = (Characteristic, Descriptor)
+        obj = next((obj for obj in candidates if isinstance(obj, writable)), None)
+        if obj is None:
+            raise KeyError(key)
+        obj.WriteValue(value, {} if options is None else options)
 
     @dbus.service.method(DBUS_OM_IFACE, out_signature="a{oa{sa{sv}}}")
     def GetManagedObjects(self):  # pylint: disable=invalid-name
@@ -54,10 +311,11 @@ class Service(dbus.service.Object):
     ):  # pylint: disable=too-many-arguments
         self.path = f"{path_base}/service{index}"
         self.bus = bus
-        self.uuid = uuid
+        self.uuid = BluetoothUUID(uuid)
         self.primary = primary
         self.characteristics: typing.List[Characteristic] = []
-        super().__init__(bus, self.path)
+        self.application: typing.Optional[Application] = None
+        attach(self, bus, self.path, super().__init__)
 
     def get_properties(self):
         return {
@@ -73,8 +331,24 @@ class Service(dbus.service.Object):
     def get_path(self):
         return dbus.ObjectPath(self.path)
 
+    def close(self):
+        """Removes the service and its characteristics from the bus"""
+        for characteristic in self.characteristics:
+            characteristic.close()
+        detach(self, self.bus)
+
+    def __enter__(self) -> "Service":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def add_characteristic(self, characteristic: "Characteristic"):
         self.characteristics.append(characteristic)
+        if self.application is not None:
+            self.application._index(characteristic)
+            for desc in characteristic.descriptors:
+                self.application._index(desc)
 
     def get_characteristic_paths(self):
         return [char.get_path() for char in self.characteristics]
@@ -96,6 +370,10 @@ class Service(dbus.service.Object):
 class Characteristic(dbus.service.Object):
     """Base Characteritic class"""
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _intercept_overrides(cls, ("ReadValue", "WriteValue"))
+
     def __init__(
         self,
         bus: dbus.SystemBus,
@@ -106,11 +384,38 @@ class Characteristic(dbus.service.Object):
     ):  # pylint: disable=too-many-arguments
         self.path = f"{service.path}/char{index}"
         self.bus = bus
-        self.uuid = uuid
+        self.uuid = BluetoothUUID(uuid)
         self.service = service
         self.flags = flags
         self.descriptors: typing.List[Descriptor] = []
-        super().__init__(bus, self.path)
+        self.value_cache: typing.Optional[ValueCache] = None
+        """
+        The cache serving `ReadValue` in value-provider mode, see
+        `set_value_provider()`. Its `stats` hold the hit, miss and refresh
+        counters.
+        """
+        self.write_batcher: typing.Optional[WriteBatcher] = None
+        """The batcher used in ingestion mode, see `set_write_batcher()`"""
+        self.producers: typing.List[NotificationProducer] = []
+        self.priority = NotificationPriority.NORMAL
+        """Priority class of the notifications when using a scheduler"""
+        self.weight = 1.0
+        """Share of its priority class given to this characteristic"""
+        self.notification_filter: typing.Optional[NotificationFilter] = None
+        """
+        Suppresses `Value` changes identical to the last one emitted, see
+        `set_notification_filter()`. Its `stats` count the suppressed ones.
+        """
+        self.codec: typing.Optional[Codec] = None
+        """Converts the value to and from Python values, see `set_codec()`"""
+        self.rate_limit: typing.Optional[RateLimit] = None
+        """
+        Requests per second and burst allowed to each device on this
+        characteristic when the application has an `admission` controller,
+        instead of its default
+        """
+        self._subscribers: typing.Set[typing.Optional[str]] = set()
+        attach(self, bus, self.path, super().__init__)
 
     def get_properties(self):
         return {
@@ -125,8 +430,46 @@ class Characteristic(dbus.service.Object):
     def get_path(self):
         return dbus.ObjectPath(self.path)
 
+    def close(self):
+        """
+        Stops the producers, delivers the writes still batched and removes
+        the characteristic and its descriptors from the bus
+        """
+        for producer in self.producers:
+            producer.stop()
+        if self.write_batcher is not None:
+            self.write_batcher.flush()
+        self._subscribers.clear()
+        for descriptor in self.descriptors:
+            descriptor.close()
+        detach(self, self.bus)
+
+    def __enter__(self) -> "Characteristic":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
     def add_descriptor(self, descriptor: "Descriptor"):
         self.descriptors.append(descriptor)
+        if self.service.application is not None:
+            self.service.application._index(descriptor)
+
+    def remove_descriptor(self, descriptor: "Descriptor"):
+        """Removes `descriptor` from the characteristic and from the bus"""
+        self.descriptors.remove(descriptor)
+        if self.service.application is not None:
+            self.service.application._unindex(descriptor)
+        descriptor.close()
+
+    def next_descriptor_index(self) -> int:
+        """Index following the largest one used by the descriptors"""
+        indexes = [
+            int(desc.path.rsplit("/desc", 1)[1])
+            for desc in self.descriptors
+            if desc.path.rsplit("/desc", 1)[-1].isdigit()
+        ]
+        return max(indexes, default=-1) + 1
 
     def get_descriptor_paths(self):
         return [desc.get_path() for desc in self.descriptors]
@@ -134,6 +477,209 @@ class Characteristic(dbus.service.Object):
     def get_descriptors(self):
         return self.descriptors
 
+    def set_value_provider(
+        self,
+        provider: ValueProvider,
+        ttl: int,
+        schedule: typing.Optional[Scheduler] = None,
+    ):
+        """
+        Serves `ReadValue` from a cached value instead of computing it on
+        every read.
+
+        #### Args:
+            `provider`: Function returning the value as a list of bytes.
+            `ttl`: Time in milliseconds a value is served before it is
+                refreshed in the background.
+            `schedule`: See `ValueCache`.
+
+        Only the default `ReadValue` uses the cache. Subclasses overriding
+        `ReadValue` can call `self.value_cache.get()` themselves.
+        """
+        self.value_cache = ValueCache(provider, ttl, schedule)
+
+    def set_write_batcher(
+        self,
+        handler: BatchHandler,
+        batch_size: int = 64,
+        max_latency: int = 10,
+        as_numpy: bool = False,
+    ) -> WriteBatcher:
+        """
+        Switches the default `WriteValue` to ingestion mode: each write is
+        copied into a preallocated buffer and `handler` receives them in
+        batches (see `WriteBatcher`). Meant for `WRITE_WITHOUT_RESPONSE`
+        streams.
+        """
+        self.write_batcher = WriteBatcher(
+            handler, batch_size, max_latency, as_numpy=as_numpy
+        )
+        return self.write_batcher
+
+    def set_codec(
+        self,
+        codec: typing.Any,
+        presentation_format: bool = True,
+        **kwargs,
+    ) -> Codec:
+        """
+        Sets the codec of the value: a `Codec`, a `struct` format string or a
+        NumPy type (see `codecs.as_codec()`, which receives `kwargs`).
+
+        With `presentation_format`, a Characteristic Presentation Format
+        descriptor generated from the codec is added, replacing the one added
+        by a previous call.
+        """
+        from .presentation_format import PresentationFormatDescriptor
+
+        self.codec = as_codec(codec, **kwargs)
+        if presentation_format:
+            for descriptor in list(self.descriptors):
+                if isinstance(descriptor, PresentationFormatDescriptor):
+                    self.remove_descriptor(descriptor)
+            self.add_descriptor(
+                PresentationFormatDescriptor(
+                    self.bus, self.next_descriptor_index(), self
+                )
+            )
+        return self.codec
+
+    def encode_value(self, value: typing.Any) -> bytes:
+        """
+        Encodes a Python value with the codec, e.g. for `notify_value()`
+
+        #### Raises:
+            `ValueError`: If no codec is set.
+        """
+        return _codec(self).encode(value)
+
+    def decode_value(self, value) -> typing.Any:
+        """Decodes a value received by `WriteValue` with the codec"""
+        return _codec(self).decode(value)
+
+    def decode_batch(self, batch) -> typing.Any:
+        """Decodes every value of a `WriteBatch` at once with the codec"""
+        return _codec(self).decode_batch(batch)
+
+    @property
+    def is_notifying(self) -> bool:
+        """`True` while at least one central is subscribed"""
+        return bool(self._subscribers)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, device: typing.Optional[str] = None):
+        """
+        Records a subscription from `device` and starts the producers on the
+        first one.
+
+        BlueZ merges the subscriptions of every connected central into a
+        single `StartNotify` call without telling which device it comes from:
+        those are tracked under `device=None`. Per-device subscriptions can be
+        recorded with the device object path when it is known.
+        """
+        first = not self._subscribers
+        self._subscribers.add(device)
+        app = self.service.application
+        if app is not None and app.on_subscription_change:
+            app.on_subscription_change(self, device, True)
+        if self.notification_filter is not None:
+            # A new subscriber has not seen the last emitted value
+            self.notification_filter.reset()
+        if first:
+            for producer in self.producers:
+                producer.start()
+
+    def unsubscribe(self, device: typing.Optional[str] = None):
+        """
+        Removes the subscription of `device` and stops the producers once no
+        subscriber is left
+        """
+        if device not in self._subscribers:
+            return
+        self._subscribers.discard(device)
+        app = self.service.application
+        if app is not None and app.on_subscription_change:
+            app.on_subscription_change(self, device, False)
+        if not self._subscribers:
+            for producer in self.producers:
+                producer.stop()
+
+    def add_producer(self, interval: int, function: ValueProducer):
+        """
+        Calls `function` every `interval` milliseconds while the
+        characteristic has subscribers, and notifies the value it returns.
+
+        #### Returns:
+            `NotificationProducer`: The producer, which is paused and resumed
+                automatically.
+        """
+        producer = NotificationProducer(self, interval, function)
+        self.producers.append(producer)
+        if self.is_notifying:
+            producer.start()
+        return producer
+
+    def set_notification_filter(
+        self,
+        comparator: typing.Optional[ValueComparator] = None,
+        deadband: typing.Optional[float] = None,
+        decode: typing.Optional[ValueDecoder] = None,
+        heartbeat: typing.Optional[int] = None,
+    ) -> NotificationFilter:
+        """
+        Stops `emitPropertiesChanged` from emitting a `Value` that did not
+        change since the last one emitted. See `NotificationFilter` for the
+        arguments.
+        """
+        kwargs = {"decode": decode} if decode is not None else {}
+        self.notification_filter = NotificationFilter(
+            comparator, deadband, heartbeat=heartbeat, **kwargs
+        )
+        return self.notification_filter
+
+    def notify_value(
+        self,
+        value: typing.List[int],
+        device: typing.Optional[str] = None,
+    ) -> bool:
+        """
+        Emits a `Value` change only if a central is subscribed. If the
+        application has a `scheduler`, the value is queued there instead, in
+        the flow of `device`: the device object path the value is meant for,
+        by default the subscriber when there is only one.
+
+        #### Returns:
+            `bool`: `True` if the value was emitted or queued.
+        """
+        app = self.service.application
+        if not self._subscribers:
+            if app is not None and app.on_undelivered_value:
+                app.on_undelivered_value(self, value)
+            return False
+        if app is not None and app.scheduler is not None:
+            if device is None and len(self._subscribers) == 1:
+                device = next(iter(self._subscribers))
+            return app.scheduler.submit(self, value, device=device)
+        return self.emitPropertiesChanged({"Value": value})
+
+    def _intercept(self, method: str, args: typing.Tuple):
+        # Runs before `ReadValue` and `WriteValue`, including overrides
+        app = self.service.application
+        if app is None:
+            return
+        options = args[-1]
+        if app.admission is not None and not app.admission.admit(
+            options.get("device"), self.path, self.rate_limit
+        ):
+            raise NotPermittedException()
+        if method == "WriteValue" and app.recorder is not None:
+            app.recorder.record_write(
+                self.path, device_address(options.get("device", "")), args[0]
+            )
+
     @dbus.service.method(DBUS_PROPERTIES, in_signature="s", out_signature="a{sv}")
     def GetAll(
         self,
@@ -144,42 +690,83 @@ class Characteristic(dbus.service.Object):
 
         return self.get_properties()[GATT_CHARACTERISTIC_INTERFACE]
 
+    @_intercepted
     @dbus.service.method(
         GATT_CHARACTERISTIC_INTERFACE, in_signature="a{sv}", out_signature="ay"
     )
     def ReadValue(
         self,
-        options,  # pylint: disable=unused-argument
+        options,
     ):  # pylint: disable=invalid-name
+        if self.value_cache is not None:
+            value = self.value_cache.get()
+            offset = int(options.get("offset", 0))
+            return value[offset:] if offset else value
+
         print(f"{self.path}: Default ReadValue called, returning error")
         raise NotSupportedException()
 
+    @_intercepted
     @dbus.service.method(GATT_CHARACTERISTIC_INTERFACE, in_signature="aya{sv}")
     def WriteValue(
         self,
-        value: typing.List[int],  # pylint: disable=unused-argument
+        value: typing.List[int],
         options: typing.Dict[str, typing.Any],  # pylint: disable=unused-argument
     ):  # pylint: disable=invalid-name
+        if self.write_batcher is not None:
+            self.write_batcher.append(value)
+            return
+
         print(f"{self.path}: Default WriteValue called, returning error")
         raise NotSupportedException()
 
     @dbus.service.method(GATT_CHARACTERISTIC_INTERFACE)
     def StartNotify(self):  # pylint: disable=invalid-name
-        print("Default StartNotify called, returning error")
-        raise NotSupportedException()
+        if (
+            CharacteristicFlag.NOTIFY not in self.flags
+            and CharacteristicFlag.INDICATE not in self.flags
+        ):
+            print("Default StartNotify called, returning error")
+            raise NotSupportedException()
+        self.subscribe()
 
     @dbus.service.method(GATT_CHARACTERISTIC_INTERFACE)
     def StopNotify(self):  # pylint: disable=invalid-name
-        print("Default StopNotify called, returning error")
-        raise NotSupportedException()
+        if (
+            CharacteristicFlag.NOTIFY not in self.flags
+            and CharacteristicFlag.INDICATE not in self.flags
+        ):
+            print("Default StopNotify called, returning error")
+            raise NotSupportedException()
+        self.unsubscribe()
 
     def emitPropertiesChanged(
         self,
         changed,
         interface=GATT_CHARACTERISTIC_INTERFACE,
         invalidated=[],
-    ):
+    ) -> bool:
+        if (
+            self.notification_filter is not None
+            and interface == GATT_CHARACTERISTIC_INTERFACE
+            and "Value" in changed
+            and not self.notification_filter.should_emit(changed["Value"])
+        ):
+            changed = {key: value for key, value in changed.items() if key != "Value"}
+            if not changed and not invalidated:
+                return False
+
+        app = self.service.application
+        if (
+            app is not None
+            and app.recorder is not None
+            and interface == GATT_CHARACTERISTIC_INTERFACE
+            and "Value" in changed
+        ):
+            app.recorder.record_notify(self.path, changed["Value"])
+
         self.PropertiesChanged(interface, changed, invalidated)
+        return True
 
     @dbus.service.signal(DBUS_PROPERTIES, signature="sa{sv}as")
     def PropertiesChanged(
@@ -194,6 +781,10 @@ class Characteristic(dbus.service.Object):
 class Descriptor(dbus.service.Object):
     """Base Descriptor class"""
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _intercept_overrides(cls, ("ReadValue", "WriteValue"))
+
     def __init__(
         self,
         bus: dbus.SystemBus,
@@ -204,10 +795,11 @@ class Descriptor(dbus.service.Object):
     ):  # pylint: disable=too-many-arguments
         self.path = f"{characteristic.path}/desc{index}"
         self.bus = bus
-        self.uuid = uuid
+        self.uuid = BluetoothUUID(uuid)
         self.flags = flags
         self.characteristic = characteristic
-        super().__init__(bus, self.path)
+        self.codec: typing.Optional[Codec] = None
+        attach(self, bus, self.path, super().__init__)
 
     def get_properties(self):
         return {
@@ -221,12 +813,49 @@ class Descriptor(dbus.service.Object):
     def get_path(self):
         return dbus.ObjectPath(self.path)
 
+    def close(self):
+        """Removes the descriptor from the bus"""
+        detach(self, self.bus)
+
+    def __enter__(self) -> "Descriptor":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def set_codec(self, codec: typing.Any, **kwargs) -> Codec:
+        """See `Characteristic.set_codec()`"""
+        self.codec = as_codec(codec, **kwargs)
+        return self.codec
+
+    def encode_value(self, value: typing.Any) -> bytes:
+        return _codec(self).encode(value)
+
+    def decode_value(self, value) -> typing.Any:
+        return _codec(self).decode(value)
+
+    def _intercept(self, method: str, args: typing.Tuple):
+        # Runs before `ReadValue` and `WriteValue`, including overrides
+        app = self.characteristic.service.application
+        if app is None:
+            return
+        options = args[-1]
+        if app.admission is not None and not app.admission.admit(
+            options.get("device"), self.path
+        ):
+            raise NotPermittedException()
+        if method == "WriteValue" and app.recorder is not None:
+            app.recorder.record_write(
+                self.path, device_address(options.get("device", "")), args[0]
+            )
+
     @dbus.service.method(DBUS_PROPERTIES, in_signature="s", out_signature="a{sv}")
     def GetAll(self, interface):  # pylint: disable=invalid-name
         if interface != GATT_DESCRIPTOR_INTERFACE:
             raise InvalidArgsException()
         return self.get_properties()[GATT_DESCRIPTOR_INTERFACE]
 
+    @_intercepted
     @dbus.service.method(
         GATT_DESCRIPTOR_INTERFACE, in_signature="a{sv}", out_signature="ay"
     )
@@ -237,6 +866,7 @@ class Descriptor(dbus.service.Object):
         print(f"{self.path}: Default ReadValue called, returning error")
         raise NotSupportedException()
 
+    @_intercepted
     @dbus.service.method(GATT_DESCRIPTOR_INTERFACE, in_signature="aya{sv}")
     def WriteValue(
         self,
@@ -0,0 +1,78 @@
+import typing
+
+import dbus
+
+from ..enums import CharacteristicFlag
+from .gatt import Application, Characteristic, Service
+
+GENERIC_ATTRIBUTE_SVC_UUID = "00001801-0000-1000-8000-00805f9b34fb"
+SERVICE_CHANGED_CHR_UUID = "00002a05-0000-1000-8000-00805f9b34fb"
+DATABASE_HASH_CHR_UUID = "00002b2a-0000-1000-8000-00805f9b34fb"
+
+
+class GenericAttributeService(Service):
+    """
+    Generic Attribute service with the Service Changed and Database Hash
+    characteristics, letting bonded clients cache the GATT database.
+
+    Once added to an `Application`, Service Changed is indicated once from
+    the loop after services, characteristics or descriptors are added to it
+    or removed, and Database Hash serves `Application.database_hash`.
+
+    Note: BlueZ 5.50 and later expose their own Generic Attribute service
+    covering the whole local database. Only add this one when the stack does
+    not, or when the application database is served on its own.
+    """
+
+    def __init__(self, bus: dbus.SystemBus, path_base: str, index: int):
+        super().__init__(bus, path_base, index, GENERIC_ATTRIBUTE_SVC_UUID, True)
+        self.service_changed = ServiceChangedCharacteristic(bus, 0, self)
+        self.database_hash = DatabaseHashCharacteristic(bus, 1, self)
+        self.add_characteristic(self.service_changed)
+        self.add_characteristic(self.database_hash)
+
+    def notify_changed(self, start: int = 0x0001, end: int = 0xFFFF) -> bool:
+        """
+        Indicates that the attributes between handles `start` and `end` have
+        changed.
+
+        #### Returns:
+            `bool`: `True` if a client was subscribed and got indicated.
+        """
+        return self.service_changed.notify_value(
+            dbus.Array(
+                start.to_bytes(2, "little") + end.to_bytes(2, "little"),
+                signature="y",
+            )
+        )
+
+
+class ServiceChangedCharacteristic(Characteristic):
+    def __init__(self, bus: dbus.SystemBus, index: int, service: Service):
+        super().__init__(
+            bus,
+            index,
+            SERVICE_CHANGED_CHR_UUID,
+            [CharacteristicFlag.INDICATE],
+            service,
+        )
+
+
+class DatabaseHashCharacteristic(Characteristic):
+    def __init__(self, bus: dbus.SystemBus, index: int, service: Service):
+        super().__init__(
+            bus,
+            index,
+            DATABASE_HASH_CHR_UUID,
+            [CharacteristicFlag.READ],
+            service,
+        )
+
+    @property
+    def application(self) -> typing.Optional[Application]:
+        return self.service.application
+
+    def ReadValue(self, options):  # pylint: disable=invalid-name
+        if self.application is None:
+            return super().ReadValue(options)
+        return dbus.Array(self.application.database_hash, signature="y")
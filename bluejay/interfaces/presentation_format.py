@@ -0,0 +1,28 @@
+import dbus
+
+from ..enums import DescriptorFlag
+from .gatt import Characteristic, Descriptor
+
+PRESENTATION_FORMAT_DSC_UUID = "00002904-0000-1000-8000-00805f9b34fb"
+
+
+class PresentationFormatDescriptor(Descriptor):
+    """
+    Characteristic Presentation Format descriptor, generated from the codec
+    of its characteristic (see `Characteristic.set_codec()`)
+    """
+
+    def __init__(self, bus: dbus.SystemBus, index: int, characteristic: Characteristic):
+        super().__init__(
+            bus,
+            index,
+            PRESENTATION_FORMAT_DSC_UUID,
+            [DescriptorFlag.READ],
+            characteristic,
+        )
+
+    def ReadValue(self, options):  # pylint: disable=invalid-name
+        codec = self.characteristic.codec
+        if codec is None:
+            return super().ReadValue(options)
+        return dbus.Array(codec.presentation_format(), signature="y")
@@ -0,0 +1,328 @@
+"""
+Load generator acting as BlueZ towards a bluejay `Application`.
+
+It calls the exported objects the way `bluetoothd` does, from many simulated
+devices at once, and reports throughput, latency percentiles and error rates
+per characteristic. Meant to be run against an `Application` exported on a
+private or session bus:
+
+    python -m bluejay.loadgen --address unix:path=/tmp/bus --service :1.42 \\
+        --path /org/bluejay/app --devices 50 --duration 30
+"""
+
+import argparse
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import dbus
+import dbus.bus
+
+from .constants import (
+    BLUEZ_NAMESPACE,
+    DBUS_OM_IFACE,
+    GATT_CHARACTERISTIC_INTERFACE,
+)
+from .enums import CharacteristicFlag
+from .glib import GLib
+
+OPERATIONS = ("read", "write", "notify", "managed_objects")
+
+DEFAULT_MIX = {"read": 5, "write": 3, "notify": 1, "managed_objects": 1}
+
+
+class OperationStats:
+    """Counters and latencies of one operation on one object"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latencies: List[float] = []
+
+    def percentile(self, percent: float) -> float:
+        if not self.latencies:
+            return 0.0
+        latencies = sorted(self.latencies)
+        index = min(len(latencies) - 1, int(len(latencies) * percent / 100))
+        return latencies[index]
+
+    def summary(self, duration: float) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": self.errors / self.calls if self.calls else 0.0,
+            "throughput": self.calls / duration if duration else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": max(self.latencies, default=0.0),
+        }
+
+
+class LoadGenerator:
+    """
+    Drives a configurable mix of `ReadValue`, `WriteValue`, `StartNotify` /
+    `StopNotify` and `GetManagedObjects` calls against an exported
+    `Application` from `devices` simulated centrals, each keeping
+    `concurrency` calls in flight.
+    """
+
+    def __init__(
+        self,
+        bus: dbus.Bus,
+        service: str,
+        app_path: str,
+        devices: int = 10,
+        concurrency: int = 1,
+        duration: float = 10.0,
+        mix: Optional[Dict[str, int]] = None,
+        payload_size: int = 20,
+        seed: Optional[int] = None,
+    ):
+        """
+        #### Args:
+            `bus`: Connection to the bus the application is exported on.
+            `service`: Bus name of the process exporting the application.
+            `app_path`: Object path of the `Application`.
+            `devices`: Number of simulated centrals.
+            `concurrency`: Calls kept in flight by each central.
+            `duration`: Duration of the run, in seconds.
+            `mix`: Relative weights of the operations in `OPERATIONS`.
+            `payload_size`: Size of the written values, in bytes.
+            `seed`: Seed of the random operation picker.
+
+        #### Raises:
+            `ValueError`: If `devices` or `concurrency` is below 1, or if
+                `mix` has unknown operations.
+        """
+        if devices < 1 or concurrency < 1:
+            raise ValueError("At least one device and one call in flight needed")
+
+        self.bus = bus
+        self.service = service
+        self.app_path = app_path
+        self.devices = devices
+        self.concurrency = concurrency
+        self.duration = duration
+        self.payload = dbus.Array([dbus.Byte(0)] * payload_size, signature="y")
+        self._random = random.Random(seed)
+
+        mix = mix or DEFAULT_MIX
+        unknown = set(mix) - set(OPERATIONS)
+        if unknown:
+            raise ValueError(f"Unknown operations: {', '.join(sorted(unknown))}")
+        self._mix = mix
+
+        self.stats: Dict[Tuple[str, str], OperationStats] = {}
+        self._targets: Dict[str, List[str]] = {}
+        self._proxies: Dict[str, Any] = {}
+        self._notifying: Dict[str, bool] = {}
+        self._in_flight = 0
+        self._deadline = 0.0
+        self._started = 0.0
+        self._elapsed = 0.0
+        self._on_done: Optional[Callable[[Dict[str, Any]], None]] = None
+
+    def discover(self):
+        """Reads the characteristics of the application with one snapshot"""
+        objects = self._proxy(self.app_path).GetManagedObjects(
+            dbus_interface=DBUS_OM_IFACE
+        )
+        targets: Dict[str, List[str]] = {operation: [] for operation in OPERATIONS}
+        targets["managed_objects"].append(self.app_path)
+
+        for path, interfaces in objects.items():
+            char = interfaces.get(GATT_CHARACTERISTIC_INTERFACE)
+            if char is None:
+                continue
+            flags = set(str(flag) for flag in char.get("Flags", []))
+            if CharacteristicFlag.READ.value in flags:
+                targets["read"].append(str(path))
+            if flags & {
+                CharacteristicFlag.WRITE.value,
+                CharacteristicFlag.WRITE_WITHOUT_RESPONSE.value,
+            }:
+                targets["write"].append(str(path))
+            if flags & {
+                CharacteristicFlag.NOTIFY.value,
+                CharacteristicFlag.INDICATE.value,
+            }:
+                targets["notify"].append(str(path))
+
+        self._targets = targets
+        self._weights = [
+            (operation, weight)
+            for operation, weight in self._mix.items()
+            if weight > 0 and targets[operation]
+        ]
+        if not self._weights:
+            raise ValueError("The application exposes nothing to exercise")
+
+    def start(self, on_done: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Starts the run inside the running GLib loop. `on_done` receives the
+        report once the last call has completed.
+        """
+        if not self._targets:
+            self.discover()
+
+        self._on_done = on_done
+        self._started = time.monotonic()
+        self._deadline = self._started + self.duration
+        for index in range(self.devices):
+            device = dbus.ObjectPath(f"{BLUEZ_NAMESPACE}/hci0/dev_LOADGEN_{index:04X}")
+            for _ in range(self.concurrency):
+                self._next(device)
+
+    def run(self) -> Dict[str, Any]:
+        """Runs a blocking GLib loop until the run is over"""
+        mainloop = GLib.MainLoop()
+        report: Dict[str, Any] = {}
+
+        def done(result):
+            report.update(result)
+            mainloop.quit()
+
+        self.start(done)
+        mainloop.run()
+        return report
+
+    def report(self) -> Dict[str, Any]:
+        duration = self._elapsed or (time.monotonic() - self._started)
+        return {
+            "duration": duration,
+            "operations": {
+                f"{operation} {path}": stats.summary(duration)
+                for (operation, path), stats in sorted(self.stats.items())
+            },
+        }
+
+    def _proxy(self, path: str):
+        proxy = self._proxies.get(path)
+        if proxy is None:
+            proxy = self.bus.get_object(self.service, path, introspect=False)
+            self._proxies[path] = proxy
+        return proxy
+
+    def _pick(self) -> Tuple[str, str]:
+        total = sum(weight for _, weight in self._weights)
+        choice = self._random.uniform(0, total)
+        for operation, weight in self._weights:
+            choice -= weight
+            if choice <= 0:
+                break
+        return operation, self._random.choice(self._targets[operation])
+
+    def _next(self, device: dbus.ObjectPath):
+        if time.monotonic() >= self._deadline:
+            if self._in_flight == 0 and self._on_done is not None:
+                self._elapsed = time.monotonic() - self._started
+                on_done, self._on_done = self._on_done, None
+                on_done(self.report())
+            return
+
+        operation, path = self._pick()
+        stats = self.stats.get((operation, path))
+        if stats is None:
+            stats = self.stats[(operation, path)] = OperationStats()
+
+        started = time.monotonic()
+        self._in_flight += 1
+
+        def on_reply(*_):
+            stats.calls += 1
+            stats.latencies.append(time.monotonic() - started)
+            self._in_flight -= 1
+            self._next(device)
+
+        def on_error(_error):
+            stats.calls += 1
+            stats.errors += 1
+            stats.latencies.append(time.monotonic() - started)
+            self._in_flight -= 1
+            self._next(device)
+
+        handlers = {"reply_handler": on_reply, "error_handler": on_error}
+        proxy = self._proxy(path)
+        options = {"device": device}
+
+        if operation == "read":
+            proxy.ReadValue(
+                options, dbus_interface=GATT_CHARACTERISTIC_INTERFACE, **handlers
+            )
+        elif operation == "write":
+            proxy.WriteValue(
+                self.payload,
+                options,
+                dbus_interface=GATT_CHARACTERISTIC_INTERFACE,
+                **handlers,
+            )
+        elif operation == "notify":
+            # BlueZ calls StartNotify for the first subscribed device and
+            # StopNotify for the last one: toggle per characteristic
+            notifying = self._notifying.get(path, False)
+            self._notifying[path] = not notifying
+            method = proxy.StopNotify if notifying else proxy.StartNotify
+            method(dbus_interface=GATT_CHARACTERISTIC_INTERFACE, **handlers)
+        else:
+            proxy.GetManagedObjects(dbus_interface=DBUS_OM_IFACE, **handlers)
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [f"Duration: {report['duration']:.2f} s"]
+    for name, stats in report["operations"].items():
+        lines.append(
+            f"{name}: {stats['throughput']:.1f} calls/s, "
+            f"p50 {stats['p50'] * 1000:.2f} ms, p95 {stats['p95'] * 1000:.2f} ms, "
+            f"p99 {stats['p99'] * 1000:.2f} ms, errors {stats['error_rate']:.1%}"
+        )
+    return "\n".join(lines)
+
+
+def _parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for item in value.split(","):
+        operation, _, weight = item.partition("=")
+        mix[operation.strip()] = int(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--address", help="Bus address, defaults to the session bus")
+    parser.add_argument("--service", required=True, help="Bus name of the app")
+    parser.add_argument("--path", required=True, help="Object path of the app")
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--payload-size", type=int, default=20)
+    parser.add_argument(
+        "--mix",
+        type=_parse_mix,
+        default=DEFAULT_MIX,
+        help="Operation weights, e.g. read=5,write=3,notify=1,managed_objects=1",
+    )
+    args = parser.parse_args()
+
+    # Installs the dbus-python GLib integration before connecting
+    GLib.MainLoop()
+    if args.address:
+        bus = dbus.bus.BusConnection(args.address)
+    else:
+        bus = dbus.SessionBus()
+
+    generator = LoadGenerator(
+        bus,
+        args.service,
+        args.path,
+        devices=args.devices,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        mix=args.mix,
+        payload_size=args.payload_size,
+    )
+    print(format_report(generator.run()))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,10 @@ from ..interfaces.agent import Agent
 from ..types import DBUSErrorCallback, NoneCallback
 
 
+def _print_error(error):
+    print(f"Cannot register agent: {error}")
+
+
 class AgentManager:
     def __init__(self, bus: dbus.SystemBus):
         self._interface = dbus.Interface(
@@ -19,16 +23,31 @@ class AgentManager:
         agent: Agent,
         on_success: Optional[NoneCallback] = None,
         on_error: Optional[DBUSErrorCallback] = None,
+        default: bool = True,
     ):
+        """
+        Registers `agent`, then makes it the default agent unless `default`
+        is `False`. `on_success` is called once both are done.
+        """
+
+        on_error = on_error or _print_error
+
+        def on_registered():
+            if default:
+                self.request_default_agent(
+                    agent, on_success or (lambda: None), on_error
+                )
+            elif on_success:
+                on_success()
+
         self._interface.RegisterAgent(
             agent.get_path(),
             agent.capability,
-            reply_handler=on_success,
+            reply_handler=on_registered,
             error_handler=on_error,
         )
-        self._request_default_agent(agent, on_success, on_error)
 
-    def _request_default_agent(
+    def request_default_agent(
         self,
         agent: Agent,
         on_success: Optional[NoneCallback] = None,
@@ -1,44 +1,112 @@
 import threading
-from typing import Optional
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Set, Tuple
 
 import dbus
+import dbus.bus
 import dbus.service
 
 from ..constants import (
+    ADAPTER_INTERFACE,
     BLUEZ_SERVICE_NAME,
     DBUS_OM_IFACE,
     DBUS_PROPERTIES,
     DEVICE_INTERFACE,
+    GATT_MANAGER_INTERFACE,
 )
+from ..dispatch import LoopDispatcher
 from ..glib import GLib
 from ..interfaces.advertisement import Advertisement
 from ..interfaces.agent import Agent
-from ..interfaces.gatt import Application
+from ..interfaces.gatt import Application, Characteristic
+from ..subscriptions import SubscriptionStore
 from ..types import (
     AdvertsementChangeCallback,
     ApplicationChangedCallback,
     DeviceEventCallback,
 )
-from ..utils import dbus_to_python, disconnect_connected_devices, find_adapter
+from ..utils import (
+    dbus_to_python,
+    device_address,
+    disconnect_connected_devices,
+    find_adapter,
+    is_adapter,
+)
 from .advertising_manager import AdvertisingManager
 from .agent_manager import AgentManager
 from .application_manager import ApplicationManager
+from .discovery_manager import DiscoveryManager
+from .gatt_client import GattClient
+from .startup import StartupCoordinator, StartupPolicy, StartupReport
+
+
+def _print_errors(future: Future, action: str):
+    # For the property setters, which have no Future to return
+    def done(future: Future):
+        error = future.exception()
+        if error is not None:
+            print(f"Cannot {action}: {error}")
+
+    future.add_done_callback(done)
 
 
 class BLEManager:
-    def __init__(self, base_path: str, run_mainloop=True, debug=False):
+    def __init__(
+        self,
+        base_path: str,
+        run_mainloop=True,
+        debug=False,
+        bus: Optional[dbus.bus.BusConnection] = None,
+        adapter: Optional[str] = None,
+        policy: Optional[StartupPolicy] = None,
+    ):  # pylint: disable=too-many-arguments
+        """
+        #### Args:
+            `base_path`: Base D-Bus object path of the exported objects.
+            `run_mainloop`: Run the main loop in a daemon thread.
+            `debug`: Print the D-Bus signals received.
+            `bus`: Connection to use instead of the system bus, e.g. a
+                session or private bus. It is not closed by `close()`, and
+                must be dispatched by the default GLib context.
+            `adapter`: Adapter to use, by name (`hci1`) or object path.
+                Defaults to the first one supporting GATT.
+            `policy`: What to do to the adapter and the connected devices.
+                Defaults to powering the adapter, making it not pairable and
+                disconnecting every device connected to it.
+
+        Every manager runs on the global default GLib context, where
+        dbus-python dispatches the bus messages: callbacks, timers and calls
+        made with `run_in_loop` all run in that single loop thread.
+        """
+        self._created = time.monotonic()
         self.base_path = base_path
         self.GLib = GLib()
         self.mainloop = GLib.MainLoop()
+        self.dispatcher = LoopDispatcher()
+        """
+        Runs calls inside the main loop. The public setters below go through
+        it, so they can be used from any thread.
+        """
         if run_mainloop:
             threading.Thread(target=self.mainloop.run, daemon=True).start()
 
         self._debug = debug
-        self.bus = dbus.SystemBus()
-        adapter = find_adapter(self.bus)
-        disconnect_connected_devices(self.bus)
-        assert adapter
-        self._adapter = adapter
+        self.bus = dbus.SystemBus() if bus is None else bus
+        self.policy = StartupPolicy() if policy is None else policy
+        self._adapter_name = adapter
+        found = find_adapter(
+            self.bus, adapter, self.policy.power, self.policy.pairable
+        )
+        if found is None:
+            raise ValueError(
+                f"No GATT capable adapter {adapter!r}"
+                if adapter
+                else "No GATT capable adapter found"
+            )
+        if self.policy.disconnect_devices:
+            disconnect_connected_devices(self.bus, found)
+        self._adapter = found
 
         self.stop_advertising_on_connection = True
 
@@ -48,6 +116,9 @@ class BLEManager:
         self._ad_manager = AdvertisingManager(self.bus, self._adapter)
         self._app_manager = ApplicationManager(self.bus, self._adapter)
         self._agent_manager = AgentManager(self.bus)
+        # Central role helpers, created on first use
+        self._discovery: Optional[DiscoveryManager] = None
+        self._gatt_client: Optional[GattClient] = None
 
         self.on_advertising_change: Optional[AdvertsementChangeCallback] = None
         """
@@ -72,17 +143,43 @@ class BLEManager:
         self.on_connect: Optional[DeviceEventCallback] = None
         self.on_disconnect: Optional[DeviceEventCallback] = None
 
-        self.bus.add_signal_receiver(
-            self._properties_changed,
-            dbus_interface=DBUS_PROPERTIES,
-            signal_name="PropertiesChanged",
-            path_keyword="path",
-        )
-        self.bus.add_signal_receiver(
-            self._interfaces_added,
-            dbus_interface=DBUS_OM_IFACE,
-            signal_name="InterfacesAdded",
-        )
+        self.subscription_store: Optional[SubscriptionStore] = None
+        """
+        When set before `set_application`, notification subscriptions are
+        recorded per client address, restored when the client reconnects,
+        and the values notified while it was away are replayed.
+
+        BlueZ calls `StartNotify` and `StopNotify` without telling which
+        client they come from: they are only recorded while a single client
+        is connected, and ignored while several are.
+        """
+
+        self.subscription_grace = 2000
+        """
+        Time in milliseconds a `StopNotify` must precede a disconnection to
+        be considered a real unsubscription rather than part of the
+        disconnection
+        """
+        self._connected_paths: Set[str] = set()
+        self._pending_unsubscribes: Dict[Tuple[str, str], int] = {}
+
+        self._matches = [
+            # Only device changes are handled. Match rules cannot select the
+            # changed property: discovery RSSI updates still come through
+            self.bus.add_signal_receiver(
+                self._properties_changed,
+                dbus_interface=DBUS_PROPERTIES,
+                signal_name="PropertiesChanged",
+                bus_name=BLUEZ_SERVICE_NAME,
+                arg0=DEVICE_INTERFACE,
+                path_keyword="path",
+            ),
+            self.bus.add_signal_receiver(
+                self._interfaces_added,
+                dbus_interface=DBUS_OM_IFACE,
+                signal_name="InterfacesAdded",
+            ),
+        ]
 
         self._ad: Optional[Advertisement] = None
         self._advertising: bool = False
@@ -92,14 +189,254 @@ class BLEManager:
 
         self.connected = False
 
-    def set_advertisement(self, ad: Advertisement, start: bool = False):
+        self.startup_report: Optional[StartupReport] = None
+        """Timings of the last `start()`"""
+
+        # Desired state, replayed when BlueZ restarts
+        self._wanted_app: Optional[Application] = None
+        self._wanted_advertising = False
+
+        self.on_bluez_restart: Optional[Callable[[StartupReport], None]] = None
+        """
+        Callback invoked once every registration has been replayed after a
+        restart of BlueZ
+
+        Args:
+            StartupReport: Timings from the moment BlueZ went away. The
+                `bluez_down` phase lasts until it came back, the rest of the
+                report is the recovery.
+        """
+        self._bluez_owner: Optional[str] = None
+        self._bluez_lost_at: Optional[float] = None
+        self._bluez_back_at: Optional[float] = None
+        self._owner_watch = self.bus.watch_name_owner(
+            BLUEZ_SERVICE_NAME, self._bluez_owner_changed
+        )
+
+        self._initialized = time.monotonic()
+
+    def close(self):
+        """
+        Removes the signal receivers and timers of this manager, stops the
+        discovery and the main loop.
+
+        The registered objects are left as they are: unregister and close
+        them first to remove them from BlueZ and from the bus.
+        """
+        for match in self._matches:
+            match.remove()
+        self._matches = []
+        if self._owner_watch is not None:
+            self._owner_watch.cancel()
+            self._owner_watch = None
+        for source in self._pending_unsubscribes.values():
+            self.GLib.source_remove(source)
+        self._pending_unsubscribes.clear()
+
+        if self._discovery is not None:
+            self._discovery.stop()
+        if self._gatt_client is not None:
+            self._gatt_client.close()
+        self.mainloop.quit()
+
+    def __enter__(self) -> "BLEManager":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def discovery(self) -> DiscoveryManager:
+        """Scanner for nearby advertising devices (central role)"""
+        if self._discovery is None:
+            self._discovery = DiscoveryManager(self.bus, self._adapter, self.GLib)
+        return self._discovery
+
+    @property
+    def gatt_client(self) -> GattClient:
+        """Client of the GATT databases of remote devices (central role)"""
+        if self._gatt_client is None:
+            self._gatt_client = GattClient(self.bus)
+        return self._gatt_client
+
+    def run_in_loop(self, function, *args, **kwargs) -> Future:
+        """
+        Runs `function(*args, **kwargs)` inside the main loop, immediately
+        if called from the loop thread.
+
+        #### Returns:
+            `Future`: Resolved with the result of `function`.
+        """
+        return self.dispatcher.call(function, *args, **kwargs)
+
+    def start(
+        self,
+        app: Optional[Application] = None,
+        advertisement: Optional[Advertisement] = None,
+        agent: Optional[Agent] = None,
+    ) -> Future:
+        """
+        Registers `agent`, `app` and `advertisement`, and starts advertising.
+
+        The agent and the application are registered concurrently. The agent
+        is made the default one once registered, and advertising starts once
+        the application is live so that centrals connecting right away find
+        its services.
+
+        #### Returns:
+            `Future`: Resolved with the `StartupReport`, whose timings are
+                relative to the creation of this manager (`initialization`
+                phase), once everything is registered. Failed with a
+                `StartupError` if a registration failed.
+        """
+        future: Future = Future()
+
+        def run():
+            report = StartupReport()
+            initialization = self._initialized - self._created
+            report.phases["initialization"] = (0.0, initialization)
+            started = self._startup(app, advertisement, agent).run(
+                self._created, report
+            )
+            started.add_done_callback(lambda done: self._started(done, future))
+
+        def on_dispatched(dispatched: Future):
+            if dispatched.exception() is not None:
+                future.set_exception(dispatched.exception())
+
+        self.run_in_loop(run).add_done_callback(on_dispatched)
+        return future
+
+    def _started(self, done: Future, future: Future):
+        error = done.exception()
+        self.startup_report = error.report if error is not None else done.result()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(self.startup_report)
+
+    def _startup(
+        self,
+        app: Optional[Application],
+        advertisement: Optional[Advertisement],
+        agent: Optional[Agent],
+        power: bool = False,
+    ) -> StartupCoordinator:
+        coordinator = StartupCoordinator()
+
+        if power:
+            properties = dbus.Interface(
+                self.bus.get_object(BLUEZ_SERVICE_NAME, self._adapter),
+                DBUS_PROPERTIES,
+            )
+            coordinator.add(
+                "power",
+                lambda on_success, on_error: properties.Set(
+                    ADAPTER_INTERFACE,
+                    "Powered",
+                    dbus.Boolean(True),
+                    reply_handler=on_success,
+                    error_handler=on_error,
+                ),
+            )
+
+        if agent is not None:
+            self._agent = agent
+            coordinator.add(
+                "register_agent",
+                lambda on_success, on_error: self._agent_manager.register_agent(
+                    agent, on_success, on_error, default=False
+                ),
+            )
+            coordinator.add(
+                "default_agent",
+                lambda on_success, on_error: (
+                    self._agent_manager.request_default_agent(
+                        agent, on_success, on_error
+                    )
+                ),
+                after=["register_agent"],
+            )
+
+        if app is not None:
+
+            def register_application(on_success, on_error):
+                def registered():
+                    self.__application_registered(app)
+                    on_success()
+
+                def failed(error):
+                    self.__application_error(error)
+                    on_error(error)
+
+                self._app_manager.register_application(app, registered, failed)
+
+            self._wanted_app = app
+            coordinator.add("application", register_application)
+
+        if advertisement is not None:
+            self._ad = advertisement
+            self._wanted_advertising = True
+
+            def register_advertisement(on_success, on_error):
+                if advertisement.max_length is not None:
+                    advertisement.fit(advertisement.max_length, scan_response=False)
+
+                def registered():
+                    self.__advertising_registered()
+                    on_success()
+
+                def failed(error):
+                    self.__advertising_error(error)
+                    on_error(error)
+
+                self._ad_manager.register_advertisement(
+                    advertisement, registered, failed
+                )
+
+            after = ["application"] if app is not None else []
+            coordinator.add(
+                "advertisement",
+                register_advertisement,
+                after=after + ["power"] if power else after,
+            )
+
+        return coordinator
+
+    def set_advertisement(
+        self,
+        ad: Advertisement,
+        start: bool = False,
+        close_previous: bool = False,
+    ) -> Future:
+        """
+        Replaces the advertisement, unregistering the current one.
+
+        #### Args:
+            `start`: Start advertising `ad`.
+            `close_previous`: Close the replaced advertisement once
+                unregistered, removing it from the bus.
+        """
+        return self.run_in_loop(self._set_advertisement, ad, start, close_previous)
+
+    def _set_advertisement(
+        self,
+        ad: Advertisement,
+        start: bool,
+        close_previous: bool = False,
+    ):
         # If we are advertising, unregister the current advertisement
-        self.advertising = False
+        self._wanted_advertising = False
+        previous = self._ad
+        if previous is not None:
+            self._unregister_advertisement(
+                previous, close=close_previous and previous is not ad
+            )
 
         self._ad = ad
 
         if start:
-            self.advertising = True
+            self._set_advertising(True)
 
     @property
     def advertising(self):
@@ -107,12 +444,28 @@ class BLEManager:
 
     @advertising.setter
     def advertising(self, state: bool):
+        # Fire and forget: use `set_advertising()` to wait for the result
+        _print_errors(self.set_advertising(state), "set advertising")
+
+    def set_advertising(self, state: bool) -> Future:
+        # Fail early unless a queued `set_advertisement` may still set it
+        if state is True and self._ad is None and not self.dispatcher.pending:
+            raise ValueError(
+                "No advertisement set. Remember to call `set_advertisement` first"
+            )
+        return self.run_in_loop(self._set_advertising, state)
+
+    def _set_advertising(self, state: bool):
+        self._wanted_advertising = state
         if state is True:
             if self._ad is None:
                 raise ValueError(
                     "No advertisement set. Remember to call `set_advertisement` first"
                 )
 
+            if self._ad.max_length is not None:
+                self._ad.fit(self._ad.max_length, scan_response=False)
+
             self._ad_manager.register_advertisement(
                 self._ad,
                 on_success=self.__advertising_registered,
@@ -120,14 +473,36 @@ class BLEManager:
             )
 
         elif self._ad:
-            self._ad_manager.unregister_advertisement(
-                self._ad,
-                on_success=self.__advertising_unregistered,
-                on_error=self.__advertising_error,
-            )
+            self._unregister_advertisement(self._ad)
+
+    def _unregister_advertisement(self, ad: Advertisement, close: bool = False):
+        def unregistered():
+            self.__advertising_unregistered()
+            if close:
+                ad.close()
+
+        def failed(error):
+            self.__advertising_error(error)
+            if close:
+                ad.close()
+
+        self._ad_manager.unregister_advertisement(
+            ad, on_success=unregistered, on_error=failed
+        )
+
+    def set_application(self, app: Application, close_previous: bool = False) -> Future:
+        """
+        Replaces the application, unregistering the current one.
+
+        #### Args:
+            `close_previous`: Close the replaced application once
+                unregistered, removing its whole tree from the bus.
+        """
+        return self.run_in_loop(self._set_application, app, close_previous)
 
-    def set_application(self, app: Application):
-        self.remove_application()
+    def _set_application(self, app: Application, close_previous: bool = False):
+        self._remove_application(close=close_previous and self.app is not app)
+        self._wanted_app = app
 
         self._app_manager.register_application(
             app,
@@ -135,12 +510,30 @@ class BLEManager:
             on_error=lambda err: self.__application_error(err),
         )
 
-    def remove_application(self):
-        if self.app is not None:
+    def remove_application(self, close: bool = False) -> Future:
+        """
+        Unregisters the application, and closes it once unregistered when
+        `close` is set
+        """
+        return self.run_in_loop(self._remove_application, close)
+
+    def _remove_application(self, close: bool = False):
+        self._wanted_app = None
+        app = self.app
+        if app is not None:
+
+            def unregistered():
+                self.__application_unregistered()
+                if close:
+                    app.close()
+
+            def failed(error):
+                self.__application_error(error)
+                if close:
+                    app.close()
+
             self._app_manager.unregister_application(
-                self.app,
-                on_success=self.__application_unregistered,
-                on_error=lambda err: self.__application_error(err),
+                app, on_success=unregistered, on_error=failed
             )
 
     @property
@@ -149,6 +542,13 @@ class BLEManager:
 
     @agent.setter
     def agent(self, agent: Optional[Agent]):
+        # Fire and forget: use `set_agent()` to wait for the result
+        _print_errors(self.set_agent(agent), "set agent")
+
+    def set_agent(self, agent: Optional[Agent]) -> Future:
+        return self.run_in_loop(self._set_agent, agent)
+
+    def _set_agent(self, agent: Optional[Agent]):
         if agent is None:
             if self._agent:
                 self._agent_manager.unregister_agent(self._agent)
@@ -161,20 +561,95 @@ class BLEManager:
         if status == 1:
             self.connected = True
             if self.stop_advertising_on_connection:
-                self.advertising = False
+                self._set_advertising(False)
 
             self._set_device_proxy(device_path)
+            self._restore_subscriptions(str(device_path))
 
             if self.on_connect:
                 self.on_connect(device_path)
         else:
             self.connected = False
             if self.stop_advertising_on_connection:
-                self.advertising = True
+                self._set_advertising(True)
+
+            self._suspend_subscriptions(str(device_path))
 
             if self.on_disconnect:
                 self.on_disconnect("")
 
+    def _restore_subscriptions(self, path: str):
+        self._connected_paths.add(path)
+        address = device_address(path)
+        if self.subscription_store is None or self.app is None or address is None:
+            return
+
+        for uuid in self.subscription_store.get(address):
+            char = self.app.get_characteristic(uuid)
+            if char is None:
+                continue
+            char.subscribe(path)
+            for value in self.subscription_store.drain(address, uuid):
+                char.notify_value(value)
+
+    def _suspend_subscriptions(self, path: str):
+        # Keep the stored subscriptions: they are restored on reconnection
+        self._connected_paths.discard(path)
+        address = device_address(path)
+        if self.subscription_store is None or address is None:
+            return
+
+        for key in [key for key in self._pending_unsubscribes if key[0] == address]:
+            self.GLib.source_remove(self._pending_unsubscribes.pop(key))
+
+        if self.app is not None:
+            for uuid in self.subscription_store.get(address):
+                char = self.app.get_characteristic(uuid)
+                if char is not None:
+                    char.unsubscribe(path)
+
+    def _subscription_changed(
+        self,
+        char: Characteristic,
+        device: Optional[str],
+        subscribed: bool,
+    ):
+        if self.subscription_store is None:
+            return
+
+        # BlueZ does not tell which client called StartNotify/StopNotify:
+        # attribute it to the connected one, if there is only one
+        if device is None:
+            if len(self._connected_paths) != 1:
+                return
+            (device,) = self._connected_paths
+        address = device_address(device)
+        if address is None:
+            return
+
+        key = (address, char.uuid)
+        if subscribed:
+            source = self._pending_unsubscribes.pop(key, None)
+            if source is not None:
+                self.GLib.source_remove(source)
+            self.subscription_store.add(address, char.uuid)
+        elif key not in self._pending_unsubscribes:
+            self._pending_unsubscribes[key] = self.GLib.timeout_add(
+                self.subscription_grace, self._remove_subscription, key
+            )
+
+    def _remove_subscription(self, key: Tuple[str, str]) -> bool:
+        self._pending_unsubscribes.pop(key, None)
+        if self.subscription_store is not None:
+            self.subscription_store.remove(*key)
+        return False
+
+    def _undelivered_value(self, char: Characteristic, value: Any):
+        if self.subscription_store is None:
+            return
+        connected = {device_address(path) for path in self._connected_paths}
+        self.subscription_store.queue(char.uuid, value, connected)
+
     def _set_device_proxy(self, path):
         self.connected_device = dbus.Interface(
             self.bus.get_object(BLUEZ_SERVICE_NAME, path),
@@ -194,9 +669,8 @@ class BLEManager:
             print(f"Changed: {dbus_to_python(changed)}")
             print(f"Invalidated: {dbus_to_python(invalidated)}")
             print(f"Path: {path}")
-        if interface == DEVICE_INTERFACE:
-            if "Connected" in changed:
-                self._set_connected_status(changed["Connected"], path)
+        if "Connected" in changed and str(path).startswith(self._adapter + "/"):
+            self._set_connected_status(changed["Connected"], path)
 
     def _interfaces_added(
         self,
@@ -211,6 +685,95 @@ class BLEManager:
             properties = interfaces[DEVICE_INTERFACE]
             if "Connected" in properties:
                 self._set_connected_status(properties["Connected"], path)
+        if (
+            GATT_MANAGER_INTERFACE in interfaces
+            and self._bluez_back_at is not None
+            and is_adapter(path, self._adapter_name)
+        ):
+            self._replay(str(path))
+
+    def _bluez_owner_changed(self, owner: str):
+        previous = self._bluez_owner
+        self._bluez_owner = owner
+        if previous is None or owner == previous:
+            return
+
+        if not owner or previous:
+            self._bluez_lost()
+        if owner:
+            # Wait for an adapter, which may already be there
+            self._bluez_back_at = time.monotonic()
+            dbus.Interface(
+                self.bus.get_object(BLUEZ_SERVICE_NAME, "/", introspect=False),
+                DBUS_OM_IFACE,
+            ).GetManagedObjects(
+                reply_handler=self._bluez_objects,
+                error_handler=lambda error: None,
+            )
+
+    def _bluez_lost(self):
+        # Every registration is gone with the previous BlueZ instance
+        if self._bluez_lost_at is None:
+            self._bluez_lost_at = time.monotonic()
+        self._advertising = False
+        if self.connected:
+            # Without calling BlueZ, which is gone
+            self.connected = False
+            if self.stop_advertising_on_connection and self._ad is not None:
+                self._wanted_advertising = True
+            for path in list(self._connected_paths):
+                self._suspend_subscriptions(path)
+            if self.on_disconnect:
+                self.on_disconnect("")
+        if self.app is not None:
+            for service in self.app.services:
+                for char in service.characteristics:
+                    for device in list(char._subscribers):
+                        char.unsubscribe(device)
+
+    def _bluez_objects(self, objects):
+        for path, interfaces in objects.items():
+            if (
+                GATT_MANAGER_INTERFACE in interfaces
+                and self._bluez_back_at is not None
+                and is_adapter(path, self._adapter_name)
+            ):
+                self._replay(str(path))
+                return
+
+    def _replay(self, adapter: str):
+        """Registers the desired state again on the new BlueZ instance"""
+        lost_at = self._bluez_lost_at or self._bluez_back_at
+        back_at = self._bluez_back_at
+        self._bluez_lost_at = self._bluez_back_at = None
+
+        # Proxies are bound to the previous owner of the name
+        if self._discovery is not None:
+            self._discovery.close()
+            self._discovery = None
+        if self._gatt_client is not None:
+            self._gatt_client.close()
+            self._gatt_client = None
+        self._adapter = adapter
+        self._ad_manager = AdvertisingManager(self.bus, adapter)
+        self._app_manager = ApplicationManager(self.bus, adapter)
+        self._agent_manager = AgentManager(self.bus)
+
+        report = StartupReport()
+        report.phases["bluez_down"] = (0.0, back_at - lost_at)
+        advertisement = self._ad if self._wanted_advertising else None
+        coordinator = self._startup(
+            self._wanted_app, advertisement, self._agent, power=self.policy.power
+        )
+        coordinator.run(lost_at, report).add_done_callback(self._replayed)
+
+    def _replayed(self, done: Future):
+        error = done.exception()
+        report = error.report if error is not None else done.result()
+        if error is not None:
+            print(f"Cannot restore the BlueZ registrations: {error}")
+        if self.on_bluez_restart:
+            self.on_bluez_restart(report)
 
     def __advertising_registered(self):
         self._advertising = True
@@ -228,6 +791,9 @@ class BLEManager:
 
     def __application_registered(self, app: Application):
         self.app = app
+        if self.subscription_store is not None:
+            app.on_subscription_change = self._subscription_changed
+            app.on_undelivered_value = self._undelivered_value
         if self.on_application_change:
             self.on_application_change("registered", None)
 
@@ -0,0 +1,352 @@
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import dbus
+
+from ..constants import (
+    ADAPTER_INTERFACE,
+    BLUEZ_SERVICE_NAME,
+    DBUS_OM_IFACE,
+    DBUS_PROPERTIES,
+    DEVICE_INTERFACE,
+)
+from ..glib import GLib
+from ..types import DBUSErrorCallback, NoneCallback
+from ..uuids import BluetoothUUID
+
+
+class AdvertisementReport:
+    """
+    What was heard from a device during one aggregation window.
+
+    `name`, `uuids`, `manufacturer_data`, `service_data` and `tx_power` hold
+    the last known values. The RSSI fields and `count`, the number of updates
+    received from BlueZ, cover the window only: they are reset once the
+    report is delivered.
+    """
+
+    __slots__ = (
+        "path",
+        "address",
+        "name",
+        "uuids",
+        "manufacturer_data",
+        "service_data",
+        "tx_power",
+        "rssi",
+        "rssi_min",
+        "rssi_max",
+        "_rssi_total",
+        "_rssi_count",
+        "count",
+        "first_seen",
+        "last_seen",
+    )
+
+    def __init__(self, path: str, now: float):
+        self.path = path
+        self.address: Optional[str] = None
+        self.name: Optional[str] = None
+        self.uuids: List[BluetoothUUID] = []
+        self.manufacturer_data: Dict[int, bytes] = {}
+        self.service_data: Dict[str, bytes] = {}
+        self.tx_power: Optional[int] = None
+        self.rssi: Optional[int] = None
+        self.first_seen = now
+        self.last_seen = now
+        self._reset_window()
+
+    def _reset_window(self):
+        self.rssi_min: Optional[int] = None
+        self.rssi_max: Optional[int] = None
+        self._rssi_total = 0
+        self._rssi_count = 0
+        self.count = 0
+
+    @property
+    def rssi_mean(self) -> Optional[float]:
+        if not self._rssi_count:
+            return self.rssi
+        return self._rssi_total / self._rssi_count
+
+    def _update(self, properties, now: float):
+        self.last_seen = now
+        self.count += 1
+
+        if "RSSI" in properties:
+            rssi = int(properties["RSSI"])
+            self.rssi = rssi
+            self._rssi_total += rssi
+            self._rssi_count += 1
+            if self.rssi_min is None or rssi < self.rssi_min:
+                self.rssi_min = rssi
+            if self.rssi_max is None or rssi > self.rssi_max:
+                self.rssi_max = rssi
+        if "ManufacturerData" in properties:
+            self.manufacturer_data = {
+                int(key): bytes(value)
+                for key, value in properties["ManufacturerData"].items()
+            }
+        if "ServiceData" in properties:
+            self.service_data = {
+                str(key): bytes(value)
+                for key, value in properties["ServiceData"].items()
+            }
+        if "UUIDs" in properties:
+            self.uuids = [BluetoothUUID(str(uuid)) for uuid in properties["UUIDs"]]
+        if "Address" in properties:
+            self.address = str(properties["Address"])
+        if "Alias" in properties and self.name is None:
+            self.name = str(properties["Alias"])
+        if "Name" in properties:
+            self.name = str(properties["Name"])
+        if "TxPower" in properties:
+            self.tx_power = int(properties["TxPower"])
+
+    def __repr__(self) -> str:
+        return (
+            f"AdvertisementReport(address={self.address!r}, name={self.name!r}, "
+            f"rssi={self.rssi}, count={self.count})"
+        )
+
+
+ReportCallback = Callable[[List[AdvertisementReport]], None]
+
+
+class DiscoveryManager:
+    """
+    Scans for advertising devices and reports them in aggregated batches.
+
+    BlueZ signals every advertisement received as a `PropertiesChanged` of
+    the device (`RSSI`, `ManufacturerData`...). These updates are folded
+    into one `AdvertisementReport` per device, and every `window`
+    milliseconds the devices heard since the previous window are reported
+    at once: each device is reported at most once per window whatever the
+    number of advertisements it sent.
+
+    UUID and RSSI filters are also handed to BlueZ with
+    `SetDiscoveryFilter`, so that most unwanted devices are dropped before
+    reaching the bus. Devices not heard for `expiry` milliseconds are
+    forgotten.
+    """
+
+    def __init__(
+        self,
+        bus: dbus.SystemBus,
+        adapter: str,
+        glib: GLib = GLib,
+    ):
+        self._bus = bus
+        self._glib = glib
+        self._interface = dbus.Interface(
+            bus.get_object(BLUEZ_SERVICE_NAME, adapter, introspect=False),
+            ADAPTER_INTERFACE,
+        )
+        self._adapter = str(adapter)
+        self._prefix = self._adapter + "/"
+
+        self.window = 1000
+        self.expiry = 30000
+        self.on_report: Optional[ReportCallback] = None
+
+        self._uuids: Optional[Set[BluetoothUUID]] = None
+        self._rssi: Optional[int] = None
+        self._manufacturer_ids: Optional[Set[int]] = None
+
+        self._devices: Dict[str, AdvertisementReport] = {}
+        self._dirty: Set[str] = set()
+        self._matches: List[Any] = []
+        self._timer: Optional[int] = None
+        self._last_expiry = 0.0
+
+        self.updates = 0
+        self.reports = 0
+
+    @property
+    def discovering(self) -> bool:
+        return self._timer is not None
+
+    @property
+    def devices(self) -> Dict[str, AdvertisementReport]:
+        """Devices currently known, by object path"""
+        return dict(self._devices)
+
+    def start(
+        self,
+        on_report: ReportCallback,
+        window: int = 1000,
+        uuids: Optional[Iterable[str]] = None,
+        rssi: Optional[int] = None,
+        manufacturer_ids: Optional[Iterable[int]] = None,
+        expiry: int = 30000,
+        on_success: Optional[NoneCallback] = None,
+        on_error: Optional[DBUSErrorCallback] = None,
+    ):
+        """
+        Starts the discovery.
+
+        #### Args:
+            `on_report`: Receives the list of reports of each window.
+            `window`: Aggregation window in milliseconds.
+            `uuids`: Only report devices advertising one of these services.
+            `rssi`: Only report devices heard at least this strong, in dBm.
+            `manufacturer_ids`: Only report devices with manufacturer data
+                from one of these company identifiers.
+            `expiry`: Time in milliseconds after which a silent device is
+                forgotten.
+        """
+        self.on_report = on_report
+        self.window = window
+        self.expiry = expiry
+        self._uuids = {BluetoothUUID(uuid) for uuid in uuids} if uuids else None
+        self._rssi = rssi
+        self._manufacturer_ids = set(manufacturer_ids) if manufacturer_ids else None
+
+        discovery_filter: Dict[str, Any] = {
+            "Transport": "le",
+            "DuplicateData": dbus.Boolean(True),
+        }
+        if self._uuids:
+            discovery_filter["UUIDs"] = dbus.Array(self._uuids, signature="s")
+        if rssi is not None:
+            discovery_filter["RSSI"] = dbus.Int16(rssi)
+
+        self._listen()
+        if self._timer is None:
+            self._timer = self._glib.timeout_add(self.window, self._flush)
+
+        def on_filter_set():
+            self._interface.StartDiscovery(
+                reply_handler=on_success or (lambda: None),
+                error_handler=on_error or self._discovery_error,
+            )
+
+        self._interface.SetDiscoveryFilter(
+            dbus.Dictionary(discovery_filter, signature="sv"),
+            reply_handler=on_filter_set,
+            error_handler=on_error or self._discovery_error,
+        )
+
+    def stop(
+        self,
+        on_success: Optional[NoneCallback] = None,
+        on_error: Optional[DBUSErrorCallback] = None,
+    ):
+        """Stops the discovery, reporting the pending window first"""
+        if self._timer is None:
+            return
+        self._flush()
+        self.close()
+
+        self._interface.StopDiscovery(
+            reply_handler=on_success or (lambda: None),
+            error_handler=on_error or self._discovery_error,
+        )
+
+    def close(self):
+        """
+        Removes the timer and the signal receivers, without telling BlueZ,
+        e.g. once it is gone
+        """
+        if self._timer is not None:
+            self._glib.source_remove(self._timer)
+            self._timer = None
+        for match in self._matches:
+            match.remove()
+        self._matches = []
+
+    def _listen(self):
+        if self._matches:
+            return
+        # The bus only sends the property changes of devices
+        self._matches = [
+            self._bus.add_signal_receiver(
+                self._properties_changed,
+                dbus_interface=DBUS_PROPERTIES,
+                signal_name="PropertiesChanged",
+                arg0=DEVICE_INTERFACE,
+                path_keyword="path",
+            ),
+            self._bus.add_signal_receiver(
+                self._interfaces_added,
+                dbus_interface=DBUS_OM_IFACE,
+                signal_name="InterfacesAdded",
+            ),
+            self._bus.add_signal_receiver(
+                self._interfaces_removed,
+                dbus_interface=DBUS_OM_IFACE,
+                signal_name="InterfacesRemoved",
+            ),
+        ]
+
+    def _update(self, path: str, properties):
+        now = time.monotonic()
+        report = self._devices.get(path)
+        if report is None:
+            report = AdvertisementReport(path, now)
+            self._devices[path] = report
+        report._update(properties, now)
+        self._dirty.add(path)
+        self.updates += 1
+
+    def _properties_changed(self, interface, changed, invalidated, path):
+        path = str(path)
+        if path.startswith(self._prefix):
+            self._update(path, changed)
+
+    def _interfaces_added(self, path, interfaces):
+        path = str(path)
+        if DEVICE_INTERFACE in interfaces and path.startswith(self._prefix):
+            self._update(path, interfaces[DEVICE_INTERFACE])
+
+    def _interfaces_removed(self, path, interfaces):
+        if DEVICE_INTERFACE in interfaces:
+            path = str(path)
+            self._devices.pop(path, None)
+            self._dirty.discard(path)
+
+    def _matches_filters(self, report: AdvertisementReport) -> bool:
+        if self._rssi is not None:
+            # Strongest of the window, or the last known one when the window
+            # had no RSSI update, e.g. only a manufacturer data change
+            rssi = report.rssi if report.rssi_max is None else report.rssi_max
+            if rssi is None or rssi < self._rssi:
+                return False
+        if self._uuids is not None and self._uuids.isdisjoint(report.uuids):
+            return False
+        if self._manufacturer_ids is not None and self._manufacturer_ids.isdisjoint(
+            report.manufacturer_data
+        ):
+            return False
+        return True
+
+    def _flush(self) -> bool:
+        if self._dirty:
+            devices = self._devices
+            heard = [devices[path] for path in self._dirty if path in devices]
+            self._dirty = set()
+
+            reports = [report for report in heard if self._matches_filters(report)]
+            if reports:
+                self.reports += len(reports)
+                if self.on_report:
+                    self.on_report(reports)
+            for report in heard:
+                report._reset_window()
+
+        now = time.monotonic()
+        if now - self._last_expiry >= self.expiry / 1000:
+            self._last_expiry = now
+            limit = now - self.expiry / 1000
+            expired = [
+                path
+                for path, report in self._devices.items()
+                if report.last_seen < limit
+            ]
+            for path in expired:
+                del self._devices[path]
+
+        return self._timer is not None
+
+    def _discovery_error(self, error):
+        print(f"Discovery error: {error}")
@@ -0,0 +1,358 @@
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import dbus
+
+from ..constants import (
+    BLUEZ_SERVICE_NAME,
+    DBUS_OM_IFACE,
+    DBUS_PROPERTIES,
+    DEVICE_INTERFACE,
+    GATT_CHARACTERISTIC_INTERFACE,
+    GATT_SERVICE_INTERFACE,
+)
+from ..uuids import BluetoothUUID
+
+ValueCallback = Callable[[bytes], None]
+
+
+class RemoteCharacteristic:
+    """A characteristic of a remote peripheral"""
+
+    __slots__ = ("path", "uuid", "service_uuid", "flags", "_proxy")
+
+    def __init__(self, path: str, uuid: str, service_uuid: str, flags: List[str]):
+        self.path = path
+        self.uuid = BluetoothUUID(uuid)
+        self.service_uuid = BluetoothUUID(service_uuid)
+        self.flags = flags
+        self._proxy: Optional[dbus.Interface] = None
+
+    def __repr__(self) -> str:
+        return f"RemoteCharacteristic({self.path!r}, {self.uuid!r})"
+
+
+class RemoteDevice:
+    """The GATT database of a remote peripheral"""
+
+    def __init__(self, address: str, path: str):
+        self.address = address
+        self.path = path
+        self.services: Dict[BluetoothUUID, str] = {}
+        """Service object paths by UUID"""
+        self.characteristics: Dict[str, RemoteCharacteristic] = {}
+        """Characteristics by object path"""
+        self._by_uuid: Dict[BluetoothUUID, List[RemoteCharacteristic]] = {}
+
+    def _add(self, characteristic: RemoteCharacteristic):
+        self.characteristics[characteristic.path] = characteristic
+        self._by_uuid.setdefault(characteristic.uuid, []).append(characteristic)
+
+    def get_characteristic(
+        self,
+        uuid: str,
+        service: Optional[str] = None,
+    ) -> Optional[RemoteCharacteristic]:
+        """
+        Returns the characteristic with `uuid`, in `service` when several
+        services have one
+        """
+        candidates = self._by_uuid.get(BluetoothUUID(uuid))
+        if not candidates:
+            return None
+        if service is None:
+            return candidates[0]
+        service = BluetoothUUID(service)
+        for characteristic in candidates:
+            if characteristic.service_uuid == service:
+                return characteristic
+        return None
+
+    def __repr__(self) -> str:
+        return f"RemoteDevice({self.address!r}, {len(self.characteristics)} chars)"
+
+
+class GattClient:
+    """
+    Reads, writes and subscribes to characteristics of remote peripherals
+    (central role).
+
+    The GATT databases of every connected device are discovered from a
+    single `GetManagedObjects` snapshot and cached by device address, so a
+    device reconnecting does not need a new discovery as long as its object
+    paths are unchanged. Calls are asynchronous and return a `Future`: any
+    number of them can be in flight, across any number of devices.
+
+    Notifications of every subscribed characteristic are received through a
+    single signal receiver, matched by the bus on the characteristic
+    interface.
+
+    Use it from the GLib loop, e.g. through `BLEManager.run_in_loop`.
+    """
+
+    def __init__(self, bus: dbus.SystemBus):
+        self._bus = bus
+        self._devices: Dict[str, RemoteDevice] = {}
+        self._subscriptions: Dict[str, List[ValueCallback]] = {}
+        self._match: Optional[Any] = None
+
+    @property
+    def devices(self) -> Dict[str, RemoteDevice]:
+        """Cached GATT databases, by device address"""
+        return dict(self._devices)
+
+    def discover(self, refresh: bool = False) -> Future:
+        """
+        Discovers the GATT databases of the connected devices.
+
+        #### Args:
+            `refresh`: Replace the databases already cached. By default only
+                unknown devices are added.
+
+        #### Returns:
+            `Future`: Resolved with the devices by address.
+        """
+        future: Future = Future()
+        object_manager = dbus.Interface(
+            self._bus.get_object(BLUEZ_SERVICE_NAME, "/", introspect=False),
+            DBUS_OM_IFACE,
+        )
+
+        def on_reply(objects):
+            self._build(objects, refresh)
+            future.set_result(self.devices)
+
+        object_manager.GetManagedObjects(
+            reply_handler=on_reply,
+            error_handler=future.set_exception,
+        )
+        return future
+
+    def _build(self, objects, refresh: bool):
+        devices: Dict[str, RemoteDevice] = {}
+        services: Dict[str, Tuple[RemoteDevice, BluetoothUUID]] = {}
+
+        for path, interfaces in objects.items():
+            properties = interfaces.get(DEVICE_INTERFACE)
+            if properties is not None and "Address" in properties:
+                address = str(properties["Address"])
+                if refresh or address not in self._devices:
+                    devices[str(path)] = RemoteDevice(address, str(path))
+
+        for path, interfaces in objects.items():
+            properties = interfaces.get(GATT_SERVICE_INTERFACE)
+            if properties is None:
+                continue
+            device = devices.get(str(properties["Device"]))
+            if device is not None:
+                uuid = BluetoothUUID(str(properties["UUID"]))
+                device.services[uuid] = str(path)
+                services[str(path)] = (device, uuid)
+
+        for path, interfaces in objects.items():
+            properties = interfaces.get(GATT_CHARACTERISTIC_INTERFACE)
+            if properties is None:
+                continue
+            service = services.get(str(properties["Service"]))
+            if service is not None:
+                device, service_uuid = service
+                device._add(
+                    RemoteCharacteristic(
+                        str(path),
+                        str(properties["UUID"]),
+                        service_uuid,
+                        [str(flag) for flag in properties.get("Flags", [])],
+                    )
+                )
+
+        for device in devices.values():
+            if device.characteristics:
+                self._devices[device.address] = device
+
+    def forget(self, address: str):
+        """Drops the cached database of `address`"""
+        device = self._devices.pop(address.upper(), None)
+        if device is not None:
+            for path in device.characteristics:
+                self._subscriptions.pop(path, None)
+
+    def get_characteristic(
+        self,
+        address: str,
+        uuid: str,
+        service: Optional[str] = None,
+    ) -> RemoteCharacteristic:
+        device = self._devices.get(address.upper())
+        characteristic = device and device.get_characteristic(uuid, service)
+        if not characteristic:
+            raise KeyError(f"No characteristic {uuid} known on {address}")
+        return characteristic
+
+    def _proxy(self, characteristic: RemoteCharacteristic) -> dbus.Interface:
+        if characteristic._proxy is None:
+            characteristic._proxy = dbus.Interface(
+                self._bus.get_object(
+                    BLUEZ_SERVICE_NAME, characteristic.path, introspect=False
+                ),
+                GATT_CHARACTERISTIC_INTERFACE,
+            )
+        return characteristic._proxy
+
+    def read(
+        self,
+        address: str,
+        uuid: str,
+        offset: int = 0,
+        service: Optional[str] = None,
+    ) -> Future:
+        """
+        Reads a characteristic.
+
+        #### Returns:
+            `Future`: Resolved with the value as `bytes`.
+        """
+        future: Future = Future()
+        options = {"offset": dbus.UInt16(offset)} if offset else {}
+        self._proxy(self.get_characteristic(address, uuid, service)).ReadValue(
+            dbus.Dictionary(options, signature="sv"),
+            byte_arrays=True,
+            reply_handler=lambda value: future.set_result(bytes(value)),
+            error_handler=future.set_exception,
+        )
+        return future
+
+    def read_many(self, requests: Iterable[Tuple[str, str]]) -> List[Future]:
+        """
+        Issues all the reads of `(address, uuid)` `requests` at once
+
+        #### Returns:
+            `list`: A `Future` per request, in order.
+        """
+        return [self.read(address, uuid) for address, uuid in requests]
+
+    def write(
+        self,
+        address: str,
+        uuid: str,
+        value,
+        response: bool = True,
+        service: Optional[str] = None,
+    ) -> Future:
+        """
+        Writes a characteristic, with a write request by default or a write
+        command when `response` is `False`
+
+        #### Returns:
+            `Future`: Resolved with `None` once written.
+        """
+        future: Future = Future()
+        options = {"type": "request" if response else "command"}
+        self._proxy(self.get_characteristic(address, uuid, service)).WriteValue(
+            dbus.ByteArray(bytes(value)),
+            dbus.Dictionary(options, signature="sv"),
+            reply_handler=lambda: future.set_result(None),
+            error_handler=future.set_exception,
+        )
+        return future
+
+    def subscribe(
+        self,
+        address: str,
+        uuid: str,
+        callback: ValueCallback,
+        service: Optional[str] = None,
+    ) -> Future:
+        """
+        Calls `callback` with every value notified or indicated by the
+        characteristic
+
+        #### Returns:
+            `Future`: Resolved with `None` once notifications are enabled.
+        """
+        characteristic = self.get_characteristic(address, uuid, service)
+        callbacks = self._subscriptions.setdefault(characteristic.path, [])
+        callbacks.append(callback)
+
+        if self._match is None:
+            self._match = self._bus.add_signal_receiver(
+                self._properties_changed,
+                dbus_interface=DBUS_PROPERTIES,
+                signal_name="PropertiesChanged",
+                bus_name=BLUEZ_SERVICE_NAME,
+                arg0=GATT_CHARACTERISTIC_INTERFACE,
+                path_keyword="path",
+                byte_arrays=True,
+            )
+
+        future: Future = Future()
+        if len(callbacks) > 1:
+            future.set_result(None)
+            return future
+
+        path = characteristic.path
+
+        def failed(error):
+            # Not subscribed: let a later `subscribe()` call StartNotify again
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks and self._subscriptions.get(path) is callbacks:
+                self._forget(path)
+            future.set_exception(error)
+
+        self._proxy(characteristic).StartNotify(
+            reply_handler=lambda: future.set_result(None),
+            error_handler=failed,
+        )
+        return future
+
+    def unsubscribe(
+        self,
+        address: str,
+        uuid: str,
+        callback: Optional[ValueCallback] = None,
+        service: Optional[str] = None,
+    ) -> Future:
+        """Removes `callback`, or every callback, of the characteristic"""
+        characteristic = self.get_characteristic(address, uuid, service)
+        callbacks = self._subscriptions.get(characteristic.path, [])
+        future: Future = Future()
+        if callback is None:
+            callbacks.clear()
+        elif callback in callbacks:
+            callbacks.remove(callback)
+        else:
+            # Not subscribed: leave the other callbacks alone
+            future.set_result(None)
+            return future
+
+        if callbacks:
+            future.set_result(None)
+            return future
+
+        self._forget(characteristic.path)
+        self._proxy(characteristic).StopNotify(
+            reply_handler=lambda: future.set_result(None),
+            error_handler=future.set_exception,
+        )
+        return future
+
+    def _forget(self, path: str):
+        self._subscriptions.pop(path, None)
+        if not self._subscriptions and self._match is not None:
+            self._match.remove()
+            self._match = None
+
+    def close(self):
+        """Drops the subscriptions, without stopping them, and the cache"""
+        if self._match is not None:
+            self._match.remove()
+            self._match = None
+        self._subscriptions.clear()
+        self._devices.clear()
+
+    def _properties_changed(self, interface, changed, invalidated, path):
+        callbacks = self._subscriptions.get(str(path))
+        if callbacks and "Value" in changed:
+            value = bytes(changed["Value"])
+            for callback in list(callbacks):
+                callback(value)
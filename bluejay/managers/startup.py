@@ -0,0 +1,191 @@
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+PhaseStarter = Callable[[Callable[..., None], Callable[[Any], None]], None]
+"""Starts a phase, calling the first argument on success, the second on error"""
+
+
+class StartupPolicy:
+    """What `BLEManager` does to the adapter and the devices when created"""
+
+    def __init__(
+        self,
+        power: bool = True,
+        pairable: Optional[bool] = False,
+        disconnect_devices: bool = True,
+    ):
+        """
+        #### Args:
+            `power`: Power the adapter on, also after a BlueZ restart.
+            `pairable`: Value to set `Pairable` to. `None` leaves it as is.
+            `disconnect_devices`: Disconnect the devices connected to the
+                adapter.
+        """
+        self.power = power
+        self.pairable = pairable
+        self.disconnect_devices = disconnect_devices
+
+    def __repr__(self) -> str:
+        return (
+            f"StartupPolicy(power={self.power}, pairable={self.pairable}, "
+            f"disconnect_devices={self.disconnect_devices})"
+        )
+
+
+class StartupReport:
+    """Timings of a startup, in seconds from its beginning"""
+
+    def __init__(self):
+        self.phases: Dict[str, Tuple[float, float]] = {}
+        """Start and end of each completed phase"""
+        self.total = 0.0
+        self.failed: Optional[str] = None
+        """Name of the phase that failed, if any"""
+
+    def duration(self, phase: str) -> float:
+        start, end = self.phases[phase]
+        return end - start
+
+    def format(self) -> str:
+        lines = [
+            f"{name:<16} {start * 1000:9.1f} ms -> {end * 1000:9.1f} ms"
+            f" ({(end - start) * 1000:.1f} ms)"
+            for name, (start, end) in sorted(
+                self.phases.items(), key=lambda item: item[1]
+            )
+        ]
+        if self.failed is not None:
+            lines.append(f"{self.failed:<16} failed")
+        lines.append(f"{'total':<16} {self.total * 1000:9.1f} ms")
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"StartupReport(total={self.total:.3f}, phases={self.phases})"
+
+
+class StartupError(Exception):
+    """A startup phase failed"""
+
+    def __init__(self, phase: str, error: Any, report: StartupReport):
+        super().__init__(f"Startup phase {phase!r} failed: {error}")
+        self.phase = phase
+        self.error = error
+        self.report = report
+
+
+class StartupCoordinator:
+    """
+    Runs asynchronous startup phases, such as D-Bus registrations, as
+    concurrently as their dependencies allow: every phase starts as soon as
+    the phases it comes `after` have completed.
+
+    Meant to run in the GLib loop, with phases issuing asynchronous calls.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._phases: Dict[str, Tuple[PhaseStarter, Tuple[str, ...]]] = {}
+
+    def add(self, name: str, start: PhaseStarter, after: Iterable[str] = ()):
+        """
+        Adds a phase
+
+        #### Args:
+            `name`: Name of the phase in the report.
+            `start`: Function issuing the phase, see `PhaseStarter`.
+            `after`: Phases that must complete before this one starts.
+        """
+        self._phases[name] = (start, tuple(after))
+
+    def _check_cycles(self):
+        # Topological sort: phases left over wait on each other
+        waiting = {name: set(after) for name, (_, after) in self._phases.items()}
+        ready = [name for name, after in waiting.items() if not after]
+        while ready:
+            completed = ready.pop()
+            del waiting[completed]
+            for name, after in waiting.items():
+                if completed in after:
+                    after.discard(completed)
+                    if not after:
+                        ready.append(name)
+        if waiting:
+            raise ValueError(f"Phases {sorted(waiting)} wait on each other")
+
+    def run(
+        self,
+        origin: Optional[float] = None,
+        report: Optional[StartupReport] = None,
+    ) -> Future:
+        """
+        Starts the phases.
+
+        #### Args:
+            `origin`: Clock value the report timings are relative to.
+                Defaults to now.
+            `report`: Report to complete, e.g. holding earlier phases.
+
+        #### Returns:
+            `Future`: Resolved with a `StartupReport` once every phase
+                completed, or failed with a `StartupError`.
+
+        #### Raises:
+            `ValueError`: If a phase comes after an unknown phase, or if
+                phases depend on each other in a cycle.
+        """
+        for name, (_, after) in self._phases.items():
+            for dependency in after:
+                if dependency not in self._phases:
+                    raise ValueError(f"Phase {name!r} needs unknown {dependency!r}")
+        self._check_cycles()
+
+        future: Future = Future()
+        report = StartupReport() if report is None else report
+        origin = self._clock() if origin is None else origin
+        pending = dict(self._phases)
+        done = set()
+
+        def launch():
+            ready = [
+                name
+                for name, (_, after) in pending.items()
+                if all(dependency in done for dependency in after)
+            ]
+            for name in ready:
+                # A phase completing synchronously may have started it already
+                if name in pending:
+                    start, _ = pending.pop(name)
+                    begin(name, start)
+
+        def begin(name: str, start: PhaseStarter):
+            started = self._clock() - origin
+
+            def on_success(*_):
+                if future.done() or name in done:
+                    return
+                report.phases[name] = (started, self._clock() - origin)
+                done.add(name)
+                if not pending and len(done) == len(self._phases):
+                    report.total = self._clock() - origin
+                    future.set_result(report)
+                else:
+                    launch()
+
+            def on_error(error):
+                if future.done():
+                    return
+                report.failed = name
+                report.total = self._clock() - origin
+                future.set_exception(StartupError(name, error, report))
+
+            try:
+                start(on_success, on_error)
+            except Exception as error:  # pylint: disable=broad-except
+                on_error(error)
+
+        if not self._phases:
+            future.set_result(report)
+        else:
+            launch()
+        return future
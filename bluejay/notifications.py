@@ -0,0 +1,148 @@
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from .glib import GLib
+
+if TYPE_CHECKING:
+    from .interfaces.gatt import Characteristic
+
+ValueProducer = Callable[[], Optional[List[int]]]
+
+
+class NotificationProducer:
+    """
+    Periodically computes a characteristic value and notifies it.
+
+    Producers are owned by a `Characteristic` (see
+    `Characteristic.add_producer()`) and only run while at least one central
+    is subscribed to it: they are started on the first `StartNotify` and
+    stopped when the last subscriber goes away.
+    """
+
+    def __init__(
+        self,
+        characteristic: "Characteristic",
+        interval: int,
+        function: ValueProducer,
+    ):
+        """
+        #### Args:
+            `characteristic`: The characteristic to notify.
+            `interval`: Time between calls to `function`, in milliseconds.
+            `function`: Function returning the new value, or `None` to skip
+                the notification.
+        """
+        self.characteristic = characteristic
+        self.interval = interval
+        self.function = function
+        self._source: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        return self._source is not None
+
+    def start(self):
+        if self._source is None:
+            self._source = GLib.timeout_add(self.interval, self._tick)
+
+    def stop(self):
+        if self._source is not None:
+            GLib.source_remove(self._source)
+            self._source = None
+
+    def _tick(self) -> bool:
+        value = self.function()
+        if value is not None:
+            self.characteristic.notify_value(value)
+        return True
+
+
+ValueComparator = Callable[[bytes, bytes], bool]
+ValueDecoder = Callable[[bytes], float]
+
+
+def _decode_int(value: bytes) -> int:
+    return int.from_bytes(value, "little", signed=True)
+
+
+class NotificationFilter:
+    """
+    Suppresses notifications of values that did not change since the last
+    one emitted.
+
+    By default values are compared byte for byte. With a `deadband`, numeric
+    values are decoded and only emitted when they moved by more than the
+    deadband from the last emitted value. A custom `comparator` can replace
+    both. With a `heartbeat`, a value is always emitted if nothing was for
+    that long.
+    """
+
+    def __init__(
+        self,
+        comparator: Optional[ValueComparator] = None,
+        deadband: Optional[float] = None,
+        decode: ValueDecoder = _decode_int,
+        heartbeat: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        #### Args:
+            `comparator`: Function receiving the last emitted and the new
+                value, returning `True` if the new one must be emitted.
+            `deadband`: Smallest change of the decoded value worth emitting.
+            `decode`: Converts a value to a number for the deadband. Defaults
+                to a little endian signed integer.
+            `heartbeat`: Time in milliseconds after which an unchanged value
+                is emitted anyway.
+            `clock`: Monotonic clock in seconds.
+        """
+        self.comparator = comparator
+        self.deadband = deadband
+        self.decode = decode
+        self.heartbeat = heartbeat
+        self._clock = clock
+
+        self._last: Optional[bytes] = None
+        self._last_time = 0.0
+
+        self.emitted = 0
+        self.suppressed = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"emitted": self.emitted, "suppressed": self.suppressed}
+
+    def reset(self):
+        """Forgets the last emitted value, so that the next one is emitted"""
+        self._last = None
+
+    def should_emit(self, value) -> bool:
+        """
+        Returns `True` if `value` must be emitted, and records it as the last
+        emitted value
+        """
+        value = bytes(value)
+        now = self._clock()
+        last = self._last
+
+        if last is None:
+            changed = True
+        elif self.heartbeat is not None and (
+            now - self._last_time >= self.heartbeat / 1000
+        ):
+            changed = True
+        elif self.comparator is not None:
+            changed = self.comparator(last, value)
+        elif self.deadband is not None:
+            changed = abs(self.decode(value) - self.decode(last)) > self.deadband
+        else:
+            changed = value != last
+
+        if not changed:
+            self.suppressed += 1
+            return False
+
+        self._last = value
+        self._last_time = now
+        self.emitted += 1
+        return True
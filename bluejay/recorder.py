@@ -0,0 +1,316 @@
+import mmap
+import os
+import struct
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+KIND_WRITE = 1
+KIND_NOTIFY = 2
+
+SEGMENT_MAGIC = b"BJLOG\x00\x00\x01"
+
+# Segment header: magic, sequence number of the segment
+_SEGMENT = struct.Struct("<8sQ")
+
+# Record header: total size (0 until the record is complete, 0xFFFFFFFF when
+# the log continues in the next segment), kind, device length, path length,
+# timestamp, payload length. Followed by the path, the device and the
+# payload, padded to 8 bytes.
+_RECORD = struct.Struct("<IBBHdI4x")
+
+_CONTINUED = 0xFFFFFFFF
+_SUFFIX = ".seg"
+
+
+def _segment_name(sequence: int) -> str:
+    return f"{sequence:016d}{_SUFFIX}"
+
+
+def _segments(directory: str) -> List[Tuple[int, str]]:
+    segments = []
+    for name in os.listdir(directory):
+        if name.endswith(_SUFFIX) and name[: -len(_SUFFIX)].isdigit():
+            segments.append((int(name[: -len(_SUFFIX)]), os.path.join(directory, name)))
+    return sorted(segments)
+
+
+class Recorder:
+    """
+    Appends timestamped write and notification records to a log of memory
+    mapped segment files.
+
+    Recording is a copy into the mapped segment: no system call nor lock is
+    involved except when a segment is full and the next one is created. It
+    is meant to be used from the GLib loop thread only. Once `max_segments`
+    segments exist the oldest one is deleted.
+
+    Set it as `Application.recorder` to record every `WriteValue` and
+    notified `Value` of the application. Read the log with `LogReader`,
+    possibly from another process while it is being written.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_size: int = 16 * 1024 * 1024,
+        max_segments: int = 8,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        #### Args:
+            `directory`: Directory of the segment files, created if needed.
+            `segment_size`: Size of a segment in bytes.
+            `max_segments`: Number of segments kept, including the current
+                one. `None` keeps them all.
+            `clock`: Clock of the record timestamps, in seconds.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+        self._clock = clock
+
+        self._map: Optional[mmap.mmap] = None
+        self._position = 0
+        existing = _segments(directory)
+        self._sequence = existing[-1][0] if existing else -1
+        self._open_segment()
+
+        self.records = 0
+        self.dropped = 0
+
+    def _open_segment(self):
+        self._sequence += 1
+        path = os.path.join(self.directory, _segment_name(self._sequence))
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, self.segment_size)
+            self._map = mmap.mmap(fd, self.segment_size)
+        finally:
+            os.close(fd)
+        _SEGMENT.pack_into(self._map, 0, SEGMENT_MAGIC, self._sequence)
+        self._position = _SEGMENT.size
+        self._reclaim()
+
+    def _reclaim(self):
+        if self.max_segments is None:
+            return
+        segments = _segments(self.directory)
+        for _, path in segments[: max(0, len(segments) - self.max_segments)]:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def _rotate(self):
+        if self._position + 4 <= self.segment_size:
+            struct.pack_into("<I", self._map, self._position, _CONTINUED)
+        self._map.close()
+        self._open_segment()
+
+    def record(
+        self,
+        kind: int,
+        path: str,
+        device: Optional[str],
+        payload,
+        timestamp: Optional[float] = None,
+    ):
+        """
+        Appends a record. `payload` is any bytes-like object or sequence of
+        integers, such as the `dbus.Array` received by `WriteValue`.
+        """
+        if not isinstance(payload, (bytes, bytearray, memoryview)):
+            payload = bytes(payload)
+        path_bytes = path.encode()
+        device_bytes = device.encode() if device else b""
+
+        header_end = self._position + _RECORD.size
+        size = _RECORD.size + len(path_bytes) + len(device_bytes) + len(payload)
+        size = (size + 7) & ~7
+        if size > self.segment_size - _SEGMENT.size:
+            self.dropped += 1
+            return
+        if self._position + size > self.segment_size:
+            self._rotate()
+            header_end = self._position + _RECORD.size
+
+        memory = self._map
+        start = self._position
+        end = header_end + len(path_bytes)
+        memory[header_end:end] = path_bytes
+        memory[end : end + len(device_bytes)] = device_bytes
+        end += len(device_bytes)
+        memory[end : end + len(payload)] = payload
+
+        # The size is written last, publishing the record to readers
+        _RECORD.pack_into(
+            memory,
+            start,
+            0,
+            kind,
+            len(device_bytes),
+            len(path_bytes),
+            self._clock() if timestamp is None else timestamp,
+            len(payload),
+        )
+        struct.pack_into("<I", memory, start, size)
+        self._position = start + size
+        self.records += 1
+
+    def record_write(self, path: str, device: Optional[str], value):
+        self.record(KIND_WRITE, path, device, value)
+
+    def record_notify(self, path: str, value):
+        self.record(KIND_NOTIFY, path, None, value)
+
+    def flush(self):
+        """Writes the current segment to disk"""
+        self._map.flush()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self) -> "Recorder":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Record:
+    """
+    A record of the log. `payload` is a `memoryview` over the mapped segment,
+    valid until the `LogReader` is closed: copy it to keep it longer.
+    """
+
+    __slots__ = ("kind", "timestamp", "_path", "_device", "payload")
+
+    def __init__(self, kind, timestamp, path, device, payload):
+        self.kind = kind
+        self.timestamp = timestamp
+        self._path = path
+        self._device = device
+        self.payload = payload
+
+    @property
+    def path(self) -> str:
+        return bytes(self._path).decode()
+
+    @property
+    def device(self) -> Optional[str]:
+        return bytes(self._device).decode() if self._device else None
+
+    def __repr__(self) -> str:
+        return (
+            f"Record(kind={self.kind}, timestamp={self.timestamp}, "
+            f"path={self.path!r}, device={self.device!r}, "
+            f"payload={bytes(self.payload)!r})"
+        )
+
+
+class LogReader:
+    """
+    Reads the log written by a `Recorder`, without copying the payloads.
+
+    Iterating goes through every record currently in the log. `poll()` only
+    returns the records appended since its previous call, to follow the log
+    while it is being written.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._maps: Dict[str, Tuple[mmap.mmap, memoryview]] = {}
+        self._cursor: Tuple[int, int] = (-1, 0)
+
+    def _map(self, path: str) -> Optional[memoryview]:
+        mapped = self._maps.get(path)
+        if mapped is not None:
+            return mapped[1]
+        try:
+            with open(path, "rb") as file:
+                memory = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # Reclaimed or still empty
+            return None
+        view = memoryview(memory)
+        if bytes(view[:8]) != SEGMENT_MAGIC:
+            view.release()
+            memory.close()
+            return None
+        self._maps[path] = (memory, view)
+        return view
+
+    def _unmap(self, path: str):
+        memory, view = self._maps.pop(path)
+        view.release()
+        try:
+            memory.close()
+        except BufferError:
+            # Payloads still referenced, unmapped once they are freed
+            pass
+
+    def _read(self, view: memoryview, position: int) -> Iterator[Tuple[Record, int]]:
+        limit = len(view) - _RECORD.size
+        while position <= limit:
+            size, kind, device_length, path_length, timestamp, length = (
+                _RECORD.unpack_from(view, position)
+            )
+            if size == 0 or size == _CONTINUED:
+                return
+            start = position + _RECORD.size
+            path_end = start + path_length
+            device_end = path_end + device_length
+            yield Record(
+                kind,
+                timestamp,
+                view[start:path_end],
+                view[path_end:device_end],
+                view[device_end : device_end + length],
+            ), position + size
+            position += size
+
+    def __iter__(self) -> Iterator[Record]:
+        for _, path in _segments(self.directory):
+            view = self._map(path)
+            if view is not None:
+                for record, _ in self._read(view, _SEGMENT.size):
+                    yield record
+
+    def poll(self) -> List[Record]:
+        """Returns the records appended since the previous call"""
+        sequence, position = self._cursor
+        records = []
+        segments = _segments(self.directory)
+
+        # Release the segments reclaimed or already read
+        current = {path for segment, path in segments if segment >= sequence}
+        for path in [path for path in self._maps if path not in current]:
+            self._unmap(path)
+
+        for segment, path in segments:
+            if segment < sequence:
+                continue
+            view = self._map(path)
+            if view is None:
+                continue
+            if segment > sequence:
+                position = _SEGMENT.size
+            for record, position in self._read(view, position):
+                records.append(record)
+            sequence = segment
+            self._cursor = (sequence, position)
+        return records
+
+    def close(self):
+        """Releases the segments, invalidating the payloads of the records"""
+        for path in list(self._maps):
+            self._unmap(path)
+
+    def __enter__(self) -> "LogReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,170 @@
+import heapq
+import itertools
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .enums import NotificationPriority
+from .glib import GLib
+
+if TYPE_CHECKING:
+    from .interfaces.gatt import Characteristic
+
+_Flow = Tuple[str, Optional[str]]
+
+
+class _ClassQueue:
+    """Weighted fair queue of one priority class"""
+
+    def __init__(self):
+        self.heap: List[Tuple[float, int, float, Any, Any]] = []
+        self.virtual_time = 0.0
+        self.finish: Dict[_Flow, float] = {}
+
+        self.enqueued = 0
+        self.emitted = 0
+        self.dropped = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "depth": len(self.heap),
+            "enqueued": self.enqueued,
+            "emitted": self.emitted,
+            "dropped": self.dropped,
+            "mean_wait": self.total_wait / self.emitted if self.emitted else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+
+class NotificationScheduler:
+    """
+    Central outbound queue for notifications and indications.
+
+    Values are emitted in strict priority order between classes (see
+    `NotificationPriority`) and with weighted fair queueing between the flows
+    of a class, a flow being a characteristic and device pair, so a bulk
+    stream cannot starve other characteristics. Emissions are paced by a
+    global token bucket of `rate` emissions per second.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1000.0,
+        burst: int = 50,
+        max_depth: int = 1024,
+        clock=time.monotonic,
+    ):
+        """
+        #### Args:
+            `rate`: Global emission budget, in emissions per second.
+            `burst`: Emissions allowed back to back when the budget is full.
+            `max_depth`: Maximum values queued per priority class. Values
+                submitted to a full class are dropped.
+            `clock`: Monotonic clock in seconds.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_depth = max_depth
+        self._clock = clock
+
+        self._queues = {priority: _ClassQueue() for priority in NotificationPriority}
+        self._sequence = itertools.count()
+        self._tokens = float(burst)
+        self._refilled = clock()
+        self._source: Optional[int] = None
+
+    def submit(
+        self,
+        characteristic: "Characteristic",
+        value: Any,
+        priority: Optional[NotificationPriority] = None,
+        device: Optional[str] = None,
+        weight: Optional[float] = None,
+    ) -> bool:
+        """
+        Queues a `Value` notification of `characteristic`.
+
+        #### Args:
+            `characteristic`: The characteristic to notify.
+            `value`: The value.
+            `priority`: Defaults to `characteristic.priority`.
+            `device`: The device the notification is meant for, if known.
+            `weight`: Share of the class given to this flow. Defaults to
+                `characteristic.weight`.
+
+        #### Returns:
+            `bool`: `False` if the class queue was full and the value dropped.
+
+        #### Raises:
+            `ValueError`: If the weight is not positive.
+        """
+        if priority is None:
+            priority = characteristic.priority
+        if weight is None:
+            weight = characteristic.weight
+        if weight <= 0:
+            raise ValueError(f"Weight must be positive, got {weight}")
+
+        queue = self._queues[priority]
+        if len(queue.heap) >= self.max_depth:
+            queue.dropped += 1
+            return False
+
+        flow = (characteristic.path, device)
+        start = max(queue.virtual_time, queue.finish.get(flow, 0.0))
+        finish = start + max(len(value), 1) / weight
+        queue.finish[flow] = finish
+        heapq.heappush(
+            queue.heap,
+            (finish, next(self._sequence), self._clock(), characteristic, value),
+        )
+        queue.enqueued += 1
+
+        if self._source is None:
+            self._source = GLib.idle_add(self._drain)
+        return True
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Queue depth, counters and wait times, in seconds, per class"""
+        return {
+            priority.name: queue.stats() for priority, queue in self._queues.items()
+        }
+
+    def _refill(self, now: float):
+        self._tokens = min(
+            float(self.burst), self._tokens + (now - self._refilled) * self.rate
+        )
+        self._refilled = now
+
+    def _drain(self) -> bool:
+        self._source = None
+        now = self._clock()
+        self._refill(now)
+
+        for priority in NotificationPriority:
+            queue = self._queues[priority]
+            while queue.heap and self._tokens >= 1:
+                finish, _, queued, characteristic, value = heapq.heappop(queue.heap)
+                queue.virtual_time = finish
+                if not queue.heap:
+                    # Idle class: restart the virtual clock
+                    queue.virtual_time = 0.0
+                    queue.finish.clear()
+
+                wait = now - queued
+                queue.total_wait += wait
+                if wait > queue.max_wait:
+                    queue.max_wait = wait
+                queue.emitted += 1
+
+                self._tokens -= 1
+                characteristic.emitPropertiesChanged({"Value": value})
+
+            if queue.heap:
+                break
+
+        if any(queue.heap for queue in self._queues.values()):
+            delay = max(1, int((1 - self._tokens) / self.rate * 1000))
+            self._source = GLib.timeout_add(delay, self._drain)
+        return False
@@ -0,0 +1,202 @@
+import os
+import struct
+import sys
+import zlib
+from multiprocessing import resource_tracker, shared_memory
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from .glib import GLib
+
+if TYPE_CHECKING:
+    from .interfaces.gatt import Characteristic
+
+_HEADER = struct.Struct("<QII")
+"""Sequence number, value length and CRC-32 of the value, followed by it"""
+
+_NEVER = 2**31 - 1
+
+_READ_ATTEMPTS = 1000
+"""Attempts of `read()` before giving up on a write in progress"""
+
+# Eventfds only accept 8 bytes counters, which pipes take as well
+_WAKEUP = (1).to_bytes(8, "little")
+
+
+class SharedValue:
+    """
+    A characteristic value living in shared memory, written by producer
+    processes and read by the process running `BLEManager` without any IPC.
+
+    Consistency is ensured with a seqlock: the writer makes the sequence
+    number odd while it updates the value and even once done, and readers
+    retry while it is odd or changed during the read. Python gives no memory
+    barriers, so on weakly ordered CPUs (e.g. ARM) a reader may see the new
+    sequence number before the new value: the header also holds a CRC-32 of
+    the value, and readers retry until the copy matches it. There must be a
+    single writer at a time. Each write also signals an eventfd (or a pipe
+    where eventfd is not available) that wakes up the GLib loop.
+
+    Typical use: create it in the manager process, `bind()` it to a
+    characteristic, then start producers with `multiprocessing` (the wakeup
+    descriptor is inherited) calling
+    `SharedValue.attach(name, wakeup_fd).write(value)`.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        capacity: int = 512,
+        create: bool = True,
+        wakeup_fd: Optional[int] = None,
+    ):
+        """
+        #### Args:
+            `name`: Name of the shared memory block. Generated when creating
+                one without a name.
+            `capacity`: Largest value in bytes.
+            `create`: Create the block rather than attaching to it.
+            `wakeup_fd`: Descriptor signalled on every write. Created along
+                with the block when `None`.
+        """
+        if create:
+            self._shm = shared_memory.SharedMemory(
+                name=name, create=True, size=_HEADER.size + capacity
+            )
+        elif sys.version_info >= (3, 13):
+            self._shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            # Attaching registers the block with the resource tracker, which
+            # would unlink it when this process exits. It is registered under
+            # the POSIX name, with its leading slash.
+            if os.name == "posix":
+                resource_tracker.unregister("/" + self._shm.name, "shared_memory")
+        self._buffer = self._shm.buf
+        self.capacity = len(self._buffer) - _HEADER.size
+        self._owner = create
+        self._watch: Optional[int] = None
+        self._last = b""
+
+        self._read_fd: Optional[int] = None
+        if wakeup_fd is not None:
+            self.wakeup_fd = wakeup_fd
+        elif hasattr(os, "eventfd"):
+            self.wakeup_fd = self._read_fd = os.eventfd(0, os.EFD_NONBLOCK)
+            os.set_inheritable(self.wakeup_fd, True)
+        else:
+            self._read_fd, self.wakeup_fd = os.pipe()
+            os.set_blocking(self._read_fd, False)
+            os.set_blocking(self.wakeup_fd, False)
+            os.set_inheritable(self.wakeup_fd, True)
+
+        if create:
+            _HEADER.pack_into(self._buffer, 0, 0, 0, zlib.crc32(b""))
+
+    @classmethod
+    def attach(cls, name: str, wakeup_fd: int) -> "SharedValue":
+        """Attaches a producer to an existing shared value"""
+        return cls(name, create=False, wakeup_fd=wakeup_fd)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def sequence(self) -> int:
+        """Incremented by two on every write"""
+        return _HEADER.unpack_from(self._buffer, 0)[0]
+
+    def write(self, value):
+        """Stores `value` (any bytes-like object or list of ints)"""
+        if not isinstance(value, (bytes, bytearray, memoryview)):
+            value = bytes(value)
+        length = len(value)
+        if length > self.capacity:
+            raise ValueError(f"Value of {length} bytes exceeds {self.capacity}")
+
+        sequence = self.sequence
+        _HEADER.pack_into(self._buffer, 0, sequence + 1, length, 0)
+        self._buffer[_HEADER.size : _HEADER.size + length] = value
+        _HEADER.pack_into(self._buffer, 0, sequence + 2, length, zlib.crc32(value))
+
+        try:
+            os.write(self.wakeup_fd, _WAKEUP)
+        except BlockingIOError:
+            # A wakeup is already pending
+            pass
+
+    def read(self) -> bytes:
+        """
+        Returns a consistent copy of the current value.
+
+        If no consistent copy can be made, e.g. because a producer died in
+        the middle of a write, returns the last value read instead of
+        blocking the loop.
+        """
+        buffer = self._buffer
+        for attempt in range(_READ_ATTEMPTS):
+            sequence, length, crc = _HEADER.unpack_from(buffer, 0)
+            if not sequence & 1 and length <= self.capacity:
+                value = bytes(buffer[_HEADER.size : _HEADER.size + length])
+                if (
+                    zlib.crc32(value) == crc
+                    and _HEADER.unpack_from(buffer, 0)[0] == sequence
+                ):
+                    self._last = value
+                    return value
+            if attempt % 64 == 63:
+                # Let a descheduled writer finish
+                os.sched_yield()
+        return self._last
+
+    def watch(self, callback: Callable[[bytes], Any]) -> int:
+        """
+        Calls `callback` with the new value in the GLib loop after writes.
+        Writes happening in a burst may be reported once, with the last value.
+
+        #### Returns:
+            `int`: The id of the event source.
+        """
+        if self._read_fd is None:
+            raise ValueError("Only the process owning the wakeup can watch it")
+
+        def on_wakeup(fd, condition) -> bool:
+            try:
+                os.read(fd, 4096)
+            except BlockingIOError:
+                return True
+            callback(self.read())
+            return True
+
+        self._watch = GLib.unix_fd_add(self._read_fd, on_wakeup)
+        return self._watch
+
+    def bind(self, characteristic: "Characteristic"):
+        """
+        Serves the `ReadValue` of `characteristic` from this value and
+        notifies it on every change
+        """
+        characteristic.set_value_provider(self.read, _NEVER)
+        cache = characteristic.value_cache
+
+        def changed(value: bytes):
+            cache.set(value)
+            characteristic.notify_value(value)
+
+        self.watch(changed)
+
+    def close(self):
+        if self._watch is not None:
+            GLib.source_remove(self._watch)
+            self._watch = None
+        self._buffer = None
+        self._shm.close()
+        if self._read_fd is not None:
+            os.close(self._read_fd)
+            if self.wakeup_fd != self._read_fd:
+                os.close(self.wakeup_fd)
+            self._read_fd = None
+
+    def unlink(self):
+        """Destroys the shared memory block, once every process closed it"""
+        self._shm.unlink()
@@ -0,0 +1,107 @@
+import collections
+import json
+import os
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from .uuids import BluetoothUUID
+
+
+def _compact(uuid: BluetoothUUID) -> str:
+    # Base UUIDs are stored as their short alias, e.g. "2a05"
+    short = uuid.short
+    return uuid if short is None else f"{short:04x}"
+
+
+class SubscriptionStore:
+    """
+    Remembers which characteristics each client had notifications enabled on,
+    keyed by device address and persisted to disk, and buffers the values
+    notified while a client was away so they can be replayed on reconnect.
+    """
+
+    def __init__(self, path: Optional[str] = None, replay_size: int = 32):
+        """
+        #### Args:
+            `path`: File the subscriptions are persisted to. When `None`
+                they are only kept in memory.
+            `replay_size`: Number of values buffered per client and
+                characteristic while the client is disconnected. Older
+                values are dropped first.
+        """
+        self.path = path
+        self.replay_size = replay_size
+        self._subscriptions: Dict[str, Set[str]] = {}
+        self._pending: Dict[Tuple[str, str], Deque[Any]] = {}
+
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def load(self):
+        with open(self.path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        self._subscriptions = {
+            address: {BluetoothUUID(uuid) for uuid in uuids}
+            for address, uuids in data.items()
+        }
+
+    def save(self):
+        if self.path is None:
+            return
+
+        data = {
+            address: sorted(_compact(uuid) for uuid in uuids)
+            for address, uuids in self._subscriptions.items()
+            if uuids
+        }
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(data, file, separators=(",", ":"))
+        os.replace(temporary, self.path)
+
+    def get(self, address: str) -> Set[str]:
+        """Returns the UUIDs of the characteristics `address` subscribed to"""
+        return set(self._subscriptions.get(address.upper(), ()))
+
+    def add(self, address: str, uuid: str):
+        uuids = self._subscriptions.setdefault(address.upper(), set())
+        uuid = BluetoothUUID(uuid)
+        if uuid not in uuids:
+            uuids.add(uuid)
+            self.save()
+
+    def remove(self, address: str, uuid: str):
+        address = address.upper()
+        uuid = BluetoothUUID(uuid)
+        uuids = self._subscriptions.get(address)
+        if uuids and uuid in uuids:
+            uuids.discard(uuid)
+            self._pending.pop((address, uuid), None)
+            self.save()
+
+    def forget(self, address: str):
+        """Drops every subscription and buffered value of `address`"""
+        address = address.upper()
+        self._subscriptions.pop(address, None)
+        for key in [key for key in self._pending if key[0] == address]:
+            del self._pending[key]
+        self.save()
+
+    def queue(self, uuid: str, value: Any, connected: Set[str] = frozenset()):
+        """
+        Buffers `value` for every client subscribed to `uuid` that is not in
+        `connected`
+        """
+        uuid = BluetoothUUID(uuid)
+        for address, uuids in self._subscriptions.items():
+            if uuid not in uuids or address in connected:
+                continue
+            pending = self._pending.get((address, uuid))
+            if pending is None:
+                pending = collections.deque(maxlen=self.replay_size)
+                self._pending[(address, uuid)] = pending
+            pending.append(value)
+
+    def drain(self, address: str, uuid: str) -> List[Any]:
+        """Returns and clears the values buffered for `address` on `uuid`"""
+        pending = self._pending.pop((address.upper(), BluetoothUUID(uuid)), None)
+        return list(pending) if pending else []
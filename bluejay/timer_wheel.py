@@ -0,0 +1,229 @@
+import itertools
+import time
+from typing import Any, Callable, Dict, List, Optional, TypeVar, Union
+
+from .glib import GLib
+
+_T = TypeVar("_T")
+
+
+class _Timer:
+    __slots__ = ("id", "expires", "interval", "slack", "function", "data", "slot")
+
+    def __init__(self, id: int, interval: int, slack: int, function, data):
+        self.id = id
+        self.expires = 0
+        self.interval = interval
+        self.slack = slack
+        self.function = function
+        self.data = data
+        self.slot: Optional[Dict[int, "_Timer"]] = None
+
+
+class TimerWheel:
+    """
+    Hierarchical timer wheel driven by a single GLib timeout source.
+
+    It offers the same interface as `bluejay.glib.GLib` (`timeout_add`,
+    `timeout_add_seconds`, `source_remove`) with O(1) scheduling and
+    cancellation, so thousands of periodic tasks cost one GLib source instead
+    of one each. Timers fire with a precision of `resolution` milliseconds and
+    the source only runs while there are pending timers.
+
+    Timers scheduled with a `slack` are aligned to multiples of it, so timers
+    expiring close together are coalesced and fire on the same tick.
+    """
+
+    def __init__(
+        self,
+        resolution: int = 10,
+        slot_bits: int = 6,
+        levels: int = 4,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        #### Args:
+            `resolution`: Duration of a tick, in milliseconds.
+            `slot_bits`: Each level has `2 ** slot_bits` slots.
+            `levels`: Number of levels. Timers further away than the range of
+                the wheel are cascaded until they fit.
+            `clock`: Monotonic clock in seconds.
+        """
+        self.resolution = resolution
+        self._bits = slot_bits
+        self._mask = (1 << slot_bits) - 1
+        self._levels = levels
+        self._clock = clock
+        self._wheel: List[List[Dict[int, _Timer]]] = [
+            [{} for _ in range(1 << slot_bits)] for _ in range(levels)
+        ]
+        self._timers: Dict[int, _Timer] = {}
+        self._ids = itertools.count(1)
+        self._origin = clock()
+        self._tick = 0
+        self._target = 0
+        self._source: Optional[int] = None
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def timeout_add(
+        self,
+        interval: int,
+        function: Union[Callable[[_T], Any], Callable[[], Any]],
+        data: Optional[_T] = None,
+        slack: int = 0,
+    ) -> int:
+        """
+        Sets a function to be called at regular intervals (after `interval`)
+        until it returns `False` or is cancelled with `source_remove`
+
+        #### Args:
+            `interval`: Time between calls to the function, in milliseconds.
+            `function`: Function to call.
+            `data`: Data to pass to function.
+            `slack`: Expiries are rounded up to a multiple of `slack`
+                milliseconds, so that close timers fire together.
+
+        #### Returns:
+            `int`: The id of the timer used to cancel the interval.
+        """
+        timer = _Timer(
+            next(self._ids),
+            max(1, -(-interval // self.resolution)),
+            max(1, -(-slack // self.resolution)),
+            function,
+            data,
+        )
+        now = self._now()
+        if not self._timers:
+            self._tick = now
+        self._timers[timer.id] = timer
+        self._schedule(timer, now)
+
+        if self._source is None:
+            self._source = GLib.timeout_add(self.resolution, self._on_tick)
+        return timer.id
+
+    def timeout_add_seconds(
+        self,
+        interval: int,
+        function: Union[Callable[[_T], Any], Callable[[], Any]],
+        data: Optional[_T] = None,
+    ) -> int:
+        """
+        Same as `timeout_add()` with `interval` in seconds. Like GLib, these
+        timers are coalesced on whole seconds.
+        """
+        return self.timeout_add(interval * 1000, function, data, slack=1000)
+
+    def source_remove(self, id: Optional[int]) -> bool:
+        """
+        Cancels the timer with the given ID
+
+        #### Returns:
+            `bool`: Returns `True` if the timer was removed, false otherwise
+        """
+        timer = self._timers.pop(id, None) if id is not None else None
+        if timer is None:
+            return False
+        if timer.slot is not None:
+            del timer.slot[timer.id]
+            timer.slot = None
+        return True
+
+    def advance(self):
+        """Fires every timer expired at the current time"""
+        target = self._target = self._now()
+        while self._tick < target and self._timers:
+            self._tick += 1
+            self._cascade(self._tick)
+            self._fire(self._tick)
+        if not self._timers:
+            self._tick = target
+
+    def _now(self) -> int:
+        return int((self._clock() - self._origin) * 1000) // self.resolution
+
+    def _schedule(self, timer: _Timer, now: int):
+        expires = now + timer.interval
+        if timer.slack > 1:
+            expires = -(-expires // timer.slack) * timer.slack
+        timer.expires = expires
+        self._insert(timer)
+
+    def _insert(self, timer: _Timer):
+        delta = timer.expires - self._tick
+        if delta <= 0:
+            # Already due: fire on the next tick
+            timer.expires = self._tick + 1
+            delta = 1
+
+        level = 0
+        while level < self._levels - 1 and delta >> (self._bits * (level + 1)):
+            level += 1
+
+        index = (timer.expires >> (self._bits * level)) & self._mask
+        slot = self._wheel[level][index]
+        slot[timer.id] = timer
+        timer.slot = slot
+
+    def _cascade(self, tick: int):
+        # Higher levels first, so their timers can land in lower level slots
+        # that are cascaded on this same tick
+        for level in range(self._levels - 1, 0, -1):
+            shift = self._bits * level
+            if tick & ((1 << shift) - 1):
+                continue
+            slots = self._wheel[level]
+            index = (tick >> shift) & self._mask
+            timers = slots[index]
+            if timers:
+                slots[index] = {}
+                for timer in timers.values():
+                    if timer.expires == tick:
+                        # Due now: `_fire(tick)` runs it, it is not overdue
+                        slot = self._wheel[0][tick & self._mask]
+                        slot[timer.id] = timer
+                        timer.slot = slot
+                    else:
+                        self._insert(timer)
+
+    def _fire(self, tick: int):
+        slots = self._wheel[0]
+        index = tick & self._mask
+        timers = slots[index]
+        if not timers:
+            return
+        slots[index] = {}
+
+        for timer in list(timers.values()):
+            if timer.id not in self._timers:
+                # Cancelled by a timer fired before it on this tick
+                continue
+            timer.slot = None
+            if timer.expires > tick:
+                self._insert(timer)
+                continue
+
+            if timer.data is None:
+                again = timer.function()
+            else:
+                again = timer.function(timer.data)
+
+            if timer.id not in self._timers:
+                # Cancelled from its own callback
+                continue
+            if again:
+                # Like GLib, reschedule from the current time instead of
+                # firing repeatedly to catch up after a late tick
+                self._schedule(timer, max(tick, self._target))
+            else:
+                del self._timers[timer.id]
+
+    def _on_tick(self) -> bool:
+        self.advance()
+        if not self._timers:
+            self._source = None
+            return False
+        return True
@@ -1,22 +1,21 @@
-from typing import Any, Callable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
 try:
     from typing import Literal
 except ImportError:
     from typing_extensions import Literal
 
-from dbus.exceptions import DBusException
-
-from .interfaces.gatt import Application
+if TYPE_CHECKING:
+    from dbus.exceptions import DBusException
 
 NoneCallback = Callable[[], None]
-DBUSErrorCallback = Callable[[DBusException], None]
+DBUSErrorCallback = Callable[["DBusException"], None]
 DeviceEventCallback = Callable[[Any], None]
-AdvertsementChangeCallback = Callable[[bool, Optional[DBusException]], None]
+AdvertsementChangeCallback = Callable[[bool, Optional["DBusException"]], None]
 ApplicationChangedCallback = Callable[
     [
         Literal["registered", "unregistered", "error"],
-        Optional[DBusException],
+        Optional["DBusException"],
     ],
     None,
 ]
@@ -25,7 +25,31 @@ def is_empty_dict(dic: Optional[dict]):
     return True
 
 
-def find_adapter(bus: dbus.SystemBus):
+def is_adapter(path: str, adapter: Optional[str]) -> bool:
+    """
+    Whether the BlueZ object `path` is `adapter`, given by name (`hci1`) or
+    object path. Any adapter matches when `adapter` is `None`.
+    """
+    if adapter is None:
+        return True
+    path = str(path)
+    return path == adapter or path.rsplit("/", 1)[-1] == adapter
+
+
+def find_adapter(
+    bus: dbus.SystemBus,
+    adapter: Optional[str] = None,
+    power: bool = True,
+    pairable: Optional[bool] = False,
+) -> Optional[str]:
+    """
+    Returns the object path of the first adapter supporting GATT, or of
+    `adapter` when given by name (`hci1`) or path.
+
+    #### Args:
+        `power`: Power the adapter on.
+        `pairable`: Value to set `Pairable` to. `None` leaves it as is.
+    """
     object_manager = dbus.Interface(
         bus.get_object(BLUEZ_SERVICE_NAME, "/"),
         DBUS_OM_IFACE,
@@ -36,14 +60,18 @@ def find_adapter(bus: dbus.SystemBus):
         obj,
         props,
     ) in objects.items():
-        if GATT_MANAGER_INTERFACE in props.keys():
+        if GATT_MANAGER_INTERFACE in props.keys() and is_adapter(obj, adapter):
             adapter_props = dbus.Interface(
                 bus.get_object(BLUEZ_SERVICE_NAME, obj),
                 DBUS_PROPERTIES,
             )
             try:
-                adapter_props.Set(ADAPTER_INTERFACE, "Powered", dbus.Boolean(True))
-                adapter_props.Set(ADAPTER_INTERFACE, "Pairable", dbus.Boolean(False))
+                if power:
+                    adapter_props.Set(ADAPTER_INTERFACE, "Powered", dbus.Boolean(True))
+                if pairable is not None:
+                    adapter_props.Set(
+                        ADAPTER_INTERFACE, "Pairable", dbus.Boolean(pairable)
+                    )
             except dbus.DBusException:
                 print("Cannot set dbus properties")
 
@@ -52,16 +80,18 @@ def find_adapter(bus: dbus.SystemBus):
     return None
 
 
-def disconnect_connected_devices(bus: dbus.SystemBus):
+def disconnect_connected_devices(bus: dbus.SystemBus, adapter: Optional[str] = None):
+    """Disconnects the devices connected to `adapter`, or to any adapter"""
     object_manager = dbus.Interface(
         bus.get_object(BLUEZ_SERVICE_NAME, "/"),
         DBUS_OM_IFACE,
     )
     objects = object_manager.GetManagedObjects()
-    path = None
     for object_path, props in objects.items():
         device = props.get(DEVICE_INTERFACE, None)
-        if device is None:
+        if device is None or not device.get("Connected", True):
+            continue
+        if not is_adapter(device.get("Adapter", ""), adapter):
             continue
 
         dev_iface = dbus.Interface(
@@ -71,6 +101,17 @@ def disconnect_connected_devices(bus: dbus.SystemBus):
         dev_iface.Disconnect()
 
 
+def device_address(path: str) -> Optional[str]:
+    """
+    Returns the address of the device at the BlueZ object `path`, e.g.
+    `/org/bluez/hci0/dev_AA_BB_CC_DD_EE_FF` gives `AA:BB:CC:DD:EE:FF`
+    """
+    name = str(path).rsplit("/", 1)[-1]
+    if not name.startswith("dev_"):
+        return None
+    return name[4:].replace("_", ":").upper()
+
+
 def get_hostname(bus: dbus.SystemBus) -> str:
     interface = dbus.Interface(
         bus.get_object(
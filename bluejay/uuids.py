@@ -0,0 +1,115 @@
+from functools import lru_cache
+from typing import Optional, Union
+
+from .constants import SERVICE_UUID_NAMES
+
+BASE_UUID_SUFFIX = "-0000-1000-8000-00805f9b34fb"
+"""Suffix shared by every UUID derived from the Bluetooth Base UUID."""
+
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+
+class BluetoothUUID(str):
+    """
+    A UUID normalised to its lower case, 128-bit string form.
+
+    Instances are plain strings, so they can be passed anywhere a UUID string
+    is expected (D-Bus properties, dictionary keys, comparisons), but two
+    UUIDs written as `"180A"`, `"0x180a"` and
+    `"0000180A-0000-1000-8000-00805F9B34FB"` all compare equal.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, value: Union[str, int, "BluetoothUUID"]):
+        if isinstance(value, BluetoothUUID):
+            return value
+        return str.__new__(cls, normalize_uuid(value))
+
+    @property
+    def is_base(self) -> bool:
+        """`True` if this UUID is derived from the Bluetooth Base UUID"""
+        return self.endswith(BASE_UUID_SUFFIX)
+
+    @property
+    def short(self) -> Optional[int]:
+        """
+        The 16 or 32-bit alias of this UUID, or `None` if it is not derived
+        from the Bluetooth Base UUID
+        """
+        if not self.is_base:
+            return None
+        return int(self[:8], 16)
+
+    def __repr__(self) -> str:
+        return f"BluetoothUUID('{self}')"
+
+
+@lru_cache(maxsize=1024)
+def _normalize(value: str) -> str:
+    uuid = value.strip().lower()
+    if uuid.startswith("0x"):
+        uuid = uuid[2:]
+
+    length = len(uuid)
+    if length in (4, 8):
+        if not _HEX_DIGITS.issuperset(uuid):
+            raise ValueError(f"Invalid UUID: {value!r}")
+        return uuid.rjust(8, "0") + BASE_UUID_SUFFIX
+
+    if length == 32:
+        uuid = f"{uuid[:8]}-{uuid[8:12]}-{uuid[12:16]}-{uuid[16:20]}-{uuid[20:]}"
+    elif length != 36:
+        raise ValueError(f"Invalid UUID: {value!r}")
+
+    if (
+        uuid[8] != "-"
+        or uuid[13] != "-"
+        or uuid[18] != "-"
+        or uuid[23] != "-"
+        or not _HEX_DIGITS.issuperset(uuid.replace("-", ""))
+    ):
+        raise ValueError(f"Invalid UUID: {value!r}")
+
+    return uuid
+
+
+def normalize_uuid(value: Union[str, int]) -> str:
+    """
+    Converts a UUID to its lower case, 128-bit string form.
+
+    #### Args:
+        `value`: A 16-bit or 32-bit alias (as `int` or hex string, with or
+            without `0x`), or a full 128-bit UUID string with or without dashes.
+
+    #### Returns:
+        `str`: The normalised UUID.
+
+    #### Raises:
+        `ValueError`: If `value` is not a valid UUID.
+    """
+
+    if isinstance(value, BluetoothUUID):
+        return value
+    if isinstance(value, int):
+        if not 0 <= value <= 0xFFFFFFFF:
+            raise ValueError(f"Invalid UUID alias: {value!r}")
+        return f"{value:08x}{BASE_UUID_SUFFIX}"
+    return _normalize(str(value))
+
+
+_uuid_names: Optional[dict] = None
+
+
+def uuid_name(uuid: Union[str, int]) -> Optional[str]:
+    """
+    Returns the human readable name of `uuid` from
+    `constants.SERVICE_UUID_NAMES`, whatever form `uuid` is written in.
+    """
+    global _uuid_names
+
+    if _uuid_names is None:
+        _uuid_names = {
+            normalize_uuid(key): name for key, name in SERVICE_UUID_NAMES.items()
+        }
+    return _uuid_names.get(normalize_uuid(uuid))
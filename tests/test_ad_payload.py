@@ -0,0 +1,147 @@
+from types import SimpleNamespace
+
+import pytest
+
+from bluejay.ad_payload import (
+    AD_COMPLETE_NAME,
+    AD_SHORT_NAME,
+    LEGACY_PAYLOAD_LENGTH,
+    AdvertisementOverflowError,
+    ad_structure,
+    encode_advertisement,
+    uuid_bytes,
+)
+
+CUSTOM_UUID = "12345678-1234-5678-1234-56789abcdef0"
+FLAGS = bytes.fromhex("020106")
+
+
+def make_ad(**properties):
+    fields = dict(
+        ad_type="peripheral",
+        discoverable=True,
+        includes=None,
+        service_uuids=None,
+        solicit_uuids=None,
+        manufacturer_data=None,
+        service_data=None,
+        data=None,
+        appearance=None,
+        tx_power=None,
+        local_name=None,
+    )
+    fields.update(properties)
+    return SimpleNamespace(**fields)
+
+
+def test_ad_structure():
+    assert ad_structure(0x09, b"ab") == b"\x03\x09ab"
+    with pytest.raises(ValueError):
+        ad_structure(0xFF, bytes(255))
+
+
+@pytest.mark.parametrize(
+    "uuid, expected",
+    [
+        ("180f", "0f18"),
+        ("0000180f-0000-1000-8000-00805f9b34fb", "0f18"),
+        ("12345678", "78563412"),
+        (CUSTOM_UUID, bytes.fromhex(CUSTOM_UUID.replace("-", ""))[::-1].hex()),
+    ],
+)
+def test_uuid_bytes(uuid, expected):
+    assert uuid_bytes(uuid).hex() == expected
+
+
+def test_fields():
+    ad = make_ad(
+        service_uuids=["180f", "0x180a", "12345678"],
+        manufacturer_data={0xFFFF: [1, 2]},
+        service_data={"180f": [0x64]},
+        local_name="bluejay",
+    )
+    encoded = encode_advertisement(ad)
+    assert encoded.advertising_data == (
+        FLAGS
+        + bytes.fromhex("0503 0f18 0a18")
+        + bytes.fromhex("0505 78563412")
+        + ad_structure(AD_COMPLETE_NAME, b"bluejay")
+        + bytes.fromhex("05ff ffff 0102")
+    )
+    # The 5 bytes of service data do not fit in the last byte left
+    assert len(encoded.advertising_data) == 30
+    assert encoded.scan_response == bytes.fromhex("0416 0f18 64")
+    assert encoded.placement["service_data"] == "scan_response"
+    assert encoded.omitted == []
+
+
+def test_broadcast_has_no_flags():
+    ad = make_ad(ad_type="broadcast", local_name="x")
+    assert encode_advertisement(ad).advertising_data == b"\x02\x09x"
+
+
+def test_name_in_scan_response():
+    ad = make_ad(service_uuids=[CUSTOM_UUID], local_name="A rather long name")
+    encoded = encode_advertisement(ad)
+    # 3 bytes of flags and 18 of UUID leave 10 bytes, the name needs 20
+    assert len(encoded.advertising_data) == 21
+    assert encoded.scan_response == ad_structure(
+        AD_COMPLETE_NAME, b"A rather long name"
+    )
+    assert encoded.local_name == "A rather long name"
+
+
+def test_name_shortened():
+    ad = make_ad(service_uuids=[CUSTOM_UUID], local_name="A rather long name")
+    encoded = encode_advertisement(ad, scan_response=False)
+    assert encoded.advertising_data.endswith(ad_structure(AD_SHORT_NAME, b"A rather"))
+    assert len(encoded.advertising_data) == LEGACY_PAYLOAD_LENGTH
+    assert encoded.local_name == "A rather"
+    assert encoded.placement["local_name"] == "advertising_data"
+
+    encoded = encode_advertisement(ad, scan_response=False, min_name_length=9)
+    assert encoded.omitted == ["local_name"]
+    assert encoded.local_name is None
+
+
+def test_name_shortened_on_character_boundary():
+    ad = make_ad(service_uuids=[CUSTOM_UUID], local_name="éééééé")
+    encoded = encode_advertisement(ad, scan_response=False)
+    # 8 bytes of room hold 4 two-byte characters
+    assert encoded.local_name == "éééé"
+
+    ad = make_ad(
+        service_uuids=[CUSTOM_UUID],
+        manufacturer_data={0xFFFF: [1, 2, 3]},
+        local_name="éééééé",
+    )
+    encoded = encode_advertisement(
+        ad, scan_response=False, priorities={"local_name": 90}
+    )
+    # 1 byte of room left after the manufacturer data: no whole character
+    assert len(encoded.advertising_data) == 28
+    assert encoded.omitted == ["local_name"]
+
+
+def test_adapter_name():
+    ad = make_ad(includes=["local-name"])
+    encoded = encode_advertisement(ad, adapter_name="host")
+    assert encoded.advertising_data == FLAGS + ad_structure(AD_COMPLETE_NAME, b"host")
+
+
+def test_priorities_and_overflow():
+    ad = make_ad(service_uuids=[CUSTOM_UUID], local_name="A rather long name")
+    encoded = encode_advertisement(
+        ad, scan_response=False, priorities={"local_name": 5}
+    )
+    assert encoded.placement == {
+        "flags": "advertising_data",
+        "local_name": "advertising_data",
+    }
+    assert encoded.omitted == ["service_uuids"]
+
+    with pytest.raises(AdvertisementOverflowError) as info:
+        encode_advertisement(
+            ad, scan_response=False, priorities={"local_name": 5}, strict=True
+        )
+    assert info.value.omitted == ["service_uuids"]
@@ -0,0 +1,82 @@
+import pytest
+
+from bluejay.admission import AdmissionController, TokenBucket
+
+DEV_1 = "/org/bluez/hci0/dev_1"
+DEV_2 = "/org/bluez/hci0/dev_2"
+CHAR_1 = "/org/bluejay/service0/char0"
+CHAR_2 = "/org/bluejay/service0/char1"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def admitted(controller, device, attribute, calls, **kwargs):
+    return sum(controller.admit(device, attribute, **kwargs) for _ in range(calls))
+
+
+def test_token_bucket():
+    bucket = TokenBucket(10, 2, 0)
+    assert bucket.take(0) and bucket.take(0)
+    assert not bucket.take(0.05)
+    assert bucket.take(0.1)
+    # Refills up to the burst only
+    assert sum(bucket.take(10) for _ in range(5)) == 2
+
+
+def test_device_limit(clock):
+    controller = AdmissionController((10, 5), None, clock=clock)
+    assert admitted(controller, DEV_1, CHAR_1, 3) == 3
+    assert admitted(controller, DEV_1, CHAR_2, 5) == 2
+    # Devices have their own buckets
+    assert admitted(controller, DEV_2, CHAR_1, 5) == 5
+
+    clock.now = 0.2
+    assert admitted(controller, DEV_1, CHAR_1, 5) == 2
+    assert controller.stats[DEV_1] == {"admitted": 7, "rejected": 6}
+    assert controller.throttled(DEV_1) == 6
+    assert controller.throttled(DEV_2) == 0
+
+
+def test_characteristic_limit(clock):
+    controller = AdmissionController((100, 10), (10, 2), clock=clock)
+    assert admitted(controller, DEV_1, CHAR_1, 4) == 2
+    assert admitted(controller, DEV_1, CHAR_2, 4) == 2
+    # Calls rejected by an attribute do not use the device budget
+    assert admitted(controller, DEV_1, CHAR_2, 20) == 0
+    # 6 of the 10 device tokens left
+    assert admitted(controller, DEV_1, "/other", 10, limit=(100, 10)) == 6
+    assert controller.throttled(DEV_1) == 28
+
+
+def test_attribute_override(clock):
+    controller = AdmissionController((100, 10), (10, 2), clock=clock)
+    assert admitted(controller, DEV_1, CHAR_1, 10, limit=(10, 5)) == 5
+
+
+def test_anonymous_calls_share_a_bucket(clock):
+    controller = AdmissionController((10, 3), None, clock=clock)
+    assert admitted(controller, None, CHAR_1, 2) == 2
+    assert admitted(controller, "", CHAR_1, 2) == 1
+    assert controller.throttled(None) == 1
+
+
+def test_idle_devices_pruned(clock):
+    controller = AdmissionController((10, 1), None, idle=60, clock=clock)
+    controller.admit(DEV_1, CHAR_1)
+    clock.now = 30
+    controller.admit(DEV_2, CHAR_1)
+
+    clock.now = 61
+    controller.admit(DEV_2, CHAR_1)
+    assert set(controller.stats) == {DEV_2}
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("dbus")
+
+from bluejay.ad_payload import LEGACY_PAYLOAD_LENGTH, encode_advertisement
+from bluejay.constants import ADVERTISEMENT_INTERFACE
+from bluejay.interfaces.advertisement import Advertisement
+
+
+def from_properties(properties):
+    # What BlueZ builds the advertising data from
+    return SimpleNamespace(
+        ad_type=properties["Type"],
+        discoverable=properties.get("Discoverable"),
+        includes=properties.get("Includes"),
+        service_uuids=properties.get("ServiceUUIDs"),
+        solicit_uuids=properties.get("SolicitUUIDs"),
+        manufacturer_data=properties.get("ManufacturerData"),
+        service_data=properties.get("ServiceData"),
+        data=properties.get("Data"),
+        appearance=properties.get("Appearance"),
+        tx_power=properties.get("TxPower"),
+        local_name=properties.get("LocalName"),
+    )
+
+
+def test_fitted_properties_fit_in_advertising_data():
+    ad = Advertisement(None, "/org/bluejay/test")
+    ad.discoverable = True
+    ad.add_service_uuid("12345678-1234-5678-1234-567812345678")
+    ad.add_manufacturer_data(0xFFFF, list(range(12)))
+    ad.local_name = "A rather long device name"
+    ad.appearance = 0x0340
+
+    ad.fit(LEGACY_PAYLOAD_LENGTH)
+
+    properties = ad.get_properties()[ADVERTISEMENT_INTERFACE]
+    encoded = encode_advertisement(
+        from_properties(properties), LEGACY_PAYLOAD_LENGTH, scan_response=False
+    )
+    assert encoded.omitted == []
+    assert len(encoded.advertising_data) <= LEGACY_PAYLOAD_LENGTH
+    assert properties["ServiceUUIDs"] == ad.service_uuids
+    assert "ManufacturerData" not in properties
@@ -0,0 +1,263 @@
+"""
+Runs the same scenarios against every backend, on a private dbus-daemon.
+
+The asyncio backend exports objects described with the metadata of
+`dbus.service` decorators, which `PlainThing` sets by hand: its scenarios
+run without dbus-python and GLib.
+"""
+
+import asyncio
+import concurrent.futures
+import shutil
+import subprocess
+import threading
+
+import pytest
+
+from bluejay.backends.aio import AsyncioBackend
+from bluejay.backends.base import attach, detach
+
+INTERFACE = "org.bluejay.Test"
+ERROR_NAME = "org.bluejay.Error.Nope"
+
+CONFIG = """<busconfig>
+  <type>session</type>
+  <listen>unix:path={path}</listen>
+  <auth>EXTERNAL</auth>
+  <policy context="default">
+    <allow send_destination="*" eavesdrop="true"/>
+    <allow eavesdrop="true"/>
+    <allow own="*"/>
+  </policy>
+</busconfig>
+"""
+
+
+def method(in_signature, out_signature):
+    # What `dbus.service.method` records on the function
+    def decorate(function):
+        function._dbus_is_method = True
+        function._dbus_interface = INTERFACE
+        function._dbus_in_signature = in_signature
+        function._dbus_out_signature = out_signature
+        return function
+
+    return decorate
+
+
+def signal(signature):
+    # What `dbus.service.signal` records on the function
+    def decorate(function):
+        function._dbus_is_signal = True
+        function._dbus_interface = INTERFACE
+        function._dbus_signature = signature
+        return function
+
+    return decorate
+
+
+class PlainNopeError(Exception):
+    _dbus_error_name = ERROR_NAME
+
+
+class PlainThing:
+    """Test object exported without `dbus.service`"""
+
+    def __init__(self, bus, path):
+        self.path = path
+        attach(self, bus, path, super().__init__)
+
+    @method("ay", "ay")
+    def Reverse(self, value):  # pylint: disable=invalid-name
+        return bytes(reversed(bytes(value)))
+
+    @method("", "a{sv}")
+    def Properties(self):  # pylint: disable=invalid-name
+        return {"Count": 3, "Name": "thing"}
+
+    @method("", "")
+    def Fail(self):  # pylint: disable=invalid-name
+        raise PlainNopeError("nope")
+
+    @signal("sa{sv}")
+    def Changed(self, name, changed):  # pylint: disable=invalid-name
+        pass
+
+
+def dbus_thing():
+    # `dbus.service.Object` version of `PlainThing`
+    dbus = pytest.importorskip("dbus")
+    import dbus.exceptions
+    import dbus.service
+
+    class NopeError(dbus.exceptions.DBusException):
+        _dbus_error_name = ERROR_NAME
+
+    class Thing(dbus.service.Object):
+        def __init__(self, bus, path):
+            self.path = path
+            attach(self, bus, path, super().__init__)
+
+        @dbus.service.method(INTERFACE, in_signature="ay", out_signature="ay")
+        def Reverse(self, value):  # pylint: disable=invalid-name
+            return bytes(reversed(bytes(value)))
+
+        @dbus.service.method(INTERFACE, in_signature="", out_signature="a{sv}")
+        def Properties(self):  # pylint: disable=invalid-name
+            return {"Count": dbus.UInt16(3), "Name": "thing"}
+
+        @dbus.service.method(INTERFACE, in_signature="", out_signature="")
+        def Fail(self):  # pylint: disable=invalid-name
+            raise NopeError("nope")
+
+        @dbus.service.signal(INTERFACE, signature="sa{sv}")
+        def Changed(self, name, changed):  # pylint: disable=invalid-name
+            pass
+
+    return Thing
+
+
+@pytest.fixture(scope="module")
+def address(tmp_path_factory):
+    daemon = shutil.which("dbus-daemon")
+    if daemon is None:
+        pytest.skip("dbus-daemon not found")
+    directory = tmp_path_factory.mktemp("bus")
+    config = directory / "bus.conf"
+    config.write_text(CONFIG.format(path=directory / "socket"))
+    process = subprocess.Popen(
+        [daemon, f"--config-file={config}", "--nofork", "--print-address"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    yield process.stdout.readline().decode().strip()
+    process.terminate()
+    process.wait()
+
+
+@pytest.fixture(scope="module")
+def glib_loop():
+    pytest.importorskip("gi")
+    import dbus.mainloop.glib
+    from gi.repository import GLib  # type: ignore
+
+    dbus.mainloop.glib.DBusGMainLoop(set_as_default=True)
+    loop = GLib.MainLoop()
+    threading.Thread(target=loop.run, daemon=True).start()
+    yield
+    loop.quit()
+
+
+async def connect(kind, address):
+    if kind == "dbus_python":
+        import dbus.bus
+
+        from bluejay.backends.dbus_python import DBusPythonBackend
+
+        return DBusPythonBackend(dbus.bus.BusConnection(address))
+    backend = AsyncioBackend(address)
+    await backend.connect()
+    return backend
+
+
+async def result(future, timeout=5.0):
+    if isinstance(future, concurrent.futures.Future):
+        future = asyncio.wrap_future(future)
+    return await asyncio.wait_for(future, timeout)
+
+
+async def until(condition, timeout=5.0):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("Timed out")
+
+
+@pytest.fixture(params=["dbus_python", "asyncio"])
+def scenario(request, address):
+    kind = request.param
+    if kind == "dbus_python":
+        thing = dbus_thing()
+        request.getfixturevalue("glib_loop")
+    else:
+        thing = PlainThing
+
+    def run(test):
+        async def main():
+            server = await connect(kind, address)
+            client = await connect(kind, address)
+            try:
+                await test(server, client, thing)
+            finally:
+                server.close()
+                client.close()
+
+        asyncio.run(main())
+
+    return run
+
+
+def test_call(scenario):
+    async def test(server, client, Thing):
+        Thing(server, "/thing")
+        value = await result(
+            client.call(
+                server.unique_name, "/thing", INTERFACE, "Reverse", "ay", [b"abc"]
+            )
+        )
+        assert bytes(value) == b"cba"
+        properties = await result(
+            client.call(server.unique_name, "/thing", INTERFACE, "Properties")
+        )
+        assert dict(properties) == {"Count": 3, "Name": "thing"}
+
+    scenario(test)
+
+
+def test_error(scenario):
+    async def test(server, client, Thing):
+        Thing(server, "/thing")
+        with pytest.raises(Exception) as error:
+            await result(client.call(server.unique_name, "/thing", INTERFACE, "Fail"))
+        assert error.value.get_dbus_name() == ERROR_NAME
+
+    scenario(test)
+
+
+def test_unexport(scenario):
+    async def test(server, client, Thing):
+        thing = Thing(server, "/thing")
+        detach(thing, server)
+        with pytest.raises(Exception) as error:
+            await result(
+                client.call(server.unique_name, "/thing", INTERFACE, "Properties")
+            )
+        assert error.value.get_dbus_name().startswith("org.freedesktop.DBus.Error")
+
+    scenario(test)
+
+
+def test_signal(scenario):
+    async def test(server, client, Thing):
+        thing = Thing(server, "/thing")
+        received = []
+        subscription = client.subscribe(
+            lambda *args, **kwargs: received.append((args, kwargs)),
+            interface=INTERFACE,
+            member="Changed",
+            arg0="value",
+            path_keyword="path",
+        )
+        # Round trip so that the match is installed before emitting
+        await result(client.call(server.unique_name, "/thing", INTERFACE, "Properties"))
+
+        thing.Changed("other", {"Count": 1})
+        thing.Changed("value", {"Count": 2})
+        await until(lambda: received)
+        (args, kwargs) = received[0]
+        assert args[0] == "value" and dict(args[1]) == {"Count": 2}
+        assert kwargs == {"path": "/thing"}
+        subscription.remove()
+
+    scenario(test)
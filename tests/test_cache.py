@@ -0,0 +1,121 @@
+import pytest
+
+from bluejay.cache import ValueCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def scheduled():
+    return []
+
+
+@pytest.fixture
+def make_cache(clock, scheduled):
+    def make(provider, ttl=100):
+        return ValueCache(provider, ttl, schedule=scheduled.append, clock=clock)
+
+    return make
+
+
+def counter():
+    calls = []
+
+    def provider():
+        calls.append(None)
+        return len(calls)
+
+    return provider, calls
+
+
+def test_first_read_calls_provider(make_cache, scheduled):
+    provider, calls = counter()
+    cache = make_cache(provider)
+    assert cache.get() == 1
+    assert cache.get() == 1
+    assert len(calls) == 1
+    assert not scheduled
+    assert cache.stats == {"hits": 1, "misses": 1, "refreshes": 0}
+
+
+def test_expired_value_refreshed_once(make_cache, clock, scheduled):
+    provider, calls = counter()
+    cache = make_cache(provider)
+    cache.get()
+
+    clock.now = 0.099
+    cache.get()
+    assert not scheduled
+
+    clock.now = 0.1
+    # The stale value is served while a single refresh is pending
+    assert cache.get() == 1
+    assert cache.get() == 1
+    assert len(scheduled) == 1
+    assert len(calls) == 1
+
+    assert scheduled[0]() is False
+    assert cache.get() == 2
+    assert cache.refreshes == 1
+
+    clock.now = 0.2
+    cache.get()
+    assert len(scheduled) == 2
+
+
+def test_failed_refresh_allows_another(make_cache, clock, scheduled):
+    values = iter([1])
+
+    def provider():
+        return next(values)
+
+    cache = make_cache(provider)
+    cache.get()
+    clock.now = 1
+    cache.get()
+    assert scheduled.pop()() is False
+    assert cache.get() == 1
+    assert len(scheduled) == 1
+
+
+def test_set_and_invalidate(make_cache, clock, scheduled):
+    provider, calls = counter()
+    cache = make_cache(provider)
+    cache.set(10)
+    assert cache.get() == 10
+    assert not calls
+
+    clock.now = 1
+    cache.set(11)
+    assert cache.get() == 11
+    assert not scheduled
+
+    cache.invalidate()
+    assert cache.get() == 1
+    assert cache.misses == 1
+
+
+def test_default_scheduler(monkeypatch, clock):
+    from bluejay import cache as module
+
+    sources = []
+    monkeypatch.setattr(
+        module.GLib, "timeout_add", lambda delay, function: sources.append(delay)
+    )
+    provider, _ = counter()
+    cache = ValueCache(provider, 100, clock=clock)
+    cache.get()
+    clock.now = 1
+    cache.get()
+    assert sources == [0]
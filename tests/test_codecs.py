@@ -0,0 +1,104 @@
+import struct
+
+import pytest
+
+from bluejay.codecs import (
+    FORMAT_SINT16,
+    FORMAT_STRUCT,
+    FORMAT_UTF8,
+    Codec,
+    StringCodec,
+    StructCodec,
+    as_codec,
+)
+
+
+def test_codec_is_abstract():
+    with pytest.raises(TypeError):
+        Codec()
+
+
+@pytest.mark.parametrize(
+    "fmt, value",
+    [
+        ("h", -1234),
+        ("<I", 2**32 - 1),
+        (">H", 0x1234),
+        ("hHB", (-1, 65535, 7)),
+        ("<f", 1.5),
+        ("4s", b"abcd"),
+    ],
+)
+def test_struct_roundtrip(fmt, value):
+    codec = StructCodec(fmt)
+    encoded = codec.encode(value)
+    assert isinstance(encoded, bytes)
+    assert len(encoded) == codec.size
+    assert codec.decode(encoded) == value
+
+
+def test_struct_byte_order():
+    assert StructCodec("H").encode(0x1234) == b"\x34\x12"
+    assert StructCodec(">H").encode(0x1234) == b"\x12\x34"
+    with pytest.raises(ValueError):
+        StructCodec("=H")
+    with pytest.raises(ValueError):
+        StructCodec("<Hz")
+
+
+def test_struct_decodes_dbus_style_values():
+    # `WriteValue` receives a list of byte values
+    assert StructCodec("<h").decode([0x18, 0xFC]) == -1000
+
+
+def test_struct_decode_batch():
+    codec = StructCodec("<hB")
+    values = [codec.encode((index, index * 2)) for index in range(4)]
+    batch = codec.decode_batch(values)
+    assert [tuple(item) for item in batch] == [(i, i * 2) for i in range(4)]
+    with pytest.raises(ValueError):
+        codec.decode_batch([b"\x00\x00"])
+
+
+def test_string_roundtrip():
+    codec = StringCodec()
+    assert codec.decode(codec.encode("héllo")) == "héllo"
+    assert codec.format == FORMAT_UTF8
+
+
+def test_presentation_format():
+    codec = StructCodec("h", exponent=-2, unit=0x272F)
+    assert codec.format == FORMAT_SINT16
+    assert codec.presentation_format() == struct.pack(
+        "<BbHBH", FORMAT_SINT16, -2, 0x272F, 1, 0
+    )
+    assert StructCodec("hh").format == FORMAT_STRUCT
+
+
+def test_as_codec():
+    codec = StringCodec()
+    assert as_codec(codec) is codec
+    assert as_codec(None) is None
+    assert isinstance(as_codec("<H"), StructCodec)
+
+
+def test_array_roundtrip():
+    np = pytest.importorskip("numpy")
+    from bluejay.codecs import ArrayCodec
+
+    codec = as_codec(np.int16)
+    assert isinstance(codec, ArrayCodec)
+    assert codec.format == FORMAT_SINT16
+    samples = np.array([-3, 0, 1000], dtype=np.int16)
+    encoded = codec.encode(samples)
+    assert encoded == samples.astype("<i2").tobytes()
+    assert codec.decode(encoded).tolist() == samples.tolist()
+    assert codec.decode_batch([encoded, encoded]).tolist() == samples.tolist() * 2
+
+
+def test_struct_batch_numpy():
+    pytest.importorskip("numpy")
+    codec = StructCodec("<hB")
+    batch = codec.decode_batch([codec.encode((-1, 2)), codec.encode((3, 4))])
+    assert batch["f0"].tolist() == [-1, 3]
+    assert batch["f1"].tolist() == [2, 4]
@@ -0,0 +1,108 @@
+import struct
+
+import pytest
+
+pytest.importorskip("dbus")
+
+from bluejay.codecs import FORMAT_SINT16
+from bluejay.enums import CharacteristicFlag
+from bluejay.interfaces.gatt import Application, Characteristic, Service
+from bluejay.interfaces.presentation_format import (
+    PRESENTATION_FORMAT_DSC_UUID,
+    PresentationFormatDescriptor,
+)
+
+PATH = "/org/bluejay/test"
+
+
+@pytest.fixture
+def char():
+    # Objects created without a connection are not exported
+    app = Application(None, PATH)
+    service = Service(None, PATH, 0, "180f", True)
+    char = Characteristic(None, 0, "2a19", [CharacteristicFlag.READ], service)
+    service.add_characteristic(char)
+    app.add_service(service)
+    return char
+
+
+def test_codec_roundtrip(char):
+    char.set_codec("<h", exponent=-1)
+    assert char.decode_value(list(char.encode_value(-123))) == -123
+
+
+def test_no_codec(char):
+    with pytest.raises(ValueError):
+        char.encode_value(1)
+    with pytest.raises(ValueError):
+        char.decode_value(b"\x01")
+
+
+def test_presentation_format_descriptor(char):
+    char.set_codec("<h", exponent=-2, unit=0x272F)
+    (descriptor,) = char.descriptors
+    assert isinstance(descriptor, PresentationFormatDescriptor)
+    assert bytes(descriptor.ReadValue({})) == struct.pack(
+        "<BbHBH", FORMAT_SINT16, -2, 0x272F, 1, 0
+    )
+
+
+def test_presentation_format_replaced(char):
+    char.set_codec("<h")
+    char.set_codec("<I")
+    app = char.service.application
+    (descriptor,) = char.descriptors
+    assert app.get_objects(PRESENTATION_FORMAT_DSC_UUID) == [descriptor]
+    assert app.get_object(descriptor.path) is descriptor
+
+
+def test_one_service_changed_per_change(monkeypatch):
+    from bluejay.interfaces import gatt
+    from bluejay.interfaces.generic_attribute import GenericAttributeService
+
+    idle = []
+    def idle_add(function):
+        idle.append(function)
+        return len(idle)
+
+    monkeypatch.setattr(gatt.GLib, "idle_add", idle_add)
+
+    app = Application(None, PATH)
+    gatt_service = GenericAttributeService(None, PATH, 0)
+    changes = []
+    monkeypatch.setattr(gatt_service, "notify_changed", lambda: changes.append(1))
+    app.add_service(gatt_service)
+
+    service = Service(None, PATH, 1, "180f", True)
+    for index in range(3):
+        service.add_characteristic(
+            Characteristic(None, index, "2a19", [CharacteristicFlag.READ], service)
+        )
+    app.add_service(service)
+
+    assert len(idle) == 1
+    assert idle[0]() is False
+    assert changes == [1]
+
+
+def test_producers_follow_subscriptions(char, monkeypatch):
+    from bluejay import notifications
+
+    sources = {}
+
+    def timeout_add(interval, function):
+        sources[len(sources) + 1] = function
+        return len(sources)
+
+    monkeypatch.setattr(notifications.GLib, "timeout_add", timeout_add)
+    monkeypatch.setattr(notifications.GLib, "source_remove", sources.pop)
+
+    producer = char.add_producer(100, lambda: None)
+    assert not producer.running
+    char.subscribe("/org/bluez/hci0/dev_1")
+    char.subscribe("/org/bluez/hci0/dev_2")
+    assert producer.running and len(sources) == 1
+    char.unsubscribe("/org/bluez/hci0/dev_1")
+    assert producer.running
+    char.unsubscribe("/org/bluez/hci0/dev_2")
+    assert not producer.running and not sources
@@ -0,0 +1,90 @@
+import pytest
+
+from bluejay import ingest
+from bluejay.ingest import WriteBatch, WriteBatcher
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    sources = {}
+
+    def timeout_add(interval, function):
+        sources[len(sources) + 1] = (interval, function)
+        return len(sources)
+
+    monkeypatch.setattr(ingest.GLib, "timeout_add", timeout_add)
+    monkeypatch.setattr(ingest.GLib, "source_remove", sources.pop)
+    return sources
+
+
+class Collector:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, batch: WriteBatch):
+        # Views are only valid while the handler runs
+        self.batches.append([bytes(value) for value in batch])
+
+
+@pytest.fixture
+def batches():
+    return Collector()
+
+
+def test_batch_size(sources, batches):
+    batcher = WriteBatcher(batches, batch_size=3)
+    for value in (b"a", [0x62, 0x63], bytearray(b"d")):
+        batcher.append(value)
+    batcher.append(b"e")
+    assert batches.batches == [[b"a", b"bc", b"d"]]
+    assert batcher.writes == 4
+    assert batcher.batches == 1
+    # The timer of the first batch was removed, the next batch has its own
+    assert len(sources) == 1
+
+
+def test_latency(sources, batches):
+    batcher = WriteBatcher(batches, max_latency=5)
+    batcher.append(b"a")
+    batcher.append(b"b")
+    ((interval, on_timeout),) = sources.values()
+    assert interval == 5
+    assert not batches.batches
+
+    assert on_timeout() is False
+    assert batches.batches == [[b"a", b"b"]]
+
+
+def test_full_buffer(sources, batches):
+    batcher = WriteBatcher(batches, batch_size=10, buffer_size=4)
+    batcher.append(b"abc")
+    batcher.append(b"de")
+    assert batches.batches == [[b"abc"]]
+    # Writes larger than the buffer are delivered alone
+    batcher.append(b"fghij")
+    assert batches.batches == [[b"abc"], [b"de"], [b"fghij"]]
+    assert batcher.writes == 3
+
+
+def test_flush(sources, batches):
+    batcher = WriteBatcher(batches)
+    batcher.flush()
+    assert not batches.batches
+
+    batcher.append(b"")
+    batcher.flush()
+    assert batches.batches == [[b""]]
+    assert not sources
+
+
+def test_numpy(sources):
+    pytest.importorskip("numpy")
+    received = []
+    batcher = WriteBatcher(
+        lambda batch: received.append((batch.data.dtype, batch[1].tolist())),
+        as_numpy=True,
+    )
+    batcher.append(b"\x01")
+    batcher.append(b"\x02\x03")
+    batcher.flush()
+    assert received == [("uint8", [2, 3])]
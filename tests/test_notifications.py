@@ -0,0 +1,116 @@
+import pytest
+
+from bluejay import notifications
+from bluejay.notifications import NotificationFilter, NotificationProducer
+
+
+class FakeCharacteristic:
+    def __init__(self):
+        self.notified = []
+
+    def notify_value(self, value):
+        self.notified.append(value)
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    sources = {}
+
+    def timeout_add(interval, function):
+        sources[len(sources) + 1] = (interval, function)
+        return len(sources)
+
+    monkeypatch.setattr(notifications.GLib, "timeout_add", timeout_add)
+    monkeypatch.setattr(notifications.GLib, "source_remove", sources.pop)
+    return sources
+
+
+def test_producer_start_stop(sources):
+    producer = NotificationProducer(FakeCharacteristic(), 50, lambda: [1])
+    assert not producer.running
+
+    producer.start()
+    producer.start()
+    assert producer.running
+    assert len(sources) == 1
+    ((interval, _),) = sources.values()
+    assert interval == 50
+
+    producer.stop()
+    producer.stop()
+    assert not producer.running
+    assert not sources
+
+
+def test_producer_notifies(sources):
+    characteristic = FakeCharacteristic()
+    values = iter([[1], None, [2]])
+    producer = NotificationProducer(characteristic, 50, lambda: next(values))
+    producer.start()
+    ((_, tick),) = sources.values()
+
+    assert all(tick() for _ in range(3))
+    # `None` skips the notification
+    assert characteristic.notified == [[1], [2]]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_filter_duplicates():
+    notification_filter = NotificationFilter()
+    assert notification_filter.should_emit([1, 2])
+    assert not notification_filter.should_emit(b"\x01\x02")
+    assert notification_filter.should_emit([1, 3])
+    assert notification_filter.stats == {"emitted": 2, "suppressed": 1}
+
+    notification_filter.reset()
+    assert notification_filter.should_emit([1, 3])
+
+
+def encode(value: int) -> bytes:
+    return value.to_bytes(2, "little", signed=True)
+
+
+def test_filter_deadband():
+    notification_filter = NotificationFilter(deadband=5)
+    assert notification_filter.should_emit(encode(100))
+    assert not notification_filter.should_emit(encode(105))
+    assert not notification_filter.should_emit(encode(95))
+    # Compared with the last emitted value, not the last seen one
+    assert notification_filter.should_emit(encode(94))
+    assert not notification_filter.should_emit(encode(99))
+    assert notification_filter.should_emit(encode(-100))
+
+
+def test_filter_comparator():
+    notification_filter = NotificationFilter(
+        comparator=lambda last, value: value[0] > last[0], deadband=1000
+    )
+    assert notification_filter.should_emit([5])
+    assert not notification_filter.should_emit([4])
+    assert notification_filter.should_emit([6])
+
+
+def test_filter_heartbeat():
+    clock = FakeClock()
+    notification_filter = NotificationFilter(heartbeat=1000, clock=clock)
+    assert notification_filter.should_emit([1])
+
+    clock.now = 0.999
+    assert not notification_filter.should_emit([1])
+    clock.now = 1
+    assert notification_filter.should_emit([1])
+    # The heartbeat restarts from the last emission
+    clock.now = 1.5
+    assert not notification_filter.should_emit([1])
+    assert notification_filter.should_emit([2])
+    clock.now = 2.4
+    assert not notification_filter.should_emit([2])
+    clock.now = 2.5
+    assert notification_filter.should_emit([2])
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from bluejay.recorder import KIND_NOTIFY, KIND_WRITE, LogReader, Recorder
+
+# 16 bytes of header, then records of 24 bytes of header, 16 of path and 8
+# of payload: 5 records per segment
+SEGMENT_SIZE = 256
+PATH = "/org/bluejay/c00"
+
+
+@pytest.fixture
+def recorder(tmp_path):
+    with Recorder(
+        str(tmp_path), segment_size=SEGMENT_SIZE, max_segments=2, clock=lambda: 1.5
+    ) as recorder:
+        yield recorder
+
+
+def payloads(records):
+    return [int.from_bytes(record.payload, "little") for record in records]
+
+
+def test_records(recorder, tmp_path):
+    recorder.record_write(PATH, "/org/bluez/hci0/dev_1", [1, 2])
+    recorder.record_notify(PATH, b"\x03")
+
+    with LogReader(str(tmp_path)) as reader:
+        write, notify = list(reader)
+        assert (write.kind, write.path, write.device) == (
+            KIND_WRITE,
+            PATH,
+            "/org/bluez/hci0/dev_1",
+        )
+        assert bytes(write.payload) == b"\x01\x02"
+        assert write.timestamp == 1.5
+        assert (notify.kind, notify.device, bytes(notify.payload)) == (
+            KIND_NOTIFY,
+            None,
+            b"\x03",
+        )
+
+
+def test_rotation_and_reclaim(recorder, tmp_path):
+    for index in range(20):
+        recorder.record_notify(PATH, index.to_bytes(8, "little"))
+
+    # Records 0 to 9 were in the 2 segments deleted
+    assert sorted(os.listdir(tmp_path)) == [
+        "0000000000000002.seg",
+        "0000000000000003.seg",
+    ]
+    with LogReader(str(tmp_path)) as reader:
+        assert payloads(reader) == list(range(10, 20))
+    assert recorder.records == 20
+
+
+def test_resumes_after_last_segment(tmp_path):
+    Recorder(str(tmp_path), segment_size=SEGMENT_SIZE).close()
+    with Recorder(str(tmp_path), segment_size=SEGMENT_SIZE) as recorder:
+        recorder.record_notify(PATH, b"\x00")
+    assert sorted(os.listdir(tmp_path))[-1] == "0000000000000001.seg"
+
+
+def test_oversized_record_dropped(recorder, tmp_path):
+    recorder.record_notify(PATH, bytes(SEGMENT_SIZE))
+    assert recorder.dropped == 1
+    assert recorder.records == 0
+    with LogReader(str(tmp_path)) as reader:
+        assert list(reader) == []
+
+
+def test_poll(recorder, tmp_path):
+    reader = LogReader(str(tmp_path))
+    assert reader.poll() == []
+
+    for index in range(4):
+        recorder.record_notify(PATH, index.to_bytes(8, "little"))
+    assert payloads(reader.poll()) == [0, 1, 2, 3]
+    assert reader.poll() == []
+
+    # Across a rotation
+    for index in range(4, 10):
+        recorder.record_notify(PATH, index.to_bytes(8, "little"))
+    assert payloads(reader.poll()) == [4, 5, 6, 7, 8, 9]
+
+    # Segments reclaimed before being read are skipped
+    for index in range(10, 30):
+        recorder.record_notify(PATH, index.to_bytes(8, "little"))
+    assert payloads(reader.poll()) == list(range(20, 30))
+    # Segments read are released on the next poll
+    assert reader.poll() == []
+    assert len(reader._maps) == 1
+    reader.close()
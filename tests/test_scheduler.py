@@ -0,0 +1,154 @@
+import pytest
+
+from bluejay import scheduler
+from bluejay.enums import NotificationPriority
+from bluejay.scheduler import NotificationScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeCharacteristic:
+    def __init__(self, path, emitted, weight=1.0):
+        self.path = path
+        self.priority = NotificationPriority.NORMAL
+        self.weight = weight
+        self._emitted = emitted
+
+    def emitPropertiesChanged(self, changed):
+        self._emitted.append((self.path, changed["Value"]))
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    sources = []
+
+    def add(*args):
+        sources.append(args)
+        return len(sources)
+
+    monkeypatch.setattr(scheduler.GLib, "idle_add", add)
+    monkeypatch.setattr(scheduler.GLib, "timeout_add", add)
+    return sources
+
+
+def run_next(sources):
+    # Runs the pending drain, an idle or a timeout source
+    return sources.pop()[-1]()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_weighted_fair_queueing(sources, clock):
+    emitted = []
+    light = FakeCharacteristic("/light", emitted)
+    heavy = FakeCharacteristic("/heavy", emitted, weight=3)
+    queue = NotificationScheduler(clock=clock)
+    for index in range(4):
+        queue.submit(light, [index])
+    for index in range(4):
+        queue.submit(heavy, [index])
+    assert len(sources) == 1
+
+    assert run_next(sources) is False
+    assert [path for path, _ in emitted] == [
+        "/heavy",
+        "/heavy",
+        "/light",
+        "/heavy",
+        "/heavy",
+        "/light",
+        "/light",
+        "/light",
+    ]
+    # Values of a flow keep their order
+    assert [value for path, value in emitted if path == "/light"] == [
+        [0],
+        [1],
+        [2],
+        [3],
+    ]
+
+
+def test_flows_per_device(sources, clock):
+    emitted = []
+    characteristic = FakeCharacteristic("/char", emitted)
+    queue = NotificationScheduler(clock=clock)
+    for index in range(3):
+        queue.submit(characteristic, [0, index], device="/dev_1")
+    queue.submit(characteristic, [1, 0], device="/dev_2")
+
+    run_next(sources)
+    assert [value for _, value in emitted] == [[0, 0], [1, 0], [0, 1], [0, 2]]
+
+
+def test_strict_priority(sources, clock):
+    emitted = []
+    characteristic = FakeCharacteristic("/char", emitted)
+    queue = NotificationScheduler(clock=clock)
+    queue.submit(characteristic, [3], priority=NotificationPriority.BULK)
+    queue.submit(characteristic, [2])
+    queue.submit(characteristic, [0], priority=NotificationPriority.CRITICAL)
+
+    run_next(sources)
+    assert [value for _, value in emitted] == [[0], [2], [3]]
+
+
+def test_token_bucket(sources, clock):
+    emitted = []
+    characteristic = FakeCharacteristic("/char", emitted)
+    queue = NotificationScheduler(rate=10, burst=2, clock=clock)
+    for index in range(5):
+        queue.submit(characteristic, [index])
+
+    run_next(sources)
+    assert len(emitted) == 2
+    # One token every 100 ms
+    ((delay, _),) = sources
+    assert delay == 100
+
+    clock.now = 0.1
+    run_next(sources)
+    assert len(emitted) == 3
+
+    clock.now = 1
+    run_next(sources)
+    # The bucket holds no more than the burst
+    assert len(emitted) == 5
+    assert not sources
+
+    stats = queue.stats()["NORMAL"]
+    assert stats["emitted"] == 5
+    assert stats["max_wait"] == 1
+
+
+def test_max_depth(sources, clock):
+    characteristic = FakeCharacteristic("/char", [])
+    queue = NotificationScheduler(max_depth=2, clock=clock)
+    assert queue.submit(characteristic, [0])
+    assert queue.submit(characteristic, [1])
+    assert not queue.submit(characteristic, [2])
+    # Other classes have their own queue
+    assert queue.submit(characteristic, [3], priority=NotificationPriority.HIGH)
+    assert queue.stats()["NORMAL"]["dropped"] == 1
+    assert queue.stats()["NORMAL"]["depth"] == 2
+
+
+@pytest.mark.parametrize("weight", [0, -1])
+def test_invalid_weight(sources, clock, weight):
+    characteristic = FakeCharacteristic("/char", [])
+    queue = NotificationScheduler(clock=clock)
+    with pytest.raises(ValueError):
+        queue.submit(characteristic, [0], weight=weight)
+    characteristic.weight = weight
+    with pytest.raises(ValueError):
+        queue.submit(characteristic, [0])
+    assert not sources
@@ -0,0 +1,66 @@
+import pytest
+
+from bluejay.managers.startup import StartupCoordinator, StartupError
+
+
+def immediate(log, name):
+    def start(on_success, on_error):
+        log.append(name)
+        on_success()
+
+    return start
+
+
+def test_dependencies_order():
+    log = []
+    coordinator = StartupCoordinator()
+    coordinator.add("advertisement", immediate(log, "advertisement"), after=["app"])
+    coordinator.add("app", immediate(log, "app"), after=["power"])
+    coordinator.add("power", immediate(log, "power"))
+
+    report = coordinator.run().result(0)
+    assert log == ["power", "app", "advertisement"]
+    assert set(report.phases) == {"power", "app", "advertisement"}
+
+
+def test_deferred_phases():
+    pending = {}
+    coordinator = StartupCoordinator()
+    coordinator.add("a", lambda on_success, _: pending.setdefault("a", on_success))
+    coordinator.add("b", lambda on_success, _: pending.setdefault("b", on_success))
+    coordinator.add("c", immediate([], "c"), after=["a", "b"])
+
+    future = coordinator.run()
+    assert set(pending) == {"a", "b"}
+    pending["a"]()
+    assert not future.done()
+    pending["b"]()
+    assert set(future.result(0).phases) == {"a", "b", "c"}
+
+
+def test_failure():
+    coordinator = StartupCoordinator()
+    coordinator.add("a", lambda _, on_error: on_error("boom"))
+    coordinator.add("b", immediate([], "b"), after=["a"])
+
+    with pytest.raises(StartupError) as info:
+        coordinator.run().result(0)
+    assert info.value.phase == "a"
+    assert info.value.report.failed == "a"
+
+
+@pytest.mark.parametrize(
+    "phases",
+    [
+        {"a": ["unknown"]},
+        {"a": ["b"], "b": ["a"]},
+        {"a": ["a"]},
+        {"a": [], "b": ["a", "d"], "c": ["b"], "d": ["c"]},
+    ],
+)
+def test_invalid_dependencies(phases):
+    coordinator = StartupCoordinator()
+    for name, after in phases.items():
+        coordinator.add(name, immediate([], name), after=after)
+    with pytest.raises(ValueError):
+        coordinator.run()
@@ -0,0 +1,97 @@
+import pytest
+
+from bluejay import timer_wheel
+from bluejay.timer_wheel import TimerWheel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def wheel(monkeypatch):
+    # The wheel is advanced by hand instead of by its GLib source
+    monkeypatch.setattr(timer_wheel.GLib, "timeout_add", lambda *args: 1)
+    return TimerWheel(resolution=10, clock=FakeClock())
+
+
+def run_until(wheel, milliseconds, step=10):
+    clock = wheel._clock
+    start = clock.now
+    while (clock.now - start) * 1000 < milliseconds - 1e-6:
+        clock.now += step / 1000
+        wheel.advance()
+
+
+def fired_at(wheel, interval, **kwargs):
+    fired = []
+    start = wheel._clock.now
+
+    def on_timeout():
+        fired.append(round((wheel._clock.now - start) * 1000))
+        return False
+
+    wheel.timeout_add(interval, on_timeout, **kwargs)
+    return fired
+
+
+@pytest.mark.parametrize("interval", [630, 640, 650, 1280, 5000, 40960])
+def test_fires_on_time(wheel, interval):
+    # 640 and 1280 ms expire on cascade boundaries of a 64 slot wheel
+    fired = fired_at(wheel, interval)
+    run_until(wheel, interval + 100)
+    assert fired == [interval]
+
+
+def test_periodic(wheel):
+    calls = []
+
+    def on_timeout():
+        calls.append(round((wheel._clock.now - 100.0) * 1000))
+        return len(calls) < 3
+
+    wheel.timeout_add(200, on_timeout)
+    run_until(wheel, 1000)
+    assert calls == [200, 400, 600]
+    assert len(wheel) == 0
+
+
+def test_cancel(wheel):
+    calls = []
+    id = wheel.timeout_add(100, lambda: calls.append(1))
+    kept = fired_at(wheel, 100)
+
+    assert wheel.source_remove(id)
+    assert not wheel.source_remove(id)
+    run_until(wheel, 200)
+    assert calls == []
+    assert kept == [100]
+
+
+def test_cancel_from_callback(wheel):
+    ids = []
+    calls = []
+
+    def first():
+        calls.append("first")
+        wheel.source_remove(ids[1])
+        return True
+
+    ids.append(wheel.timeout_add(100, first))
+    ids.append(wheel.timeout_add(100, lambda: calls.append("second")))
+    run_until(wheel, 150)
+    assert calls == ["first"]
+
+
+def test_slack_coalesces(wheel):
+    wheel._clock.now += 0.03
+    wheel.advance()
+    first = fired_at(wheel, 410, slack=100)
+    second = fired_at(wheel, 470, slack=100)
+    run_until(wheel, 700)
+    # Both round up to the same multiple of 100 ms of the wheel time
+    assert first == second == [470]
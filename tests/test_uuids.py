@@ -0,0 +1,66 @@
+import pytest
+
+from bluejay.uuids import BASE_UUID_SUFFIX, BluetoothUUID, normalize_uuid, uuid_name
+
+BATTERY = "0000180f" + BASE_UUID_SUFFIX
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "180f",
+        "180F",
+        "0x180f",
+        " 0x180F ",
+        "0000180f",
+        0x180F,
+        "0000180F-0000-1000-8000-00805F9B34FB",
+        "0000180f00001000800000805f9b34fb",
+    ],
+)
+def test_normalize(value):
+    assert normalize_uuid(value) == BATTERY
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "",
+        "18f",
+        "180g",
+        "0x",
+        "0000180f-0000-1000-8000-00805f9b34f",
+        "0000180f+0000-1000-8000-00805f9b34fb",
+        "0000180g-0000-1000-8000-00805f9b34fb",
+        -1,
+        2**32,
+    ],
+)
+def test_invalid(value):
+    with pytest.raises(ValueError):
+        normalize_uuid(value)
+
+
+def test_bluetooth_uuid():
+    uuid = BluetoothUUID("0x180F")
+    assert isinstance(uuid, str)
+    assert uuid == BATTERY
+    assert BluetoothUUID(uuid) is uuid
+    assert {uuid: 1}[BATTERY] == 1
+    assert uuid.is_base
+    assert uuid.short == 0x180F
+
+
+def test_custom_uuid():
+    uuid = BluetoothUUID("12345678-1234-5678-1234-56789ABCDEF0")
+    assert uuid == "12345678-1234-5678-1234-56789abcdef0"
+    assert not uuid.is_base
+    assert uuid.short is None
+
+
+def test_uuid_name():
+    name = "Device Information Service"
+    assert uuid_name("180a") == name
+    assert uuid_name(0x180A) == name
+    assert uuid_name("0000180A-0000-1000-8000-00805F9B34FB") == name
+    assert uuid_name("12345678-1234-5678-1234-56789abcdef0") is None
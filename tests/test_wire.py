@@ -0,0 +1,72 @@
+import pytest
+
+from bluejay.backends.wire import (
+    METHOD_CALL,
+    Message,
+    Reader,
+    Variant,
+    Writer,
+    guess_signature,
+    split_signature,
+)
+from bluejay.enums import CharacteristicFlag, DescriptorFlag
+
+
+def roundtrip(signature, values):
+    return Reader(Writer().write_all(signature, values)).read_all(signature)
+
+
+def test_split_signature():
+    assert split_signature("ya{sv}(ids)aayo") == ["y", "a{sv}", "(ids)", "aay", "o"]
+    with pytest.raises(ValueError):
+        split_signature("z")
+
+
+def test_basic_types():
+    values = [7, True, -3, 40000, -(2**40), 2**63, 2.5, "text", "/a/b", "a{sv}"]
+    assert roundtrip("ybnqxtdsog", values) == values
+
+
+def test_containers():
+    values = [
+        {"a": 1, "b": Variant("ay", b"xy"), "c": [1.5]},
+        (-3, 2.5, "s"),
+        [b"ab", b""],
+        {},
+    ]
+    expected = [{"a": 1, "b": b"xy", "c": [1.5]}, (-3, 2.5, "s"), [b"ab", b""], {}]
+    assert roundtrip("a{sv}(ids)aaya{sv}", values) == expected
+
+
+def test_enum_values_are_marshalled_by_value():
+    flags = [DescriptorFlag.READ, CharacteristicFlag.NOTIFY]
+    assert roundtrip("as", [flags]) == [["read", "notify"]]
+    assert roundtrip("a{sv}", [{"Flags": flags}]) == [{"Flags": ["read", "notify"]}]
+
+
+def test_guess_signature():
+    assert guess_signature({"a": [1]}) == "a{sai}"
+    assert guess_signature((True, b"x", 2**40)) == "(bayx)"
+    assert guess_signature(DescriptorFlag.READ) == "s"
+
+
+def test_message_roundtrip():
+    message = Message(
+        METHOD_CALL,
+        serial=3,
+        body=(b"\x01\x02", {"offset": Variant("q", 1)}),
+        path="/org/bluejay/char0",
+        interface="org.bluez.GattCharacteristic1",
+        member="WriteValue",
+        destination=":1.2",
+        signature="aya{sv}",
+    )
+    data = message.encode()
+    header, body = Message.header_size(data[:16])
+    assert len(data) == header + body
+
+    decoded = Message.decode(data)
+    assert decoded.serial == 3
+    assert decoded.path == "/org/bluejay/char0"
+    assert decoded.member == "WriteValue"
+    assert decoded.body == (b"\x01\x02", {"offset": 1})